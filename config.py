@@ -2,3 +2,96 @@ import os
 
 KAGGLE_USERNAME = os.getenv("KAGGLE_USERNAME")
 KAGGLE_KEY = os.getenv("KAGGLE_KEY")
+
+# Pembacaan dataset bertahap (streaming)
+READ_CHUNK_ROWS = int(os.getenv("READ_CHUNK_ROWS", "100000"))
+READ_MEMORY_BUDGET_MB = int(os.getenv("READ_MEMORY_BUDGET_MB", "2048"))
+
+# Cache DataFrame di memori (LRU) yang dipakai bersama semua analyzer
+FRAME_CACHE_MAX_MB = int(os.getenv("FRAME_CACHE_MAX_MB", "1024"))
+
+# Mode "compact": downcast numerik & kolom teks kardinalitas rendah → category
+LOAD_COMPACT = os.getenv("LOAD_COMPACT", "0") == "1"
+COMPACT_SAMPLE_ROWS = int(os.getenv("COMPACT_SAMPLE_ROWS", "10000"))
+COMPACT_MAX_CATEGORY_RATIO = float(os.getenv("COMPACT_MAX_CATEGORY_RATIO", "0.5"))
+
+# Cache unduhan persisten (content-addressed, LRU)
+DOWNLOAD_CACHE_DIR = os.getenv("DOWNLOAD_CACHE_DIR", os.path.join("cache", "downloads"))
+DOWNLOAD_CACHE_MAX_MB = int(os.getenv("DOWNLOAD_CACHE_MAX_MB", "5120"))
+
+# Unduhan paralel multi-koneksi (Range) yang bisa dilanjutkan
+DOWNLOAD_WORKERS = int(os.getenv("DOWNLOAD_WORKERS", "4"))
+DOWNLOAD_PARALLEL_MIN_MB = int(os.getenv("DOWNLOAD_PARALLEL_MIN_MB", "16"))
+
+# Klien HTTP bersama (connection pool, retry, rate limit per host)
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_BACKOFF_SECONDS = float(os.getenv("HTTP_BACKOFF_SECONDS", "0.5"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+HTTP_MAX_RPS_PER_HOST = float(os.getenv("HTTP_MAX_RPS_PER_HOST", "0"))
+
+# Katalog metadata Kaggle lokal (SQLite + FTS5)
+KAGGLE_CATALOG_PATH = os.getenv("KAGGLE_CATALOG_PATH", os.path.join("cache", "kaggle_catalog.db"))
+KAGGLE_CATALOG_TTL_HOURS = float(os.getenv("KAGGLE_CATALOG_TTL_HOURS", "24"))
+
+# Cache bertingkat (memori LRU + disk terkompresi) untuk preview, metadata & hasil analisis
+CACHE_ROOT = os.getenv("CACHE_ROOT", os.path.join("cache", "tiered"))
+CACHE_DEFAULT_TTL_HOURS = float(os.getenv("CACHE_DEFAULT_TTL_HOURS", "24"))
+CACHE_MEMORY_ENTRIES = int(os.getenv("CACHE_MEMORY_ENTRIES", "256"))
+CACHE_DISK_MAX_MB = float(os.getenv("CACHE_DISK_MAX_MB", "512"))
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "auto")  # auto | zstd | gzip | none
+
+# Prefetch metadata/preview hasil pencarian Kaggle di background
+KAGGLE_PREFETCH_TOP = int(os.getenv("KAGGLE_PREFETCH_TOP", "5"))
+KAGGLE_PREFETCH_WORKERS = int(os.getenv("KAGGLE_PREFETCH_WORKERS", "2"))
+KAGGLE_PREFETCH_PREVIEWS = os.getenv("KAGGLE_PREFETCH_PREVIEWS", "0") == "1"
+KAGGLE_PREFETCH_PREVIEW_TTL_HOURS = float(os.getenv("KAGGLE_PREFETCH_PREVIEW_TTL_HOURS", "6"))
+
+# Batch ingest dari manifest (python main.py --manifest ...)
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "4"))
+# Default ingest kolumnar: stream unduh → unzip → CSV → Parquet (per item bisa diatur lewat `columnar`)
+INGEST_COLUMNAR = os.getenv("INGEST_COLUMNAR", "0") == "1"
+
+# Katalog dataset lokal persisten (SQLite): ukuran, mtime, hash, format, skema & jumlah baris
+LOCAL_DATA_DIR = os.path.join("data", "local_datasets")
+LOCAL_CATALOG_PATH = os.getenv("LOCAL_CATALOG_PATH", os.path.join("cache", "local_catalog.db"))
+LOCAL_CATALOG_SAMPLE_ROWS = int(os.getenv("LOCAL_CATALOG_SAMPLE_ROWS", "1000"))
+
+# Blob store content-addressed di belakang data/local_datasets (reflink copy-on-write, dedup per isi)
+DATASET_STORE_DIR = os.getenv("DATASET_STORE_DIR", os.path.join("data", ".store"))
+
+# K-Means: mode "full" (di memori), "minibatch" (streaming), "coreset" atau "auto" (pilih dari ukuran dataset)
+KMEANS_MODE = os.getenv("KMEANS_MODE", "auto")
+KMEANS_STREAMING_MIN_ROWS = int(os.getenv("KMEANS_STREAMING_MIN_ROWS", "1000000"))
+KMEANS_BATCH_SIZE = int(os.getenv("KMEANS_BATCH_SIZE", "4096"))
+KMEANS_STREAM_EPOCHS = int(os.getenv("KMEANS_STREAM_EPOCHS", "1"))
+KMEANS_PLOT_SAMPLE_ROWS = int(os.getenv("KMEANS_PLOT_SAMPLE_ROWS", "5000"))
+
+# Pemilihan k otomatis: sweep KMeans paralel (process pool + shared memory), silhouette dari sampel
+KMEANS_SWEEP_MIN_K = int(os.getenv("KMEANS_SWEEP_MIN_K", "2"))
+KMEANS_SWEEP_MAX_K = int(os.getenv("KMEANS_SWEEP_MAX_K", "10"))
+KMEANS_SWEEP_WORKERS = int(os.getenv("KMEANS_SWEEP_WORKERS", str(min(os.cpu_count() or 1, 8))))
+KMEANS_SILHOUETTE_SAMPLE = int(os.getenv("KMEANS_SILHOUETTE_SAMPLE", "10000"))
+
+# Model K-Means tersimpan (centroid + preprocessing) untuk assign data baru tanpa refit
+MODEL_STORE_DIR = os.getenv("MODEL_STORE_DIR", os.path.join("data", "models"))
+KMEANS_DRIFT_RATIO = float(os.getenv("KMEANS_DRIFT_RATIO", "1.5"))
+
+# K-Means coreset: ringkasan berbobot satu pass untuk tabel sangat besar
+KMEANS_CORESET_MIN_ROWS = int(os.getenv("KMEANS_CORESET_MIN_ROWS", "20000000"))
+KMEANS_CORESET_SIZE = int(os.getenv("KMEANS_CORESET_SIZE", "20000"))
+KMEANS_CORESET_EVAL_SAMPLE = int(os.getenv("KMEANS_CORESET_EVAL_SAMPLE", "50000"))
+
+# Reduksi dimensi sebelum clustering (opsional): "none" (default), "pca" (IncrementalPCA),
+# "random" (sparse random projection) atau "auto" (PCA hanya untuk data lebar, ≥ KMEANS_PROJECTION_MIN_FEATURES kolom)
+KMEANS_PROJECTION = os.getenv("KMEANS_PROJECTION", "none")
+KMEANS_PROJECTION_MIN_FEATURES = int(os.getenv("KMEANS_PROJECTION_MIN_FEATURES", "50"))
+KMEANS_PROJECTION_COMPONENTS = int(os.getenv("KMEANS_PROJECTION_COMPONENTS", "50"))
+KMEANS_PROJECTION_VARIANCE = float(os.getenv("KMEANS_PROJECTION_VARIANCE", "0.9"))
+# Kolom mirip pengenal (Id, ID_Pelanggan, PostalCode, ...) tidak dipakai sebagai fitur, dinilai dari rasio nilai unik:
+# ≥ KMEANS_ID_UNIQUE_RATIO dan berurutan, atau ≥ KMEANS_ID_NAME_UNIQUE_RATIO jika namanya berpola pengenal
+KMEANS_DROP_ID_COLUMNS = os.getenv("KMEANS_DROP_ID_COLUMNS", "1") == "1"
+KMEANS_ID_UNIQUE_RATIO = float(os.getenv("KMEANS_ID_UNIQUE_RATIO", "0.95"))
+KMEANS_ID_NAME_UNIQUE_RATIO = float(os.getenv("KMEANS_ID_NAME_UNIQUE_RATIO", "0.2"))
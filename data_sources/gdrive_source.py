@@ -7,8 +7,9 @@ import tempfile
 import requests
 
 from utils.file_handler import detect_file_type, read_file_preview
-from utils.file_manager import extract_zip_and_list, save_confirmation, handle_zip_preview, handle_direct_preview
+from utils.file_manager import save_confirmation, handle_zip_preview, handle_direct_preview
 from utils.debug_utils import logger
+from utils.download_cache import fetch, normalize_source_key
 
 
 logger = logging.getLogger(__name__)
@@ -53,6 +54,7 @@ def download_from_gdrive(file_id: str) -> str:
     """
     Mengunduh file dari Google Drive menggunakan file_id.
     - Mendapatkan nama & ekstensi file dari header Content-Disposition (jika ada).
+    - Memakai cache unduhan (key gdrive:<file_id>), file yang sama tidak diunduh dua kali.
     - Menyimpan file di direktori sementara.
     - Mengembalikan path lengkap file hasil unduhan.
     """
@@ -66,26 +68,16 @@ def download_from_gdrive(file_id: str) -> str:
     logger.info(f"🌐 Mengunduh file dari Google Drive: {base_url}")
 
     try:
-        with requests.get(base_url, stream=True, allow_redirects=True) as r:
-            r.raise_for_status()
-
-            # Ambil nama file dari header
-            cd = r.headers.get("Content-Disposition", "")
-            filename = None
-            if "filename=" in cd:
-                filename = cd.split("filename=")[-1].strip('"\' ')
-            else:
-                # fallback jika tidak ada header
-                filename = f"gdrive_file_{file_id[:6]}"
-
-            output_path = os.path.join(tmp_dir, filename)
-
-            # Simpan file
-            with open(output_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-        logger.info(f"✅ File berhasil diunduh ke: {output_path}")
+        # Nama file diambil dari header Content-Disposition (fallback: gdrive_file_<id>)
+        cached = fetch(
+            base_url,
+            tmp_dir,
+            key=normalize_source_key(file_id, kind="gdrive"),
+            fallback_name=f"gdrive_file_{file_id[:6]}",
+        )
+        output_path = cached.path
+
+        logger.info(f"✅ File berhasil diunduh ke: {output_path} ({cached.status})")
         return output_path
 
     except Exception as e:
@@ -1,15 +1,20 @@
 # utils/kaggle_source.py
 
 import os
-import subprocess
-import requests
+import tempfile
 import json
+import threading
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+import config
 from utils.debug_utils import logger
-from utils.file_handler import read_file_preview
+from utils import http_client
+from utils.file_handler import read_file_preview, detect_file_type
 from utils.file_manager import download_and_extract_zip, list_local_datasets,download_and_preview_zip
 from utils.debug_utils import logger
-from utils.cache_manager import load_cache, save_cache
+from utils.cache_manager import load_cache, save_cache, get_cache
+from utils import kaggle_catalog
+from utils.kaggle_client import download_and_unzip, download_dataset_file, print_progress
 
 """ CACHE_DIR = os.path.join(".cache", "preview")
 os.makedirs(CACHE_DIR, exist_ok=True) 
@@ -29,15 +34,14 @@ def setup_kaggle_api(username, key):
 
 def download_kaggle_dataset(dataset, output_dir="data"):
     os.makedirs(output_dir, exist_ok=True)
-    cmd = ["kaggle", "datasets", "download", "-d", dataset, "-p", output_dir, "--unzip"]
-    subprocess.run(cmd)
+    download_and_unzip(dataset, output_dir, progress=print_progress)
     logger.info(f"Dataset '{dataset}' diunduh ke {output_dir}")
 
 
 def _search_kaggle_dataset(query,limit=5):
     logger.info(f"Mencari dataset dengan kata kunci: {query}")
     url = f"https://www.kaggle.com/api/v1/datasets/list?search={query}"
-    response = requests.get(url)
+    response = http_client.get(url)
     if response.status_code == 200:
         datasets = response.json()
         for i, ds in enumerate(datasets[:limit], 1):
@@ -50,7 +54,7 @@ def __search_kaggle_dataset(query, limit=5):
     logger.info(f"Mencari dataset dengan kata kunci: {query}")
 
     url = f"https://www.kaggle.com/api/v1/datasets/list?search={query}"
-    response = requests.get(url)
+    response = http_client.get(url)
 
     if response.status_code != 200:
         logger.error("Gagal mengambil hasil pencarian dari Kaggle.")
@@ -95,35 +99,86 @@ def __search_kaggle_dataset(query, limit=5):
         print("⚠️ Input tidak valid, masukkan angka saja.")
         return
     
-def search_kaggle_dataset(query, limit=25):
-    """Cari dataset Kaggle dan tawarkan preview hasil pilihan user (dengan pagination)."""
-    logger.info(f"Mencari dataset dengan kata kunci: {query}")
+def _fetch_search_pages(query, limit, per_page=20):
+    """
+    Ambil halaman hasil pencarian Kaggle secara paralel (thread pool), sebanyak halaman
+    yang dibutuhkan `limit`. Hasil digabung sesuai urutan halaman dan berhenti pada
+    halaman pendek/kosong pertama; halaman yang belum berjalan dibatalkan.
+    Mengembalikan list dataset, atau None jika request gagal.
+    """
     base_url = "https://www.kaggle.com/api/v1/datasets/list"
-    
-    datasets = []
-    page = 1
-    per_page = 20  # batas maksimum per halaman oleh API Kaggle
-    
-    while len(datasets) < limit:
+    n_pages = max(1, -(-limit // per_page))
+
+    def fetch_page(page):
         url = f"{base_url}?search={query}&page={page}&pageSize={per_page}"
-        response = requests.get(url)
-        
+        response = http_client.get(url)
         if response.status_code != 200:
-            logger.error("Gagal mengambil hasil pencarian dari Kaggle.")
-            print("❌ Gagal mengambil hasil pencarian dari Kaggle.")
-            return
-        
-        page_data = response.json()
-        if not page_data:
-            break
-        
-        datasets.extend(page_data)
-        if len(page_data) < per_page:
-            break  # tidak ada halaman berikutnya
-        
-        page += 1
-    
-    datasets = datasets[:limit]
+            raise IOError(f"status {response.status_code} pada halaman {page}")
+        return response.json()
+
+    datasets = []
+    with ThreadPoolExecutor(max_workers=min(n_pages, config.HTTP_POOL_MAXSIZE)) as pool:
+        futures = [pool.submit(fetch_page, page) for page in range(1, n_pages + 1)]
+        try:
+            for future in futures:
+                page_data = future.result()
+                datasets.extend(page_data or [])
+                if len(page_data or []) < per_page:
+                    break  # tidak ada halaman berikutnya
+        except Exception as e:
+            logger.error(f"Gagal mengambil hasil pencarian dari Kaggle: {e}")
+            return None
+        finally:
+            for future in futures:
+                future.cancel()
+    return datasets[:limit]
+
+
+def _refresh_search(query, limit):
+    datasets = _fetch_search_pages(query, limit)
+    if datasets is None:
+        raise IOError("pencarian Kaggle gagal")
+    kaggle_catalog.record_search(query, datasets, limit)
+
+
+def _search_with_catalog(query, limit):
+    """
+    Cari lewat katalog lokal lebih dulu:
+    - query yang sama pernah diambil → jawab lokal (refresh di background jika kedaluwarsa)
+    - katalog punya >= `limit` dataset yang cocok → jawab lokal, ambil hasil API di background
+    - selain itu → API Kaggle; jika gagal (offline) → pakai hasil katalog yang ada
+    """
+    datasets, fresh = kaggle_catalog.cached_search(query, limit)
+    if datasets is not None:
+        logger.info(f"Hasil pencarian '{query}' dari katalog lokal ({'segar' if fresh else 'kedaluwarsa'}).")
+        if not fresh:
+            kaggle_catalog.refresh_in_background(f"search:{query}", lambda: _refresh_search(query, limit))
+        return datasets
+
+    related = kaggle_catalog.search_catalog(query, limit)
+    if len(related) >= limit:
+        logger.info(f"Hasil pencarian '{query}' dari indeks katalog lokal.")
+        kaggle_catalog.refresh_in_background(f"search:{query}", lambda: _refresh_search(query, limit))
+        return related
+
+    datasets = _fetch_search_pages(query, limit)
+    if datasets is not None:
+        kaggle_catalog.record_search(query, datasets, limit)
+        return datasets
+    if related:
+        print("⚠️ Kaggle tidak dapat dihubungi, menampilkan hasil dari katalog lokal.")
+        return related
+    return None
+
+
+def search_kaggle_dataset(query, limit=25):
+    """Cari dataset Kaggle dan tawarkan preview hasil pilihan user (dengan pagination paralel)."""
+    logger.info(f"Mencari dataset dengan kata kunci: {query}")
+
+    datasets = _search_with_catalog(query, limit)
+    if datasets is None:
+        print("❌ Gagal mengambil hasil pencarian dari Kaggle.")
+        return
 
     if not datasets:
         print("⚠️ Tidak ditemukan dataset dengan kata kunci tersebut.")
@@ -136,6 +191,9 @@ def search_kaggle_dataset(query, limit=25):
         print(f"   🧑 Owner : {ds.get('ownerName', '-')}")
         print("-" * 60)
 
+    # Selagi user membaca daftar, hangatkan metadata (dan preview) hasil teratas
+    prefetch_datasets([ds.get("ref") for ds in datasets if ds.get("ref")])
+
     try:
         choice = input("Masukkan nomor dataset untuk preview (atau tekan Enter untuk batal): ").strip()
         if not choice:
@@ -154,12 +212,131 @@ def search_kaggle_dataset(query, limit=25):
             print("❌ Dataset tidak memiliki referensi yang valid.")
             return
 
+        cancel_prefetch(keep=dataset_ref)
         print(f"\n🔍 Menampilkan preview dataset: {dataset_ref}")
         preview_kaggle_dataset(dataset_ref)
 
     except ValueError:
         print("⚠️ Input tidak valid, masukkan angka saja.")
         return
+    finally:
+        cancel_prefetch()
+
+def _fetch_dataset_view(dataset):
+    """Ambil metadata `datasets/view` dari API Kaggle dan simpan ke katalog lokal."""
+    url = f"https://www.kaggle.com/api/v1/datasets/view/{dataset}"
+    response = http_client.get(url)
+    if response.status_code != 200:
+        raise IOError(f"status {response.status_code}")
+    data = response.json()
+    kaggle_catalog.record_dataset(dataset, data)
+    return data
+
+
+def _file_preview(url, filename):
+    """Preview file remote lewat cache "remote_preview" (diisi juga oleh prefetch)."""
+    cache = get_cache("remote_preview", ttl_seconds=config.KAGGLE_PREFETCH_PREVIEW_TTL_HOURS * 3600)
+    preview_text = cache.get(url)
+    if preview_text is not None:
+        logger.info(f"Preview {filename} dari cache.")
+        return preview_text
+    preview_text = read_file_preview(url, filename)
+    if not preview_text.startswith("("):  # pesan gagal/tidak didukung tidak di-cache
+        cache.set(url, preview_text)
+    return preview_text
+
+
+def _kaggle_file_preview(dataset, filename):
+    """Unduh satu file dataset (bukan seluruh ZIP) lalu preview. None jika gagal."""
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = download_dataset_file(dataset, filename, tmpdir, progress=print_progress)
+            return read_file_preview(path, filename)
+    except Exception as e:
+        logger.warning(f"Gagal mengunduh file {filename} dari Kaggle, beralih ke ZIP dataset: {e}")
+        return None
+
+
+_prefetch_lock = threading.Lock()
+_prefetch_pool = None
+_prefetch_state = {"cancel": threading.Event(), "futures": {}}
+
+
+def _prefetch_one(dataset, cancel):
+    if cancel.is_set():
+        return
+    data, fresh = kaggle_catalog.get_dataset(dataset)
+    if data is None or not fresh:
+        data = _fetch_dataset_view(dataset)
+    if not config.KAGGLE_PREFETCH_PREVIEWS or cancel.is_set():
+        return
+    for f in data.get("files", []):
+        file_url = f.get("directUrl") or f.get("url")
+        if file_url and detect_file_type(f.get("name", "")):
+            _file_preview(file_url, f["name"])
+            break
+
+
+def prefetch_datasets(refs):
+    """
+    Prefetch metadata `datasets/view` (dan preview file pertama jika KAGGLE_PREFETCH_PREVIEWS)
+    untuk KAGGLE_PREFETCH_TOP dataset teratas di thread pool terbatas. Request tetap lewat
+    http_client, jadi rate limit per host tetap berlaku.
+    """
+    global _prefetch_pool
+    top = refs[:config.KAGGLE_PREFETCH_TOP]
+    if not top:
+        return
+    cancel_prefetch()
+    with _prefetch_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(max_workers=config.KAGGLE_PREFETCH_WORKERS,
+                                                thread_name_prefix="kaggle-prefetch")
+        cancel = threading.Event()
+        _prefetch_state["cancel"] = cancel
+        _prefetch_state["futures"] = {ref: _prefetch_pool.submit(_prefetch_one, ref, cancel) for ref in top}
+    logger.info(f"Prefetch metadata {len(top)} dataset teratas dimulai.")
+
+
+def cancel_prefetch(keep=None):
+    """Batalkan prefetch yang belum berjalan; prefetch untuk `keep` dibiarkan selesai."""
+    with _prefetch_lock:
+        if keep is None:
+            _prefetch_state["cancel"].set()
+        for ref, future in _prefetch_state["futures"].items():
+            if ref != keep:
+                future.cancel()
+
+
+def _wait_prefetch(dataset):
+    """Jika dataset sedang di-prefetch, tunggu hasilnya daripada mengirim request ganda."""
+    with _prefetch_lock:
+        future = _prefetch_state["futures"].get(dataset)
+    if future is None or future.cancelled():
+        return
+    try:
+        future.result(timeout=config.HTTP_READ_TIMEOUT)
+    except Exception as e:
+        logger.info(f"Prefetch {dataset} tidak selesai: {e}")
+
+
+def _dataset_metadata(dataset):
+    """Metadata dataset dari katalog lokal (refresh di background jika kedaluwarsa), atau dari API."""
+    _wait_prefetch(dataset)
+    data, fresh = kaggle_catalog.get_dataset(dataset)
+    if data is not None:
+        logger.info(f"Metadata dataset {dataset} dari katalog lokal.")
+        if not fresh:
+            kaggle_catalog.refresh_in_background(f"view:{dataset}", lambda: _fetch_dataset_view(dataset))
+        return data
+
+    logger.info(f"Mengambil metadata dataset: {dataset}")
+    try:
+        return _fetch_dataset_view(dataset)
+    except Exception as e:
+        logger.error(f"Gagal mengambil metadata dataset {dataset}: {e}")
+        return None
+
 
 def preview_kaggle_dataset(dataset):
     """Preview dataset Kaggle.
@@ -174,14 +351,11 @@ def preview_kaggle_dataset(dataset):
         print(cached.get("preview", "(tidak ada preview)"))
         return
 
-    logger.info(f"Mengambil metadata dataset: {dataset}")
-    url = f"https://www.kaggle.com/api/v1/datasets/view/{dataset}"
-    response = requests.get(url)
-    if response.status_code != 200:
+    data = _dataset_metadata(dataset)
+    if data is None:
         logger.error("Gagal mengambil metadata dataset.")
         return
 
-    data = response.json()
     metadata_text = (
         f"Judul     : {data.get('title')}\n"
         f"Subtitle  : {data.get('subtitle')}\n"
@@ -222,16 +396,18 @@ def preview_kaggle_dataset(dataset):
 
     if file_url:
         print(f"\n🔗 File memiliki URL langsung. Melakukan preview online...")
-        preview_text = read_file_preview(file_url, file_info["name"])
+        preview_text = _file_preview(file_url, file_info["name"])
         print("\n--- Cuplikan 5 baris pertama ---")
         print(preview_text)
     else:
         print(f"\n⚠️ File tidak memiliki URL langsung.")
-        confirm = input("File akan diunduh (ZIP) dan diekstrak untuk preview. Lanjutkan? (y/n): ").lower().strip()
+        confirm = input("File akan diunduh dari Kaggle untuk preview. Lanjutkan? (y/n): ").lower().strip()
         if confirm != "y":
             print("Preview dibatalkan.")
             return
-        preview_text = download_and_preview_zip(dataset, metadata_text)
+        preview_text = _kaggle_file_preview(dataset, file_info["name"])
+        if preview_text is None:
+            preview_text = download_and_preview_zip(dataset, metadata_text)
     print("\n--- Cuplikan 5 baris pertama ---")
     print(preview_text)
     save_cache(dataset, {"metadata": metadata_text, "preview": preview_text})
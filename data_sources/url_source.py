@@ -1,17 +1,16 @@
 # url_source.py
 import re
 import os
-import requests
 import tempfile
-import zipfile
 import mimetypes
 from urllib.parse import unquote
 from urllib.parse import urlparse
 from utils.debug_utils import logger
 from utils.file_manager import download_and_preview_zip, DATA_DIR
-from utils.file_handler import detect_file_type, read_file_preview
-from utils.file_manager import extract_zip_and_list, save_confirmation,handle_direct_preview, handle_zip_preview
+from utils.file_handler import detect_file_type
+from utils.file_manager import save_confirmation,handle_direct_preview, handle_zip_preview, handle_remote_zip_preview
 from utils.debug_utils import logger
+from utils.download_cache import fetch
 from data_sources.gdrive_source import download_from_gdrive
 SUPPORTED_EXT = ["csv", "xlsx", "json", "txt"]
 
@@ -39,14 +38,9 @@ def download_from_url(url: str):
     os.makedirs(dataset_dir, exist_ok=True)
 
     logger.info(f"Mengunduh dataset dari URL: {url}")
-    file_path = os.path.join(dataset_dir, filename)
 
-    # Unduh file
-    with requests.get(url, stream=True) as r:
-        r.raise_for_status()
-        with open(file_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
+    # Unduh file (lewat cache unduhan)
+    file_path = fetch(url, dataset_dir, filename=filename).path
 
     logger.info(f"✅ Dataset disimpan di: {file_path}")
     return file_path
@@ -71,6 +65,7 @@ def download_from_url_tmp(url: str, tmpdir: str) -> str | None:
     - Jika URL Google Drive, ubah ke direct download link.
     - Deteksi nama file dari header atau URL.
     - Tambahkan ekstensi dari Content-Type jika perlu.
+    - Unduhan berulang direvalidasi lewat cache unduhan (ETag / Last-Modified).
     - Kembalikan path lokal file yang diunduh.
     """
     # 🔍 Ubah dulu jika link GDrive
@@ -78,36 +73,11 @@ def download_from_url_tmp(url: str, tmpdir: str) -> str | None:
     logger.info(f"Mengunduh file dari URL (resolved): {url}")
 
     try:
-        with requests.get(url, stream=True, allow_redirects=True) as r:
-            r.raise_for_status()
-
-            # Log header untuk debugging
-            logger.info(f"Content-Disposition header: {r.headers.get('Content-Disposition', '')}")
-
-            # 🧩 Deteksi nama file dari header Content-Disposition
-            cd = r.headers.get("Content-Disposition", "")
-            filename = None
-            if "filename=" in cd:
-                filename = cd.split("filename=")[-1].strip().strip('"').strip("'")
-                filename = unquote(filename)
-
-            # Jika tidak ada nama file di header, ambil dari URL
-            if not filename:
-                filename = os.path.basename(url.split("?")[0])
-
-            # Jika masih tanpa ekstensi, coba dari Content-Type
-            if not os.path.splitext(filename)[1]:
-                mime_type = r.headers.get("Content-Type", "")
-                ext = mimetypes.guess_extension(mime_type.split(";")[0].strip())
-                if ext:
-                    filename += ext
-
-            local_path = os.path.join(tmpdir, filename or "downloaded_file")
-
-            # Simpan isi file ke local_path
-            with open(local_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+        # Nama file dari Content-Disposition / URL / Content-Type ditentukan oleh cache unduhan
+        cached = fetch(url, tmpdir)
+        local_path = cached.path
+        if cached.status != "downloaded":
+            logger.info(f"Memakai salinan dari cache unduhan ({cached.status}).")
 
         logger.info(f"File sementara disimpan di: {local_path}")
         return local_path
@@ -117,90 +87,6 @@ def download_from_url_tmp(url: str, tmpdir: str) -> str | None:
         print(f"❌ Gagal mengunduh file: {e}")
         return None
 
-def __preview_from_url(url: str):
-    """
-    Unduh dan tampilkan preview dataset dari URL.
-    - Jika file ZIP → ekstrak, tampilkan daftar file, lalu preview salah satu.
-    - Jika file CSV/XLSX/JSON → langsung preview.
-    - File disimpan sementara di folder tmp (belum ke data/local_datasets).
-    """
-    logger.info(f"Memproses URL dataset: {url}")
-    print(f"🌐 Mengunduh dataset dari URL: {url}")
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        local_path = os.path.join(tmpdir, "downloaded_file")
-
-        # --- Unduh file ---
-        try:
-            with requests.get(url, stream=True) as r:
-                r.raise_for_status()
-                with open(local_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
-        except Exception as e:
-            logger.error(f"Gagal mengunduh file dari URL: {e}")
-            print(f"❌ Gagal mengunduh file: {e}")
-            return None
-
-        logger.info(f"File sementara disimpan di: {local_path}")
-
-        # --- Deteksi tipe file ---
-        file_type = detect_file_type(local_path)
-        logger.info(f"Tipe file terdeteksi: {file_type}")
-
-        # === Jika file ZIP ===
-        if file_type == "zip":
-            print("📦 File ZIP terdeteksi — mengekstrak sementara...")
-            try:
-                with zipfile.ZipFile(local_path, "r") as zip_ref:
-                    zip_ref.extractall(tmpdir)
-            except zipfile.BadZipFile:
-                print("❌ File ZIP rusak atau tidak valid.")
-                return None
-
-            extracted_files = [
-                f for f in os.listdir(tmpdir)
-                if not os.path.isdir(os.path.join(tmpdir, f)) and f != "downloaded_file"
-            ]
-
-            if not extracted_files:
-                print("(ZIP kosong, tidak ada file data.)")
-                return None
-
-            print("\n=== File yang tersedia di ZIP ===")
-            for i, name in enumerate(extracted_files, 1):
-                print(f"{i}. {name}")
-
-            try:
-                choice = int(input("\nPilih file untuk preview [1-n]: "))
-                if choice < 1 or choice > len(extracted_files):
-                    print("Nomor tidak valid.")
-                    return None
-            except ValueError:
-                print("Input tidak valid.")
-                return None
-
-            chosen_file = os.path.join(tmpdir, extracted_files[choice - 1])
-            logger.info(f"Preview file dari ZIP: {chosen_file}")
-            preview_text = read_file_preview(chosen_file, extracted_files[choice - 1])
-
-            print("\n--- Cuplikan 5 baris pertama ---")
-            print(preview_text)
-            return preview_text
-
-        # === Jika file langsung (csv/json/xlsx/dll) ===
-        elif file_type in ("csv", "xlsx", "json"):
-            preview_text = read_file_preview(local_path, f"downloaded_file.{file_type}")
-            print("\n=== PREVIEW DATASET ===")
-            print(f"Tipe file: {file_type}")
-            print("\n--- Cuplikan Data ---")
-            print(preview_text)
-            return preview_text
-
-        else:
-            print(f"❌ Format file '{file_type}' tidak didukung untuk preview otomatis.")
-            return None
-
 def preview_from_url(url: str):
     """
     Unduh dan tampilkan preview dataset dari URL.
@@ -220,6 +106,12 @@ def preview_from_url(url: str):
             logger.info(f"Deteksi: URL berasal dari Google Drive (id={file_id})")
             local_path = download_from_gdrive(file_id)
         else:
+            # ZIP remote: baca daftar isi lewat Range tanpa mengunduh seluruh arsip
+            url_ext = os.path.splitext(urlparse(url).path)[1].lower().strip(".")
+            if url_ext not in ("csv", "xlsx", "xls", "json"):
+                name = os.path.splitext(os.path.basename(urlparse(url).path))[0] or None
+                if handle_remote_zip_preview(url, folder_name=name) is not None:
+                    return None
             local_path = download_from_url_tmp(url, tmpdir)
 
         if not local_path or not os.path.exists(local_path):
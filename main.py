@@ -28,8 +28,12 @@ project/
     |── linier_regresion_analyzer.py
     └── file_handler.py'''
 
+import sys
+import argparse
+
 from utils.menu_utils import display_menu
 from utils.debug_utils import logger
+from utils.http_client import log_http_stats
 from utils.file_manager import list_local_datasets, download_and_extract_zip, get_local_dataset_path, delete_local_dataset
 from data_sources.kaggle_source import (
     setup_kaggle_api,
@@ -39,11 +43,12 @@ from data_sources.kaggle_source import (
 )
 from data_sources.url_source import download_from_url, preview_from_url
 from data_sources.gdrive_source import download_from_gdrive, preview_from_gdrive
-from utils.kmeans_analyzer import analyze_kmeans 
+from utils.kmeans_analyzer import analyze_kmeans, assign_kmeans
 import config
 
 from utils.apriori_analyzer import analyze_apriori
 from utils.ensemble_analyzer import analyze_ensemble
+from utils.batch_ingest import run_manifest
 
 def main():
     if not setup_kaggle_api(config.KAGGLE_USERNAME, config.KAGGLE_KEY):
@@ -162,9 +167,30 @@ def main():
             
         elif choice == "9":
             delete_local_dataset()
+
+        elif choice == "10":
+            datasets = list_local_datasets(show_files=False)
+            if not datasets:
+                print("(Belum ada dataset lokal untuk dilabeli.)")
+                continue
+
+            try:
+                idx = int(input("Pilih dataset untuk dilabeli [1-n]: "))
+                if idx < 1 or idx > len(datasets):
+                    print("Nomor tidak valid.")
+                    continue
+
+                dataset_path = datasets[idx - 1].lstrip("/")
+                print(f"Memilih dataset: {dataset_path}")
+                assign_kmeans(dataset_path)
+
+            except ValueError:
+                print("Input tidak valid.")
+                continue
         
         elif choice == "q":
             logger.info("Program dihentikan oleh pengguna.")
+            log_http_stats()
             print(" Keluar dari aplikasi...")
             break
 
@@ -173,6 +199,15 @@ def main():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dataset explorer & analyzer")
+    parser.add_argument("--manifest", help="Ingest headless dari manifest YAML/JSON (tanpa menu interaktif)")
+    parser.add_argument("--workers", type=int, help="Jumlah worker paralel untuk --manifest")
+    parser.add_argument("--summary", help="Tulis ringkasan JSON ingest ke file ini (default: stdout)")
+    args = parser.parse_args()
+    if args.manifest:
+        setup_kaggle_api(config.KAGGLE_USERNAME, config.KAGGLE_KEY)
+        sys.exit(run_manifest(args.manifest, args.workers, args.summary))
+
     try:
         main()
     except KeyboardInterrupt:
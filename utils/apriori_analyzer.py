@@ -1,7 +1,7 @@
 # utils/apriori_analyzer.py
 import pandas as pd
 from mlxtend.frequent_patterns import apriori, association_rules
-from utils.file_handler import read_full_file
+from utils.file_handler import read_full_file, load_dataset
 from utils.debug_utils import logger
 
 
@@ -17,11 +17,14 @@ def analyze_apriori(source, filename=None, min_support=0.05, metric="lift", min_
     """
     try:
         logger.info(f"Membaca dataset untuk analisis Apriori: {filename or source}")
-        df = read_full_file(source, filename)
+        if isinstance(source, str) and not source.startswith("http"):
+            df = load_dataset(source)
+        else:
+            df = read_full_file(source, filename)
 
         # --- Preprocessing ---
         # Coba deteksi apakah dataset sudah berbentuk 0/1 (one-hot)
-        if df.dtypes.isin(['object', 'bool']).any():
+        if not df.select_dtypes(exclude=["number"]).empty:
             logger.info("Mendeteksi kolom non-numerik, akan dilakukan one-hot encoding otomatis.")
             df = pd.get_dummies(df.astype(str))
 
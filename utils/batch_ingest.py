@@ -0,0 +1,234 @@
+# utils/batch_ingest.py
+import os
+import re
+import sys
+import json
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from utils.debug_utils import logger
+from utils.download_cache import fetch, normalize_source_key
+from utils.kaggle_client import download_dataset, download_url, kaggle_auth
+from utils.ingest_pipeline import ingest_to_parquet
+from utils.file_manager import ensure_data_dir, sanitize_name, list_zip_members, extract_zip_members
+from utils.dataset_store import store_file, adopt_tree
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:  # PyYAML opsional: tanpa paket ini hanya manifest JSON yang didukung
+    yaml = None
+    YAML_AVAILABLE = False
+
+
+MARKER_FILE = os.path.join(".cache", "ingest.json")
+
+
+def load_manifest(path: str) -> dict:
+    """
+    Baca manifest YAML/JSON. Bentuk yang diterima:
+      {"workers": 4, "datasets": [{"source": "...", "name": "...", "type": "url|gdrive|kaggle",
+                                   "files": [...], "columnar": true}]}
+    atau langsung list item dataset. `type` ditebak dari `source` jika tidak diisi.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith((".yaml", ".yml")):
+            if not YAML_AVAILABLE:
+                raise RuntimeError("PyYAML belum terpasang, gunakan manifest JSON atau `pip install pyyaml`.")
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+
+    if isinstance(manifest, list):
+        manifest = {"datasets": manifest}
+    items = []
+    for item in manifest.get("datasets") or []:
+        items.append({"source": item} if isinstance(item, str) else dict(item))
+    manifest["datasets"] = items
+    return manifest
+
+
+def _infer_kind(source: str) -> str:
+    if source.startswith("http"):
+        return "gdrive" if "drive.google.com" in source else "url"
+    if re.fullmatch(r"[\w.-]+/[\w.-]+", source):
+        return "kaggle"
+    return "gdrive"
+
+
+def _gdrive_id(source: str) -> str:
+    return normalize_source_key(source, kind=None if source.startswith("http") else "gdrive").split(":", 1)[1]
+
+
+def _default_name(source: str, kind: str) -> str:
+    if kind == "kaggle":
+        return source.strip("/").split("/")[-1]
+    if kind == "gdrive":
+        return f"gdrive_{_gdrive_id(source)[:6]}"
+    return os.path.splitext(os.path.basename(source.split("?")[0].rstrip("/")))[0] or "dataset"
+
+
+def _download(source: str, kind: str):
+    """Unduh sumber ke cache unduhan (tanpa salinan tambahan). Mengembalikan CachedFile."""
+    if kind == "kaggle":
+        return download_dataset(source)
+    if kind == "gdrive":
+        file_id = _gdrive_id(source)
+        return fetch(f"https://drive.google.com/uc?id={file_id}", key=normalize_source_key(file_id, kind="gdrive"),
+                     fallback_name=f"gdrive_file_{file_id[:6]}")
+    return fetch(source)
+
+
+def _stream_source(source: str, kind: str):
+    """URL & argumen request untuk pipeline streaming (tanpa melewati cache unduhan)."""
+    if kind == "kaggle":
+        return download_url(source), {"auth": kaggle_auth()}
+    if kind == "gdrive":
+        return f"https://drive.google.com/uc?id={_gdrive_id(source)}", {}
+    return source, {}
+
+
+def _ingest_columnar(source: str, kind: str, folder: str, members, marker, result: dict):
+    """
+    Mode kolumnar: unduh → unzip → CSV → Parquet berjalan sebagai satu stream.
+    Sumber yang tidak berubah dideteksi lewat request kondisional (ETag / Last-Modified).
+    """
+    headers = {}
+    if marker and marker.get("columnar") and marker.get("members") == members:
+        if marker.get("etag"):
+            headers["If-None-Match"] = marker["etag"]
+        if marker.get("last_modified"):
+            headers["If-Modified-Since"] = marker["last_modified"]
+
+    url, kwargs = _stream_source(source, kind)
+    stats = ingest_to_parquet(url, folder, members=members, headers=headers, **kwargs)
+    if stats["status"] == "not_modified":
+        result.update(status="skipped", files=marker.get("files", []))
+        return
+    adopt_tree(folder)
+
+    _write_marker(folder, {"source": source, "type": kind, "sha256": stats["sha256"], "columnar": True,
+                           "etag": stats["etag"], "last_modified": stats["last_modified"],
+                           "members": members, "files": stats["files"], "ingested_at": time.time()})
+    result.update(status="ingested", files=stats["files"], size=stats["bytes"], bytes_downloaded=stats["bytes"],
+                  rows=stats["rows"], first_ready_s=stats["first_ready_s"])
+
+
+def _read_marker(folder: str):
+    try:
+        with open(os.path.join(folder, MARKER_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_marker(folder: str, marker: dict):
+    path = os.path.join(folder, MARKER_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(marker, f, indent=2)
+
+
+def _place_files(cached, folder: str, members=None) -> list:
+    """Ekstrak ZIP (hanya `members` jika diberikan) atau letakkan file tunggal ke folder dataset."""
+    os.makedirs(folder, exist_ok=True)
+    ext = os.path.splitext(cached.filename)[1].lower()
+    # XLSX juga berformat ZIP, jadi hanya arsip sungguhan yang diekstrak
+    if ext == ".zip" or (ext not in (".xlsx", ".xls") and zipfile.is_zipfile(cached.path)):
+        members = members or list_zip_members(cached.path)
+        extract_zip_members(cached.path, members, folder)
+        adopt_tree(folder)
+        return list(members)
+
+    store_file(cached.path, os.path.join(folder, cached.filename), sha256=cached.sha256)
+    return [cached.filename]
+
+
+def ingest_item(item: dict) -> dict:
+    """
+    Unduh, ekstrak, dan daftarkan satu item manifest ke data/local_datasets/<name>.
+    Sumber yang tidak berubah (SHA-256 sama dengan ingest sebelumnya) dilewati.
+    """
+    source = str(item.get("source", "")).strip()
+    kind = item.get("type") or _infer_kind(source)
+    name = sanitize_name(item.get("name") or _default_name(source, kind))
+    members = item.get("files")
+    result = {"name": name, "source": source, "type": kind, "status": "failed",
+              "bytes_downloaded": 0, "size": 0, "seconds": 0.0, "files": [], "error": None}
+
+    t0 = time.time()
+    try:
+        if not source:
+            raise ValueError("item manifest tanpa `source`")
+        if item.get("columnar", config.INGEST_COLUMNAR):
+            folder = os.path.join(ensure_data_dir(), name)
+            _ingest_columnar(source, kind, folder, members, _read_marker(folder), result)
+            result["seconds"] = round(time.time() - t0, 3)
+            logger.info(f"[{result['status']}] {name} ({result['bytes_downloaded'] / (1024 * 1024):.1f} MB, "
+                        f"{result['seconds']:.1f} s, kolumnar)")
+            return result
+
+        cached = _download(source, kind)
+        result["size"] = cached.size
+        result["bytes_downloaded"] = cached.size if cached.status == "downloaded" else 0
+
+        folder = os.path.join(ensure_data_dir(), name)
+        marker = _read_marker(folder)
+        if marker and marker.get("sha256") == cached.sha256 and marker.get("members") == members:
+            result.update(status="skipped", files=marker.get("files", []))
+        else:
+            files = _place_files(cached, folder, members)
+            _write_marker(folder, {"source": source, "type": kind, "sha256": cached.sha256,
+                                   "members": members, "files": files, "ingested_at": time.time()})
+            result.update(status="ingested", files=files)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        logger.error(f"Ingest gagal untuk {source}: {e}")
+    result["seconds"] = round(time.time() - t0, 3)
+    logger.info(f"[{result['status']}] {name} ({result['bytes_downloaded'] / (1024 * 1024):.1f} MB, {result['seconds']:.1f} s)")
+    return result
+
+
+def run_batch(manifest_path: str, workers: int = None) -> dict:
+    """Jalankan ingest semua item manifest secara paralel dan kembalikan ringkasan yang bisa dibaca mesin."""
+    manifest = load_manifest(manifest_path)
+    items = manifest["datasets"]
+    workers = workers or manifest.get("workers") or config.INGEST_WORKERS
+    logger.info(f"Batch ingest {len(items)} dataset dengan {workers} worker.")
+
+    t0 = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(ingest_item, items))
+
+    counts = {s: sum(r["status"] == s for r in results) for s in ("ingested", "skipped", "failed")}
+    return {
+        "manifest": os.path.abspath(manifest_path),
+        "workers": workers,
+        "seconds": round(time.time() - t0, 3),
+        "bytes_downloaded": sum(r["bytes_downloaded"] for r in results),
+        **counts,
+        "items": results,
+    }
+
+
+def run_manifest(manifest_path: str, workers: int = None, summary_path: str = None) -> int:
+    """Entry point headless: cetak ringkasan JSON (atau tulis ke `summary_path`). Exit code 1 jika ada yang gagal."""
+    summary = run_batch(manifest_path, workers)
+    text = json.dumps(summary, indent=2)
+    if summary_path:
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        logger.info(f"Ringkasan ingest ditulis ke: {summary_path}")
+    else:
+        print(text)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    # python -m utils.batch_ingest manifest.yaml [workers]
+    if len(sys.argv) < 2:
+        print("Penggunaan: python -m utils.batch_ingest <manifest.yaml|json> [workers]")
+        sys.exit(2)
+    sys.exit(run_manifest(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else None))
@@ -1,30 +1,260 @@
 #
 import os
-import time
+import gzip
 import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
 
-CACHE_DIR = "cache"
+import config
+from utils.debug_utils import logger
 
-def load_cache(dataset_name: str):
-    """Cek apakah dataset preview sudah ada di cache."""
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    cache_file = os.path.join(CACHE_DIR, f"{dataset_name.replace('/', '_')}.json")
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:  # zstandard opsional: tanpa paket ini disk tier memakai gzip
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+
+_INDEX_FILE = "index.json"
+_MISSING = object()
+
+
+def _resolve_compression(name: str) -> str:
+    name = (name or "none").lower()
+    if name == "auto":
+        return "zstd" if ZSTD_AVAILABLE else "gzip"
+    if name == "zstd" and not ZSTD_AVAILABLE:
+        logger.warning("zstandard tidak terpasang, cache memakai gzip.")
+        return "gzip"
+    return name if name in ("zstd", "gzip") else "none"
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    return data
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    if compression == "gzip":
+        return gzip.decompress(data)
+    return data
+
+
+class TieredCache:
+    """
+    Cache dua tingkat: LRU di memori di depan disk tier.
+    - Disk: satu file JSON per entri (opsional terkompresi zstd/gzip; bukan pickle, sehingga file
+      di folder cache tidak pernah bisa menjalankan kode saat dibaca), ditulis atomik
+      (file sementara + os.replace), indeks ukuran/kedaluwarsa/akses terakhir di index.json.
+    - Nilai harus bisa diserialisasi JSON (teks preview, dict metadata); nilai lain hanya di memori.
+    - TTL per entri; entri kedaluwarsa dihapus saat dibaca atau saat eviction.
+    - Total ukuran disk dibatasi `max_disk_mb` (evict yang paling lama tidak dipakai; waktu akses
+      disimpan di index.json sehingga urutan LRU bertahan antar-run).
+    """
+
+    def __init__(self, name: str, ttl_seconds: float = None, memory_entries: int = None,
+                 max_disk_mb: float = None, compression: str = None):
+        self.name = name
+        self.directory = os.path.join(config.CACHE_ROOT, name)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.CACHE_DEFAULT_TTL_HOURS * 3600
+        self.memory_entries = memory_entries if memory_entries is not None else config.CACHE_MEMORY_ENTRIES
+        self.max_disk_bytes = (max_disk_mb if max_disk_mb is not None else config.CACHE_DISK_MAX_MB) * 1024 * 1024
+        self.compression = _resolve_compression(compression or config.CACHE_COMPRESSION)
+        self._memory = OrderedDict()  # key -> (expires_at, value)
+        self._index = None
+        self._lock = threading.RLock()
+        self._stats = {"memory_hit": 0, "disk_hit": 0, "miss": 0, "expired": 0,
+                       "evicted": 0, "write": 0, "write_failed": 0}
+
+    # --- index ---------------------------------------------------------
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, _INDEX_FILE)
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            try:
+                with open(self._index_path(), "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._index_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path())
+
+    def _entry_path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
 
-    if not os.path.exists(cache_file):
-        return None
+    def _remove_entry(self, key: str):
+        entry = self._load_index().pop(key, None)
+        if entry:
+            try:
+                os.remove(self._entry_path(entry["file"]))
+            except OSError:
+                pass
 
-    # Hapus cache lebih lama dari 1 hari
-    if time.time() - os.path.getmtime(cache_file) > 86400:
-        os.remove(cache_file)
-        return None
+    # --- memory tier ---------------------------------------------------
+    def _memory_put(self, key: str, expires_at: float, value):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
 
-    with open(cache_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # --- API -----------------------------------------------------------
+    def get(self, key: str, default=None):
+        """Ambil nilai dari memori, lalu disk. Entri kedaluwarsa dianggap miss dan dihapus."""
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key, _MISSING)
+            if cached is not _MISSING:
+                expires_at, value = cached
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    entry = self._load_index().get(key)
+                    if entry:
+                        entry["last_access"] = now  # ikut tersimpan pada penulisan index berikutnya
+                    self._stats["memory_hit"] += 1
+                    return value
+                del self._memory[key]
+
+            entry = self._load_index().get(key)
+            if not entry:
+                self._stats["miss"] += 1
+                return default
+            if entry["expires_at"] <= now:
+                self._remove_entry(key)
+                self._save_index()
+                self._stats["expired"] += 1
+                self._stats["miss"] += 1
+                return default
+
+            try:
+                if entry.get("format") != "json":
+                    raise ValueError("format entri lama (pickle) tidak dibaca")
+                with open(self._entry_path(entry["file"]), "rb") as f:
+                    value = json.loads(_decompress(f.read(), entry["compression"]).decode("utf-8"))
+            except Exception as e:
+                logger.warning(f"Entri cache '{self.name}' rusak, dihapus: {key} ({e})")
+                self._remove_entry(key)
+                self._save_index()
+                self._stats["miss"] += 1
+                return default
+
+            entry["last_access"] = now
+            self._save_index()
+            self._memory_put(key, entry["expires_at"], value)
+            self._stats["disk_hit"] += 1
+            return value
+
+    def set(self, key: str, value, ttl_seconds: float = None):
+        """Simpan nilai ke memori dan disk (atomik). `ttl_seconds` menimpa TTL default."""
+        now = time.time()
+        expires_at = now + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        filename = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json" + {"zstd": ".zst", "gzip": ".gz"}.get(self.compression, "")
+        with self._lock:
+            self._memory_put(key, expires_at, value)
+            try:
+                payload = _compress(json.dumps(value, ensure_ascii=False).encode("utf-8"), self.compression)
+                os.makedirs(self.directory, exist_ok=True)
+                path = self._entry_path(filename)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                self._stats["write_failed"] += 1
+                logger.warning(f"Gagal menulis cache '{self.name}' untuk {key}: {e}")
+                return
+
+            index = self._load_index()
+            old = index.get(key)
+            if old and old["file"] != filename:
+                self._remove_entry(key)
+            index[key] = {"file": filename, "size": len(payload), "expires_at": expires_at,
+                          "last_access": now, "compression": self.compression, "format": "json"}
+            self._stats["write"] += 1
+            self._evict(keep=key)
+            self._save_index()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+            self._remove_entry(key)
+            self._save_index()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._load_index()):
+                self._remove_entry(key)
+            self._save_index()
+
+    def _evict(self, keep: str = None):
+        """Hapus entri kedaluwarsa, lalu entri paling lama tidak dipakai sampai di bawah batas ukuran disk."""
+        index = self._load_index()
+        now = time.time()
+        for key in [k for k, e in index.items() if e["expires_at"] <= now and k != keep]:
+            self._remove_entry(key)
+            self._memory.pop(key, None)
+            self._stats["expired"] += 1
+
+        total = sum(e["size"] for e in index.values())
+        for key, entry in sorted(index.items(), key=lambda kv: kv[1]["last_access"]):
+            if total <= self.max_disk_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entry["size"]
+            self._remove_entry(key)
+            self._memory.pop(key, None)
+            self._stats["evicted"] += 1
+            logger.info(f"Cache '{self.name}' dievict: {key}")
+
+    def stats(self) -> dict:
+        """Metrik hit/miss/eviction beserta jumlah entri dan ukuran disk."""
+        with self._lock:
+            index = self._load_index()
+            hits = self._stats["memory_hit"] + self._stats["disk_hit"]
+            lookups = hits + self._stats["miss"]
+            return {
+                **self._stats,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(index),
+                "disk_mb": sum(e["size"] for e in index.values()) / (1024 * 1024),
+                "compression": self.compression,
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str, **kwargs) -> TieredCache:
+    """Instance TieredCache bersama per namespace (mis. "preview", "analysis")."""
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = TieredCache(name, **kwargs)
+        return _caches[name]
+
+
+def load_cache(dataset_name: str):
+    """Cek apakah dataset preview sudah ada di cache."""
+    return get_cache("preview").get(dataset_name)
 
 
-def save_cache(dataset_name: str, data):
+def save_cache(dataset_name: str, data, ttl_seconds: float = None):
     """Simpan hasil preview dataset ke cache."""
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    cache_file = os.path.join(CACHE_DIR, f"{dataset_name.replace('/', '_')}.json")
-    with open(cache_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    get_cache("preview").set(dataset_name, data, ttl_seconds)
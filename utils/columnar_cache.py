@@ -0,0 +1,166 @@
+# utils/columnar_cache.py
+import os
+import json
+import hashlib
+import pandas as pd
+from utils.debug_utils import logger
+
+try:
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:  # pyarrow opsional: tanpa pyarrow cache kolumnar dinonaktifkan
+    pq = None
+    PARQUET_AVAILABLE = False
+
+
+CACHE_DIRNAME = ".cache"
+
+_stats = {"hit": 0, "miss": 0, "revalidated": 0, "write": 0, "write_failed": 0}
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """Hitung SHA-256 isi file secara bertahap."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _meta_path(path: str) -> str:
+    return os.path.join(os.path.dirname(path), CACHE_DIRNAME, f"{os.path.basename(path)}.meta.json")
+
+
+def _load_meta(path: str):
+    meta_path = _meta_path(path)
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_meta(path: str, meta: dict):
+    """Tulis sidecar metadata secara atomik (file sementara + os.replace)."""
+    meta_path = _meta_path(path)
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, meta_path)
+
+
+def _valid_meta(path: str):
+    """
+    Kembalikan metadata cache jika file sumber belum berubah:
+    - mtime & ukuran sama → langsung valid
+    - mtime berubah tapi ukuran & hash sama → valid, mtime diperbarui
+    """
+    meta = _load_meta(path)
+    if not meta:
+        return None
+    parquet_path = os.path.join(os.path.dirname(path), CACHE_DIRNAME, meta.get("cache_file", ""))
+    if not os.path.exists(parquet_path):
+        return None
+
+    st = os.stat(path)
+    if meta.get("size") != st.st_size:
+        return None
+    if meta.get("mtime_ns") == st.st_mtime_ns:
+        return meta
+    if meta.get("sha256") == file_sha256(path):
+        meta["mtime_ns"] = st.st_mtime_ns
+        try:
+            _save_meta(path, meta)
+        except OSError as e:
+            logger.warning(f"Gagal memperbarui metadata cache kolumnar {path}: {e}")
+        _stats["revalidated"] += 1
+        return meta
+    return None
+
+
+def get_cached_schema(path: str):
+    """
+    Skema dataset dari metadata cache tanpa memuat data:
+    {"columns": [...], "dtypes": {...}, "numeric_columns": [...], "rows": n}, atau None.
+    """
+    if not PARQUET_AVAILABLE:
+        return None
+    meta = _valid_meta(path)
+    if not meta:
+        return None
+    return {k: meta[k] for k in ("columns", "dtypes", "numeric_columns", "rows")}
+
+
+def write_cache(path: str, df: pd.DataFrame) -> bool:
+    """Tulis DataFrame hasil parsing `path` ke sidecar Parquet di <folder>/.cache/."""
+    if not PARQUET_AVAILABLE:
+        return False
+    if not all(isinstance(c, str) for c in df.columns):
+        logger.info("Cache kolumnar dilewati: nama kolom bukan string.")
+        return False
+
+    try:
+        sha = file_sha256(path)
+        st = os.stat(path)
+        cache_dir = os.path.join(os.path.dirname(path), CACHE_DIRNAME)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        cache_file = f"{os.path.basename(path)}.{sha[:16]}.parquet"
+        tmp_path = os.path.join(cache_dir, cache_file + ".tmp")
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, os.path.join(cache_dir, cache_file))
+
+        old = _load_meta(path)
+        if old and old.get("cache_file") not in (None, cache_file):
+            try:
+                os.remove(os.path.join(cache_dir, old["cache_file"]))
+            except OSError:
+                pass
+
+        meta = {
+            "source": os.path.basename(path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": sha,
+            "cache_file": cache_file,
+            "rows": int(df.shape[0]),
+            "columns": list(df.columns),
+            "dtypes": {c: str(t) for c, t in df.dtypes.items()},
+            "numeric_columns": df.select_dtypes(include=["number"]).columns.tolist(),
+        }
+        _save_meta(path, meta)
+        _stats["write"] += 1
+        logger.info(f"Cache kolumnar ditulis: {cache_file}")
+        return True
+    except Exception as e:
+        _stats["write_failed"] += 1
+        logger.warning(f"Gagal menulis cache kolumnar untuk {path}: {e}")
+        return False
+
+
+def load_columnar(path: str, parse, columns=None) -> pd.DataFrame:
+    """
+    Baca dataset lokal lewat cache kolumnar.
+    - Hit  → baca Parquet (hanya `columns` jika diberikan).
+    - Miss → panggil `parse()` untuk parsing file asli, lalu tulis cache.
+    """
+    meta = _valid_meta(path) if PARQUET_AVAILABLE else None
+    if meta:
+        _stats["hit"] += 1
+        parquet_path = os.path.join(os.path.dirname(path), CACHE_DIRNAME, meta["cache_file"])
+        logger.info(f"Cache kolumnar hit: {os.path.basename(path)}")
+        return pd.read_parquet(parquet_path, columns=list(columns) if columns is not None else None)
+
+    _stats["miss"] += 1
+    logger.info(f"Cache kolumnar miss: {os.path.basename(path)}")
+    df = parse()
+    write_cache(path, df)
+    return df[list(columns)] if columns is not None else df
+
+
+def get_cache_stats() -> dict:
+    """Statistik hit/miss cache kolumnar sejak program dimulai."""
+    total = _stats["hit"] + _stats["miss"]
+    return {**_stats, "hit_rate": (_stats["hit"] / total) if total else 0.0}
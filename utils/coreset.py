@@ -0,0 +1,102 @@
+# utils/coreset.py
+import numpy as np
+
+from utils.debug_utils import logger
+
+
+def _lightweight_sample(X: np.ndarray, w: np.ndarray, size: int, rng):
+    """
+    Lightweight coreset (importance sampling) untuk titik berbobot:
+    q(x) = ½·w/W + ½·w·d(x, μ)²/Σ w·d², bobot baru = w / (size · q).
+    Hasilnya estimator tak bias untuk biaya k-means tertimbang.
+    """
+    total = w.sum()
+    mu = (w[:, None] * X).sum(axis=0) / total
+    d2 = np.einsum("ij,ij->i", X - mu, X - mu)
+    spread = (w * d2).sum()
+    q = 0.5 * w / total
+    q = q + (0.5 * w * d2 / spread if spread > 0 else 0.5 * w / total)
+    idx = rng.choice(len(X), size=size, replace=True, p=q / q.sum())
+    return X[idx], w[idx] / (size * q[idx])
+
+
+def reduce_coreset(X: np.ndarray, w: np.ndarray, size: int, rng=None):
+    """Perkecil himpunan titik berbobot menjadi `size` titik (tidak berubah jika sudah cukup kecil)."""
+    if len(X) <= size:
+        return X, w
+    return _lightweight_sample(X, w, size, rng or np.random.default_rng())
+
+
+class StreamingCoreset:
+    """
+    Ringkasan berbobot data dalam satu pass (merge & reduce):
+    tiap potongan diringkas menjadi `size` titik, ringkasan digabung, dan saat melebihi
+    4 × `size` direduksi lagi. Sekaligus menyimpan reservoir sampel seragam untuk evaluasi.
+    """
+
+    def __init__(self, size: int, eval_sample: int = 0, random_state: int = 42):
+        self.size = size
+        self.rng = np.random.default_rng(random_state)
+        self.points = []
+        self.weights = []
+        self.buffered = 0
+        self.n_rows = 0
+        self.reductions = 0
+        self.eval_sample = eval_sample
+        self.reservoir = None
+        self.reservoir_rows = None
+
+    def _reservoir_add(self, X: np.ndarray):
+        """Reservoir sampling (algoritma R) tervektorisasi per potongan."""
+        if not self.eval_sample:
+            return
+        if self.reservoir is None:
+            self.reservoir = np.empty((self.eval_sample, X.shape[1]), dtype="float64")
+            self.reservoir_rows = 0
+        start = self.n_rows
+        fill = min(self.eval_sample - self.reservoir_rows, len(X))
+        if fill > 0:
+            self.reservoir[self.reservoir_rows:self.reservoir_rows + fill] = X[:fill]
+            self.reservoir_rows += fill
+        if fill < len(X):
+            seen = start + np.arange(fill, len(X)) + 1  # jumlah baris yang sudah dilihat termasuk baris ini
+            slot = (self.rng.random(len(seen)) * seen).astype(np.int64)
+            accept = slot < self.eval_sample
+            # Penugasan berurutan: slot duplikat diisi baris terakhir, sama seperti algoritma sekuensial
+            self.reservoir[slot[accept]] = X[fill:][accept]
+
+    def add(self, X: np.ndarray):
+        X = np.asarray(X, dtype="float64")
+        if not len(X):
+            return
+        self._reservoir_add(X)
+        self.n_rows += len(X)
+        points, weights = reduce_coreset(X, np.ones(len(X)), self.size, self.rng)
+        self.points.append(points)
+        self.weights.append(weights)
+        self.buffered += len(points)
+        if self.buffered > 4 * self.size:
+            self._reduce()
+
+    def _reduce(self):
+        points, weights = reduce_coreset(np.vstack(self.points), np.concatenate(self.weights), self.size, self.rng)
+        self.points, self.weights = [points], [weights]
+        self.buffered = len(points)
+        self.reductions += 1
+
+    def result(self):
+        """(titik, bobot) ringkasan akhir berukuran ≤ `size`."""
+        if not self.points:
+            raise ValueError("Coreset kosong: tidak ada baris yang diproses.")
+        if self.buffered > self.size:
+            self._reduce()
+        points, weights = self.points[0], self.weights[0]
+        logger.info(f"Coreset: {self.n_rows:,} baris → {len(points):,} titik berbobot "
+                    f"(Σbobot {weights.sum():,.0f}, {self.reductions} reduksi).")
+        return points, weights
+
+    def eval_rows(self):
+        """Sampel seragam dari seluruh data (reservoir) untuk mengukur galat aproksimasi."""
+        if self.reservoir is None:
+            return None
+        return self.reservoir[:self.reservoir_rows]
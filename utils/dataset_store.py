@@ -0,0 +1,311 @@
+# utils/dataset_store.py
+import os
+import json
+import stat
+
+import pandas as pd
+
+import config
+from utils.debug_utils import logger
+from utils.columnar_cache import file_sha256
+from utils.download_cache import clone_file
+from utils.local_catalog import get_file_info, sync_catalog, list_catalog
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:  # pyarrow opsional: tanpa pyarrow kolom turunan disimpan sebagai CSV penuh
+    pa = pq = None
+    PARQUET_AVAILABLE = False
+
+
+# Key metadata Parquet untuk file kolom turunan (sidecar) yang merujuk dataset dasar
+DERIVED_META_KEY = b"dataset_store.derived"
+
+_stats = {"stored": 0, "deduplicated": 0, "reflinked": 0, "copied": 0, "collected": 0}
+
+
+def _blob_path(sha256: str) -> str:
+    return os.path.join(config.DATASET_STORE_DIR, sha256[:2], sha256)
+
+
+def _place(src: str, dest_path: str):
+    """
+    Ganti `dest_path` secara atomik dengan salinan independen `src`: reflink jika bisa, selain itu
+    salin biasa. Tidak pernah hardlink, sehingga file dataset tetap bisa diedit tanpa mengubah
+    blob maupun dataset lain yang isinya sama.
+    """
+    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+    tmp_path = dest_path + ".link.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    if clone_file(src, tmp_path) == "reflink":
+        _stats["reflinked"] += 1
+    else:
+        _stats["copied"] += 1
+    os.replace(tmp_path, dest_path)
+
+
+def _same_file(a: str, b: str) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def store_file(src_path: str, dest_path: str, sha256: str = None) -> str:
+    """
+    Simpan isi `src_path` ke blob store content-addressed (SHA-256) lalu letakkan di `dest_path`
+    sebagai reflink (copy-on-write) blob tersebut: isi yang sama hanya memakai disk sekali,
+    tetapi setiap file dataset tetap file biasa yang bisa diedit. Blob hanya dibuat jika bisa
+    di-reflink; di filesystem tanpa reflink file cukup disalin biasa (blob tidak menghemat apa pun).
+    Mengembalikan hash isi file.
+    """
+    sha256 = sha256 or file_sha256(src_path)
+    blob = _blob_path(sha256)
+    if _same_file(blob, dest_path):
+        # Tautan keras read-only dari versi lama store: pisahkan menjadi salinan independen
+        _place(blob, dest_path)
+        return sha256
+    if os.path.exists(blob):
+        _stats["deduplicated"] += 1
+    else:
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        tmp_blob = blob + ".tmp"
+        if os.path.exists(tmp_blob):
+            os.remove(tmp_blob)
+        if clone_file(src_path, tmp_blob, copy_fallback=False) is None:
+            if not _same_file(src_path, dest_path):
+                _place(src_path, dest_path)
+            return sha256
+        os.chmod(tmp_blob, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp_blob, blob)
+        _stats["stored"] += 1
+        if _same_file(src_path, dest_path):
+            return sha256  # sudah berbagi blok dengan blob baru
+
+    _place(blob, dest_path)
+    return sha256
+
+
+def adopt_tree(folder: str) -> dict:
+    """
+    Catat semua file di `folder` (kecuali folder tersembunyi) di blob store:
+    file yang isinya sudah ada diganti reflink ke blob yang sama.
+    Dipanggil setelah ekstraksi/penyimpanan dataset.
+    """
+    summary = {"files": 0, "deduplicated_bytes": 0}
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            path = os.path.join(root, name)
+            size = os.path.getsize(path)
+            before = _stats["deduplicated"]
+            store_file(path, path)
+            summary["files"] += 1
+            if _stats["deduplicated"] > before:
+                summary["deduplicated_bytes"] += size
+    if summary["deduplicated_bytes"]:
+        logger.info(f"Dedup {folder}: {summary['deduplicated_bytes'] / (1024 * 1024):.1f} MB tidak disimpan ulang.")
+    return summary
+
+
+def _referenced_hashes() -> dict:
+    """{sha256: jumlah file dataset} menurut katalog lokal (disinkronkan dulu)."""
+    sync_catalog(config.LOCAL_DATA_DIR)
+    counts = {}
+    for entry in list_catalog(config.LOCAL_DATA_DIR):
+        if entry["sha256"]:
+            counts[entry["sha256"]] = counts.get(entry["sha256"], 0) + 1
+    return counts
+
+
+def gc_blobs() -> dict:
+    """
+    Hapus blob yang isinya tidak lagi dimiliki file dataset mana pun menurut katalog lokal.
+    File dataset adalah salinan independen, jadi menghapus blob tidak pernah mengubah dataset.
+    """
+    referenced = _referenced_hashes()
+    freed = 0
+    removed = 0
+    for root, _, files in os.walk(config.DATASET_STORE_DIR):
+        for name in files:
+            if name in referenced:
+                continue
+            path = os.path.join(root, name)
+            try:
+                size = os.path.getsize(path)
+                os.chmod(path, stat.S_IRUSR | stat.S_IWUSR)
+                os.remove(path)
+            except OSError:
+                continue
+            freed += size
+            removed += 1
+    _stats["collected"] += removed
+    if removed:
+        logger.info(f"Blob store: {removed} blob tak terpakai dihapus ({freed / (1024 * 1024):.1f} MB).")
+    return {"removed": removed, "freed_bytes": freed}
+
+
+def store_stats() -> dict:
+    """Ukuran unik di blob store dibanding ukuran logis semua file dataset yang berbagi blob."""
+    referenced = _referenced_hashes()
+    unique = logical = blobs = 0
+    for root, _, files in os.walk(config.DATASET_STORE_DIR):
+        for name in files:
+            size = os.path.getsize(os.path.join(root, name))
+            blobs += 1
+            unique += size
+            logical += size * referenced.get(name, 0)
+    return {**_stats, "blobs": blobs, "unique_mb": unique / (1024 * 1024), "logical_mb": logical / (1024 * 1024)}
+
+
+# --- kolom turunan -------------------------------------------------------
+
+def derived_path(base_path: str, suffix: str) -> str:
+    stem = os.path.splitext(base_path)[0]
+    return f"{stem}{suffix}.parquet" if PARQUET_AVAILABLE else f"{stem}{suffix}.csv"
+
+
+def _derived_meta(base_path: str, dest_path: str) -> dict:
+    info = get_file_info(base_path)
+    return {"base": os.path.relpath(base_path, os.path.dirname(dest_path)).replace("\\", "/"),
+            "base_sha256": info["sha256"] if info else file_sha256(base_path)}
+
+
+def write_derived(base_path: str, columns: pd.DataFrame, suffix: str) -> str:
+    """
+    Simpan hasil analisis sebagai kolom turunan kecil (mis. "Cluster") yang merujuk dataset dasar,
+    bukan salinan dataset lengkap. Dataset utuh dirakit saat dibaca (lihat `read_derived`).
+    Tanpa pyarrow, dataset lengkap ditulis sebagai CSV seperti sebelumnya.
+    """
+    dest_path = derived_path(base_path, suffix)
+    if not PARQUET_AVAILABLE:
+        from utils.file_handler import load_dataset
+
+        full = load_dataset(base_path)
+        for col in columns.columns:
+            full[col] = columns[col].to_numpy()
+        full.to_csv(dest_path, index=False)
+        return dest_path
+
+    meta = _derived_meta(base_path, dest_path)
+    table = pa.Table.from_pandas(columns.reset_index(drop=True), preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), DERIVED_META_KEY: json.dumps(meta)})
+    tmp_path = dest_path + ".tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, dest_path)
+    logger.info(f"Kolom turunan disimpan: {dest_path} ({os.path.getsize(dest_path) / 1024:.1f} KB, dasar: {meta['base']})")
+    return dest_path
+
+
+def write_derived_chunks(base_path: str, chunks, derived_columns: list, suffix: str) -> str:
+    """
+    Versi streaming `write_derived`: `chunks` menghasilkan DataFrame per potongan (baris dataset dasar
+    + kolom turunan, urutan sama dengan file dasar). Hanya `derived_columns` yang ditulis, satu row group
+    per potongan, sehingga memori tetap sebesar satu potongan. Tanpa pyarrow potongan lengkap
+    ditambahkan ke CSV.
+    """
+    dest_path = derived_path(base_path, suffix)
+    tmp_path = dest_path + ".tmp"
+    writer = None
+    try:
+        for i, chunk in enumerate(chunks):
+            if not PARQUET_AVAILABLE:
+                chunk.to_csv(tmp_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+                continue
+            table = pa.Table.from_pandas(chunk[derived_columns].reset_index(drop=True), preserve_index=False)
+            if writer is None:
+                meta = _derived_meta(base_path, dest_path)
+                schema = table.schema.with_metadata({**(table.schema.metadata or {}),
+                                                     DERIVED_META_KEY: json.dumps(meta)})
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(table.cast(writer.schema))
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if writer is not None:
+        writer.close()
+    os.replace(tmp_path, dest_path)
+    logger.info(f"Kolom turunan disimpan (streaming): {dest_path} ({os.path.getsize(dest_path) / 1024:.1f} KB)")
+    return dest_path
+
+
+def derived_info(path: str):
+    """Metadata rujukan dataset dasar jika `path` adalah file kolom turunan, selain itu None."""
+    if not (PARQUET_AVAILABLE and path.lower().endswith(".parquet")):
+        return None
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except Exception:
+        return None
+    if DERIVED_META_KEY not in metadata:
+        return None
+    meta = json.loads(metadata[DERIVED_META_KEY])
+    meta["base_path"] = os.path.normpath(os.path.join(os.path.dirname(path), meta["base"]))
+    return meta
+
+
+def read_derived(path: str, meta: dict, load_base, columns=None) -> pd.DataFrame:
+    """
+    Rakit dataset dari file dasar + kolom turunan. `load_base(path, columns)` membaca dataset dasar.
+    Gagal jika dataset dasar hilang atau isinya sudah berubah sejak kolom turunan dibuat.
+    """
+    base_path = meta["base_path"]
+    info = get_file_info(base_path)
+    if not info:
+        raise FileNotFoundError(f"Dataset dasar untuk {path} tidak ditemukan: {base_path}")
+    if info["sha256"] != meta["base_sha256"]:
+        raise ValueError(f"Dataset dasar {base_path} sudah berubah sejak {os.path.basename(path)} dibuat.")
+
+    own = [f.name for f in pq.read_schema(path)]
+    wanted = list(columns) if columns is not None else None
+    own_cols = [c for c in own if wanted is None or c in wanted]
+    base_cols = None if wanted is None else [c for c in wanted if c not in own]
+
+    base = load_base(base_path, base_cols).reset_index(drop=True)
+    extra = pd.read_parquet(path, columns=own_cols)
+    if len(extra) != len(base):
+        raise ValueError(f"Jumlah baris {os.path.basename(path)} ({len(extra)}) tidak sama dengan dataset dasar ({len(base)}).")
+    base = base.drop(columns=[c for c in own_cols if c in base.columns])
+    df = pd.concat([base, extra], axis=1)
+    return df[wanted] if wanted is not None else df
+
+
+def iter_derived_chunks(path: str, meta: dict, iter_base, chunksize: int):
+    """
+    Versi streaming `read_derived`: potongan dataset dasar (`iter_base(path, chunksize)`) digabung
+    dengan baris kolom turunan yang bersesuaian. Batas row group kedua file tidak harus sama.
+    """
+    base_path = meta["base_path"]
+    info = get_file_info(base_path)
+    if not info:
+        raise FileNotFoundError(f"Dataset dasar untuk {path} tidak ditemukan: {base_path}")
+    if info["sha256"] != meta["base_sha256"]:
+        raise ValueError(f"Dataset dasar {base_path} sudah berubah sejak {os.path.basename(path)} dibuat.")
+
+    batches = pq.ParquetFile(path).iter_batches(batch_size=chunksize)
+    pending = []
+    pending_rows = 0
+    for base in iter_base(base_path, chunksize):
+        n = len(base)
+        if not n:
+            continue
+        while pending_rows < n:
+            batch = next(batches, None)
+            if batch is None:
+                raise ValueError(f"Kolom turunan {os.path.basename(path)} lebih pendek dari dataset dasar.")
+            pending.append(batch.to_pandas())
+            pending_rows += batch.num_rows
+        extra = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0].reset_index(drop=True)
+        pending = [extra.iloc[n:].reset_index(drop=True)]
+        pending_rows -= n
+        base = base.reset_index(drop=True)
+        base = base.drop(columns=[c for c in extra.columns if c in base.columns])
+        yield pd.concat([base, extra.iloc[:n].reset_index(drop=True)], axis=1)
+    if pending_rows or next(batches, None) is not None:
+        raise ValueError(f"Kolom turunan {os.path.basename(path)} lebih panjang dari dataset dasar.")
@@ -0,0 +1,304 @@
+# utils/download_cache.py
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import threading
+import mimetypes
+from collections import namedtuple
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode, unquote
+
+import requests
+import config
+from utils.debug_utils import logger
+from utils import http_client
+from utils.download_engine import download_to_file
+
+
+CachedFile = namedtuple("CachedFile", ["path", "filename", "sha256", "size", "status"])
+
+_INDEX_FILE = "index.json"
+_lock = threading.Lock()
+_key_locks = {}
+_FICLONE = 0x40049409  # ioctl reflink Linux (btrfs, xfs)
+
+
+def _key_lock(key: str) -> threading.Lock:
+    """Lock per source key: fetch paralel untuk key yang sama memakai path sementara yang sama."""
+    with _lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def _cache_dir() -> str:
+    return config.DOWNLOAD_CACHE_DIR
+
+
+def _index_path() -> str:
+    return os.path.join(_cache_dir(), _INDEX_FILE)
+
+
+def _blob_path(sha256: str) -> str:
+    return os.path.join(_cache_dir(), "blobs", sha256[:2], sha256)
+
+
+def _load_index() -> dict:
+    try:
+        with open(_index_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(index: dict):
+    os.makedirs(_cache_dir(), exist_ok=True)
+    tmp_path = _index_path() + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, _index_path())
+
+
+def normalize_source_key(source: str, kind: str = None) -> str:
+    """
+    Kunci cache yang stabil untuk sebuah sumber:
+    - Google Drive (URL atau kind="gdrive") → "gdrive:<file_id>"
+    - Kaggle (kind="kaggle")                 → "kaggle:<owner>/<dataset>[/<file>]"
+    - URL lain → skema/host huruf kecil, tanpa fragment, parameter query diurutkan
+    """
+    if kind == "kaggle":
+        return f"kaggle:{source.strip().strip('/').lower()}"
+    if kind == "gdrive":
+        return f"gdrive:{source.strip()}"
+
+    parsed = urlparse(source.strip())
+    if "drive.google.com" in parsed.netloc:
+        match = re.search(r'/d/([a-zA-Z0-9_-]+)', source) or re.search(r'id=([a-zA-Z0-9_-]+)', source)
+        if match:
+            return f"gdrive:{match.group(1)}"
+
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    normalized = urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path or "/", "", query, ""))
+    return f"url:{normalized}"
+
+
+def filename_from_response(response, fallback: str = None) -> str:
+    """
+    Nama file dari header Content-Disposition, lalu `fallback`, lalu path URL;
+    ekstensi ditebak dari Content-Type jika masih kosong.
+    """
+    cd = response.headers.get("Content-Disposition", "")
+    filename = None
+    if "filename=" in cd:
+        filename = unquote(cd.split("filename=")[-1].split(";")[0].strip().strip('"').strip("'"))
+
+    if not filename:
+        filename = fallback or os.path.basename(urlparse(response.url).path) or "downloaded_file"
+
+    if not os.path.splitext(filename)[1]:
+        mime_type = response.headers.get("Content-Type", "")
+        ext = mimetypes.guess_extension(mime_type.split(";")[0].strip())
+        if ext:
+            filename += ext
+    return filename
+
+
+def clone_file(src: str, dst: str, copy_fallback: bool = True):
+    """
+    Salin `src` ke `dst` sebagai salinan independen: reflink (copy-on-write, tanpa tambahan disk)
+    jika filesystem mendukung, selain itu salin biasa. Bukan hardlink, sehingga mengubah `dst`
+    tidak pernah mengubah `src`. Mengembalikan "reflink" atau "copy"; dengan
+    `copy_fallback=False` mengembalikan None (tanpa menulis `dst`) jika reflink tidak bisa.
+    """
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        try:
+            with open(src, "rb") as s, open(dst, "wb") as d:
+                fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            return "reflink"
+        except OSError:
+            if os.path.exists(dst):
+                os.remove(dst)
+    if not copy_fallback:
+        return None
+    shutil.copyfile(src, dst)
+    return "copy"
+
+
+def _materialize(sha256: str, dest_dir: str, filename: str) -> str:
+    """
+    Letakkan isi blob di `dest_dir/filename` sebagai salinan (reflink jika bisa).
+    Hardlink tidak dipakai: file dataset yang diedit di tempat akan ikut mengubah blob cache
+    yang dialamatkan lewat SHA-256, lalu isi rusak itu disajikan pada cache hit berikutnya.
+    """
+    blob = _blob_path(sha256)
+    if not dest_dir:
+        return blob
+    os.makedirs(dest_dir, exist_ok=True)
+    dest = os.path.join(dest_dir, filename)
+    tmp_path = dest + ".tmp"
+    clone_file(blob, tmp_path)
+    os.replace(tmp_path, dest)
+    return dest
+
+
+def _store_response(url: str, response, key: str, headers: dict = None, progress=None, auth=None) -> tuple:
+    """
+    Simpan body respons ke blob store lewat download engine (paralel + bisa dilanjutkan
+    jika server mendukung Range). Mengembalikan (sha256, size).
+    """
+    tmp_dir = os.path.join(_cache_dir(), "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    # Path sementara stabil per key: unduhan yang terputus dilanjutkan pada pemanggilan berikutnya
+    tmp_path = os.path.join(tmp_dir, hashlib.sha1(key.encode("utf-8")).hexdigest())
+    stats = download_to_file(url, tmp_path, headers=headers, response=response, progress=progress, auth=auth)
+    sha256 = stats["sha256"]
+    blob = _blob_path(sha256)
+    os.makedirs(os.path.dirname(blob), exist_ok=True)
+    if os.path.exists(blob):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, blob)
+    return sha256, stats["bytes"]
+
+
+def fetch(url: str, dest_dir: str = None, key: str = None, filename: str = None, fallback_name: str = None,
+          headers: dict = None, progress=None, **kwargs) -> CachedFile:
+    """
+    Unduh `url` lewat cache unduhan persisten.
+    - Entri yang sudah ada direvalidasi dengan If-None-Match / If-Modified-Since;
+      respons 304 memakai blob lokal tanpa transfer ulang.
+    - Isi disimpan content-addressed (SHA-256), lalu disalin (reflink jika bisa) ke `dest_dir/filename`.
+    - Jika jaringan gagal tetapi entri ada, salinan lokal tetap dipakai.
+    - Pemanggilan paralel untuk key yang sama diserialkan (aman dipakai worker batch ingest).
+    Status: "downloaded", "not_modified", atau "offline".
+    """
+    key = key or normalize_source_key(url)
+    # Worker lain yang mengambil key yang sama menunggu, lalu cukup merevalidasi (304) hasilnya
+    with _key_lock(key):
+        return _fetch_locked(url, dest_dir, key, filename, fallback_name, headers, progress, **kwargs)
+
+
+def _fetch_locked(url, dest_dir, key, filename, fallback_name, headers, progress, **kwargs) -> CachedFile:
+    with _lock:
+        entry = _load_index().get(key)
+    if entry and not os.path.exists(_blob_path(entry["sha256"])):
+        entry = None
+
+    request_headers = dict(headers or {})
+    if entry:
+        if entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        with http_client.get(url, headers=request_headers, stream=True, allow_redirects=True, **kwargs) as r:
+            if r.status_code == 304 and entry:
+                status = "not_modified"
+                logger.info(f"Cache unduhan valid (304): {key}")
+            else:
+                r.raise_for_status()
+                name = filename or filename_from_response(r, fallback_name)
+                sha256, size = _store_response(url, r, key, headers, progress, kwargs.get("auth"))
+                entry = {
+                    "url": url,
+                    "sha256": sha256,
+                    "size": size,
+                    "filename": name,
+                    "etag": r.headers.get("ETag"),
+                    "last_modified": r.headers.get("Last-Modified"),
+                    "fetched_at": time.time(),
+                }
+                status = "downloaded"
+                logger.info(f"Diunduh ke cache: {key} ({size / (1024 * 1024):.1f} MB)")
+    except requests.RequestException as e:
+        if not entry:
+            raise
+        status = "offline"
+        logger.warning(f"Gagal revalidasi {key} ({e}), memakai salinan cache.")
+
+    entry["last_access"] = time.time()
+    with _lock:
+        index = _load_index()
+        index[key] = entry
+        _save_index(index)
+        _evict(index, keep=key)
+
+    name = filename or entry["filename"]
+    path = _materialize(entry["sha256"], dest_dir, name)
+    return CachedFile(path, name, entry["sha256"], entry["size"], status)
+
+
+def _evict(index: dict, keep: str = None):
+    """
+    Hapus entri yang paling lama tidak dipakai sampai total ukuran blob <= DOWNLOAD_CACHE_MAX_MB.
+    Entri `keep` (yang baru saja dipakai) tidak pernah dievict.
+    """
+    budget = config.DOWNLOAD_CACHE_MAX_MB * 1024 * 1024
+    blobs = {e["sha256"]: e["size"] for e in index.values()}
+    total = sum(blobs.values())
+    if total <= budget:
+        return
+
+    for key, entry in sorted(index.items(), key=lambda kv: kv[1].get("last_access", 0)):
+        if total <= budget:
+            break
+        if key == keep:
+            continue
+        del index[key]
+        sha256 = entry["sha256"]
+        if not any(e["sha256"] == sha256 for e in index.values()):
+            try:
+                os.remove(_blob_path(sha256))
+            except OSError:
+                pass
+            total -= blobs[sha256]
+        logger.info(f"Cache unduhan dievict: {key}")
+    _save_index(index)
+
+
+def list_download_cache() -> list:
+    """Daftar entri cache unduhan, terbaru dipakai lebih dulu."""
+    with _lock:
+        index = _load_index()
+    entries = [{"key": k, **v} for k, v in index.items()]
+    return sorted(entries, key=lambda e: e.get("last_access", 0), reverse=True)
+
+
+def purge_download_cache(key: str = None) -> int:
+    """Hapus satu entri (berdasarkan key) atau seluruh cache unduhan. Mengembalikan jumlah entri yang dihapus."""
+    with _lock:
+        index = _load_index()
+        if key is None:
+            removed = len(index)
+            shutil.rmtree(_cache_dir(), ignore_errors=True)
+            return removed
+
+        entry = index.pop(key, None)
+        if entry is None:
+            return 0
+        if not any(e["sha256"] == entry["sha256"] for e in index.values()):
+            try:
+                os.remove(_blob_path(entry["sha256"]))
+            except OSError:
+                pass
+        _save_index(index)
+        return 1
+
+
+if __name__ == "__main__":
+    # python -m utils.download_cache list | purge [key]
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "purge":
+        n = purge_download_cache(sys.argv[2] if len(sys.argv) > 2 else None)
+        print(f"🧹 {n} entri cache unduhan dihapus.")
+    else:
+        entries = list_download_cache()
+        total = sum({e["sha256"]: e["size"] for e in entries}.values())
+        print(f"=== Cache unduhan ({len(entries)} entri, {total / (1024 * 1024):.1f} MB / {config.DOWNLOAD_CACHE_MAX_MB} MB) ===")
+        for e in entries:
+            print(f"- {e['key']}")
+            print(f"   {e['filename']} | {e['size'] / (1024 * 1024):.2f} MB | sha256 {e['sha256'][:12]}")
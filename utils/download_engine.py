@@ -0,0 +1,249 @@
+# utils/download_engine.py
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import config
+from utils.debug_utils import logger
+from utils import http_client
+from utils.columnar_cache import file_sha256
+
+
+# Ukuran potongan baca adaptif (byte)
+MIN_CHUNK = 64 * 1024
+START_CHUNK = 256 * 1024
+MAX_CHUNK = 8 * 1024 * 1024
+# Simpan progres ke file state paling lambat setiap interval ini (detik)
+STATE_FLUSH_SECONDS = 2.0
+
+
+class _AdaptiveChunk:
+    """Perbesar potongan baca saat koneksi cepat, perkecil saat lambat."""
+
+    def __init__(self):
+        self.size = START_CHUNK
+
+    def update(self, elapsed: float):
+        if elapsed < 0.1:
+            self.size = min(self.size * 2, MAX_CHUNK)
+        elif elapsed > 1.0:
+            self.size = max(self.size // 2, MIN_CHUNK)
+
+
+def _same_host(a: str, b: str) -> bool:
+    return urlparse(a).netloc.lower() == urlparse(b).netloc.lower()
+
+
+def _probe(url: str, headers: dict, auth=None):
+    """
+    Cek dukungan Range lewat request bytes=0-0.
+    Mengembalikan (url_akhir, ukuran_total_atau_None, mendukung_range, validator).
+    """
+    probe_headers = {**headers, "Range": "bytes=0-0", "Accept-Encoding": "identity"}
+    with http_client.get(url, headers=probe_headers, stream=True, allow_redirects=True, auth=auth) as r:
+        r.raise_for_status()
+        validator = r.headers.get("ETag") or r.headers.get("Last-Modified")
+        content_range = r.headers.get("Content-Range", "")
+        if r.status_code == 206 and "/" in content_range and not content_range.endswith("/*"):
+            return r.url, int(content_range.rsplit("/", 1)[1]), True, validator
+        length = r.headers.get("Content-Length")
+        return r.url, int(length) if length else None, False, validator
+
+
+def _split_ranges(size: int, parts: int):
+    step = -(-size // parts)
+    return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+
+def _load_state(state_path: str, size: int, validator):
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get("size") != size or state.get("validator") != validator:
+        return None
+    return state
+
+
+def _save_state(state_path: str, state: dict):
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, state_path)
+
+
+def _download_ranges(url: str, part_path: str, state_path: str, state: dict, headers: dict, workers: int,
+                     progress=None, auth=None):
+    """
+    Unduh semua range yang belum selesai secara paralel ke file yang sudah dialokasikan.
+    Offset range di file state hanya dimajukan setelah worker pemiliknya flush + fsync handle-nya
+    sendiri, sehingga setelah crash unduhan tidak pernah dilanjutkan dari byte yang belum tertulis.
+    Ctrl-C / kegagalan satu range menghentikan worker lain pada potongan berikutnya.
+    """
+    lock = threading.Lock()
+    cancel = threading.Event()
+    # Byte yang sudah diterima per range (untuk progres); state["parts"][i][2] = byte yang sudah durable
+    received = [part[2] for part in state["parts"]]
+
+    def commit(index, f, written):
+        f.flush()
+        os.fsync(f.fileno())
+        with lock:
+            state["parts"][index][2] = written
+            _save_state(state_path, state)
+
+    def fetch_part(index):
+        start, end, done = state["parts"][index]
+        if start + done > end:
+            return
+        range_headers = {**headers, "Range": f"bytes={start + done}-{end}", "Accept-Encoding": "identity"}
+        chunk = _AdaptiveChunk()
+        written = done
+        with http_client.get(url, headers=range_headers, stream=True, auth=auth) as r:
+            if r.status_code != 206:
+                raise IOError(f"Server tidak mengembalikan partial content (status {r.status_code}).")
+            with open(part_path, "r+b") as f:
+                f.seek(start + done)
+                last_sync = time.time()
+                try:
+                    while not cancel.is_set():
+                        t0 = time.time()
+                        data = r.raw.read(chunk.size)
+                        if not data:
+                            break
+                        f.write(data)
+                        written += len(data)
+                        chunk.update(time.time() - t0)
+                        if progress:
+                            with lock:
+                                received[index] = written
+                                progress(sum(received), state["size"])
+                        if time.time() - last_sync > STATE_FLUSH_SECONDS:
+                            commit(index, f, written)
+                            last_sync = time.time()
+                finally:
+                    commit(index, f, written)
+        if cancel.is_set():
+            return
+        if written < end - start + 1:
+            raise IOError(f"Range {start}-{end} terputus sebelum selesai.")
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    futures = [pool.submit(fetch_part, i) for i in range(len(state["parts"]))]
+    try:
+        for future in futures:
+            future.result()
+    except BaseException:
+        # Ctrl-C atau range gagal: hentikan worker lain, tunggu offset terakhir mereka tersimpan
+        cancel.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    pool.shutdown()
+
+
+def _stream_response(response, part_path: str, hasher, progress=None) -> int:
+    """Fallback satu koneksi: tulis body respons ke file dengan potongan adaptif sambil di-hash."""
+    chunk = _AdaptiveChunk()
+    written = 0
+    length = response.headers.get("Content-Length")
+    total = int(length) if length and not response.headers.get("Content-Encoding") else None
+    response.raw.decode_content = True
+    with open(part_path, "wb") as f:
+        while True:
+            t0 = time.time()
+            data = response.raw.read(chunk.size)
+            if not data:
+                break
+            f.write(data)
+            hasher.update(data)
+            written += len(data)
+            if progress:
+                progress(written, total)
+            chunk.update(time.time() - t0)
+    return written
+
+
+def download_to_file(url: str, dest_path: str, headers: dict = None, response=None, workers: int = None,
+                     progress=None, auth=None) -> dict:
+    """
+    Unduh `url` ke `dest_path`.
+    - Server mengiklankan Range dan file >= DOWNLOAD_PARALLEL_MIN_MB → file dialokasikan di awal,
+      dipecah menjadi beberapa range yang diunduh paralel oleh thread pool. Progres disimpan di
+      `<dest>.part.json`, sehingga unduhan yang terputus dilanjutkan dari posisi terakhir.
+    - Selain itu → satu koneksi. `response` yang sudah terbuka dibaca langsung jika server tidak
+      mendukung Range atau Content-Length-nya di bawah ambang paralel; hanya body besar yang
+      ditutup lalu diunduh ulang per range.
+    `progress(bytes_selesai, total_atau_None)` dipanggil setiap potongan data ditulis.
+    `auth` ikut dikirim di semua request ke host `url`, tidak ke host tujuan redirect
+    (mis. signed URL storage).
+    Mengembalikan statistik: bytes (ukuran file), transferred, seconds, mbps, mode, sha256.
+    """
+    headers = dict(headers or {})
+    workers = workers or config.DOWNLOAD_WORKERS
+    part_path = dest_path + ".part"
+    state_path = dest_path + ".part.json"
+    t_start = time.time()
+
+    min_parallel = config.DOWNLOAD_PARALLEL_MIN_MB * 1024 * 1024
+    stream_open = False
+    if response is not None:
+        length = response.headers.get("Content-Length")
+        small = (length is not None and not response.headers.get("Content-Encoding")
+                 and int(length) < min_parallel and not os.path.exists(state_path))
+        # Body kecil (atau server tanpa Range) langsung dibaca dari respons yang sudah terbuka:
+        # tanpa probe dan range GET tambahan, koneksi pool tetap dipakai
+        stream_open = small or response.headers.get("Accept-Ranges", "").lower() != "bytes"
+
+    if stream_open:
+        final_url, size, ranged, validator = response.url, None, False, None
+    else:
+        if response is not None:
+            if not _same_host(response.url, url):
+                auth = None
+            url = response.url  # URL akhir setelah redirect (mis. signed URL storage)
+            response.close()
+            response = None
+        final_url, size, ranged, validator = _probe(url, headers, auth)
+        if not _same_host(final_url, url):
+            auth = None
+
+    resumed = 0
+    if ranged and size:
+        parts = workers if size >= min_parallel else 1
+        state = _load_state(state_path, size, validator)
+        if state and os.path.exists(part_path):
+            resumed = sum(p[2] for p in state["parts"])
+            logger.info(f"Melanjutkan unduhan: {resumed / (1024 * 1024):.1f} / {size / (1024 * 1024):.1f} MB sudah ada.")
+        else:
+            state = {"url": final_url, "size": size, "validator": validator, "parts": _split_ranges(size, parts)}
+            with open(part_path, "wb") as f:
+                f.truncate(size)  # alokasikan file di awal
+            _save_state(state_path, state)
+        mode = f"paralel x{len(state['parts'])}" if len(state["parts"]) > 1 else "range tunggal"
+        _download_ranges(final_url, part_path, state_path, state, headers, workers, progress, auth)
+        os.remove(state_path)
+        sha256 = file_sha256(part_path)
+        written = size
+    else:
+        mode = "stream tunggal"
+        h = hashlib.sha256()
+        if response is None:
+            response = http_client.get(url, headers=headers, stream=True, allow_redirects=True, auth=auth)
+        with response:
+            response.raise_for_status()
+            written = _stream_response(response, part_path, h, progress)
+        sha256 = h.hexdigest()
+
+    os.replace(part_path, dest_path)
+    seconds = max(time.time() - t_start, 1e-6)
+    transferred = written - resumed
+    mbps = transferred / (1024 * 1024) / seconds
+    logger.info(f"Unduhan selesai ({mode}): {transferred / (1024 * 1024):.1f} MB dalam {seconds:.1f} s ({mbps:.1f} MB/s)")
+    return {"bytes": written, "transferred": transferred, "seconds": seconds, "mbps": mbps, "mode": mode, "sha256": sha256}
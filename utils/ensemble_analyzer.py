@@ -19,7 +19,7 @@ from sklearn.ensemble import (
 from sklearn.tree import DecisionTreeClassifier
 
 from utils.debug_utils import logger
-from utils.file_handler import detect_file_type
+from utils.file_handler import detect_file_type, load_dataset
 from utils.chart_utils import plot_distribution
 
 
@@ -45,14 +45,7 @@ def analyze_ensemble(dataset_path):
         # ===============================
         # BACA DATASET
         # ===============================
-        if ext == "csv":
-            df = pd.read_csv(local_path)
-        elif ext == "xlsx":
-            df = pd.read_excel(local_path)
-        elif ext == "json":
-            df = pd.read_json(local_path)
-        else:
-            raise ValueError(f"Format {ext} belum didukung.")
+        df = load_dataset(local_path)
 
         logger.info(f"Dataset dibaca: {df.shape[0]} baris, {df.shape[1]} kolom")
         print(f"Dataset berisi {df.shape[0]} baris dan {df.shape[1]} kolom")
@@ -0,0 +1,129 @@
+# utils/feature_projection.py
+import re
+
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import IncrementalPCA, PCA
+from sklearn.random_projection import SparseRandomProjection
+
+import config
+from utils.debug_utils import logger
+
+
+# Token nama kolom yang lazim dipakai sebagai pengenal (Id, ID_Pelanggan, CustomerID, PostalCode, kode_pos, ...)
+_ID_TOKENS = {"id", "kode", "code", "nomor", "nik", "zip", "zipcode", "postal", "postcode", "uuid", "key"}
+_NAME_TOKEN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def _looks_like_id_name(name) -> bool:
+    return any(token.lower() in _ID_TOKENS for token in _NAME_TOKEN.findall(str(name)))
+
+
+def identifier_columns(sample: pd.DataFrame, columns) -> dict:
+    """
+    Kolom numerik bernilai bulat yang lebih mirip pengenal daripada fitur, dinilai dari kardinalitas sampel:
+    - namanya berpola pengenal (Id, ID_Pelanggan, CustomerID, PostalCode, kode_pos, ...) dan rasio nilai
+      unik ≥ KMEANS_ID_NAME_UNIQUE_RATIO (kode kategori seperti Gender_code 0/1 tetap dipakai), atau
+    - rasio nilai unik ≥ KMEANS_ID_UNIQUE_RATIO dan nilainya nyaris berurutan (nomor baris / auto-increment)
+    Mengembalikan {kolom: alasan}.
+    """
+    found = {}
+    for col in columns:
+        values = pd.to_numeric(sample[col], errors="coerce").dropna().to_numpy(dtype="float64")
+        if not len(values) or not np.all(np.mod(values, 1) == 0):
+            continue
+        n_unique = len(np.unique(values))
+        ratio = n_unique / len(values)
+        span = values.max() - values.min() + 1
+        if _looks_like_id_name(col) and ratio >= config.KMEANS_ID_NAME_UNIQUE_RATIO:
+            found[col] = f"nama kolom pengenal, {ratio:.0%} nilai unik"
+        elif ratio >= config.KMEANS_ID_UNIQUE_RATIO and span <= 2 * n_unique:
+            found[col] = f"{ratio:.0%} nilai unik berurutan"
+    return found
+
+
+def _scaler_state(X: np.ndarray):
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    return mean, scale
+
+
+def fit_projection(X: np.ndarray, method: str = None, max_components: int = None, variance: float = None,
+                   blocks=None):
+    """
+    Tahap reduksi dimensi sebelum clustering (`X` = dataset penuh atau potongan pertama, sudah diimputasi):
+    - "pca"    : standardisasi (rata-rata & skala dari `X`) + IncrementalPCA.partial_fit per blok baris,
+                 atas seluruh data: `blocks` (iterable matriks fitur per potongan, satu pass tambahan atas
+                 disk untuk mode streaming/coreset) atau `X` jika tidak diberikan. Komponen dipangkas
+                 sampai varians kumulatif ≥ `variance` (minimal 2)
+    - "random" : standardisasi + sparse random projection ke ≤ separuh jumlah kolom
+                 (tanpa fitting, cocok untuk ribuan kolom)
+    - "auto"   : "pca" hanya untuk data lebar (jumlah kolom ≥ KMEANS_PROJECTION_MIN_FEATURES)
+    - "none"   : tanpa proyeksi (default, hasil clustering sama seperti sebelumnya)
+    Mengembalikan state yang bisa disimpan (JSON) atau None jika tanpa proyeksi.
+    """
+    method = (method or config.KMEANS_PROJECTION).lower()
+    n_rows, n_features = X.shape
+    if method == "auto":
+        method = "pca" if n_features >= config.KMEANS_PROJECTION_MIN_FEATURES else "none"
+    if method == "none" or n_features < 3:
+        return None
+
+    max_components = min(max_components or config.KMEANS_PROJECTION_COMPONENTS, n_features, n_rows)
+    variance = variance or config.KMEANS_PROJECTION_VARIANCE
+    mean, scale = _scaler_state(X)
+    Xs = (X - mean) / scale
+
+    if method == "pca":
+        batch = max(config.KMEANS_BATCH_SIZE, max_components)
+        ipca = IncrementalPCA(n_components=max_components)
+        n_fitted = 0
+        for data in ((Xs,) if blocks is None else ((B - mean) / scale for B in blocks)):
+            for start in range(0, len(data), batch):
+                block = data[start:start + batch]
+                if len(block) >= max_components:
+                    ipca.partial_fit(block)
+                    n_fitted += len(block)
+        logger.info(f"IncrementalPCA dipasang pada {n_fitted:,} baris.")
+        ratio = np.cumsum(ipca.explained_variance_ratio_)
+        keep = max(2, int(np.searchsorted(ratio, variance) + 1))
+        keep = min(keep, len(ratio))
+        state = {"method": "pca", "center": ipca.mean_, "components": ipca.components_[:keep],
+                 "explained_variance": float(ratio[keep - 1])}
+    elif method == "random":
+        # Tanpa varians untuk dipangkas: lebar dibatasi KMEANS_PROJECTION_COMPONENTS dan maksimal separuh kolom
+        n_components = max(2, min(max_components, n_features // 2))
+        srp = SparseRandomProjection(n_components=n_components, random_state=42).fit(Xs)
+        components = srp.components_
+        components = components.toarray() if hasattr(components, "toarray") else np.asarray(components)
+        state = {"method": "random", "center": np.zeros(n_features), "components": components,
+                 "explained_variance": None}
+    else:
+        raise ValueError(f"Metode proyeksi tidak dikenal: {method}")
+
+    state.update(mean=mean, scale=scale)
+    logger.info(f"Proyeksi {state['method']}: {n_features} kolom → {len(state['components'])} komponen")
+    return {k: (v.tolist() if isinstance(v, np.ndarray) else v) for k, v in state.items()}
+
+
+def project(X: np.ndarray, state: dict) -> np.ndarray:
+    """Terapkan proyeksi tersimpan: ((X - mean) / scale - center) · componentsᵀ."""
+    Xs = (X - np.asarray(state["mean"])) / np.asarray(state["scale"])
+    return (Xs - np.asarray(state["center"])) @ np.asarray(state["components"]).T
+
+
+def plot_coordinates(Z: np.ndarray, state: dict) -> np.ndarray:
+    """Dua komponen teratas untuk plot 2-D (proyeksi acak diurutkan dulu lewat PCA kecil)."""
+    if state["method"] == "pca" or Z.shape[1] <= 2:
+        return Z[:, :2]
+    return PCA(n_components=2, random_state=42).fit_transform(Z)
+
+
+def describe_projection(state: dict) -> str:
+    n_in = len(state["mean"])
+    n_out = len(state["components"])
+    text = f"{state['method'].upper()} {n_in} kolom → {n_out} komponen"
+    if state.get("explained_variance") is not None:
+        text += f" ({state['explained_variance']:.0%} varians)"
+    return text
@@ -1,14 +1,25 @@
 #utils/file_checker.py
+import numpy as np
 import pandas as pd
-import requests
 import json
 import os
-from io import StringIO, BytesIO
+import re
+import codecs
+from collections import OrderedDict
+from contextlib import contextmanager
+from io import BytesIO
 from pandas import json_normalize
 from utils.debug_utils import logger
+from utils import http_client
+from utils.columnar_cache import load_columnar, get_cached_schema
+import config
 
 
-SUPPORTED_EXT = ["csv", "json", "xlsx"]
+SUPPORTED_EXT = ["csv", "json", "xlsx", "parquet"]
+
+# Preview file remote: ukuran awal Range dan batas maksimal prefix yang diunduh
+REMOTE_PREVIEW_INITIAL_BYTES = 64 * 1024
+REMOTE_PREVIEW_MAX_BYTES = 64 * 1024 * 1024
 
 
 def _detect_file_type(file_path: str) -> str:
@@ -44,7 +55,7 @@ def detect_file_type(file_path):
     
     # Prioritaskan format utama
     for e in reversed(exts):  # cek dari belakang
-        if e in ["csv", "xlsx", "xls", "json", "zip"]:
+        if e in ["csv", "xlsx", "xls", "json", "zip", "parquet"]:
             return e
 
     # --- fallback: deteksi berdasarkan isi file ---
@@ -53,6 +64,8 @@ def detect_file_type(file_path):
             header = f.read(8)
             if header.startswith(b"PK\x03\x04"):  # ZIP
                 return "zip"
+            elif header.startswith(b"PAR1"):  # Parquet
+                return "parquet"
             elif header[:2] == b"\x50\x4B":  # tanda khas XLSX (ZIP)
                 return "zip"
             elif header.strip().startswith(b"{") or header.strip().startswith(b"["):
@@ -64,112 +77,747 @@ def detect_file_type(file_path):
 
     return None
 
-def _read_json_to_df(content: bytes, limit: int = None):
-    """Helper: membaca JSON dan melakukan normalisasi jika perlu."""
+_JSON_TOKEN = re.compile(rb'["\\\[\]{},]')
+
+
+def _count_csv_rows(stream, block_size=1 << 20) -> int:
+    """
+    Menghitung jumlah baris data CSV dari jumlah newline mentah (tanpa parsing).
+    Baris header tidak ikut dihitung. Field ber-quote yang memuat newline
+    membuat hasilnya sedikit lebih besar, sehingga nilainya berupa perkiraan.
+    """
+    newlines = 0
+    last = b""
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        newlines += block.count(b"\n")
+        last = block[-1:]
+    lines = newlines + (1 if last and last != b"\n" else 0)
+    return max(lines - 1, 0)
+
+
+def _count_json_array_items(stream, block_size=1 << 20):
+    """
+    Menghitung elemen array JSON tingkat atas secara streaming, tanpa membangun objek:
+    cukup menghitung koma pada kedalaman 1 (di luar string).
+    Mengembalikan None jika dokumen tingkat atas bukan array.
+    """
+    head = stream.read(64).lstrip().lstrip(b"\xef\xbb\xbf").lstrip()
+    if not head.startswith(b"["):
+        return None
+    stream.seek(0)
+
+    depth = 0
+    in_string = False
+    skip_at = -1
+    commas = 0
+    offset = 0
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        for m in _JSON_TOKEN.finditer(block):
+            pos = offset + m.start()
+            if pos == skip_at:
+                continue
+            ch = block[m.start()]
+            if in_string:
+                if ch == 0x5C:  # backslash → karakter berikutnya di-escape
+                    skip_at = pos + 1
+                elif ch == 0x22:
+                    in_string = False
+            elif ch == 0x22:
+                in_string = True
+            elif ch in (0x5B, 0x7B):
+                depth += 1
+            elif ch in (0x5D, 0x7D):
+                depth -= 1
+            elif ch == 0x2C and depth == 1:
+                commas += 1
+        offset += len(block)
+    return commas + 1
+
+
+def _xlsx_preview(stream, limit):
+    """
+    Membaca `limit` baris pertama XLSX (openpyxl read_only) dan mengambil
+    jumlah baris/kolom dari metadata dimensi worksheet, bukan dari isi sheet.
+    """
+    from openpyxl import load_workbook
+
+    if not (hasattr(stream, "seekable") and stream.seekable()):
+        stream = BytesIO(stream.read())
+    wb = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        rows = list(ws.iter_rows(max_row=limit + 1, values_only=True))
+        if not rows:
+            return pd.DataFrame(), 0, 0
+        header = [c if c is not None else f"Unnamed: {i}" for i, c in enumerate(rows[0])]
+        df = pd.DataFrame(rows[1:], columns=header)
+        # max_row/max_column diambil dari elemen <dimension>; None jika tidak tersedia
+        n_rows = ws.max_row - 1 if ws.max_row else None
+        n_cols = ws.max_column or df.shape[1]
+        return df, n_rows, n_cols
+    finally:
+        wb.close()
+
+
+def read_preview_frame(stream, ext, limit, count_rows=True):
+    """
+    Membaca `limit` baris pertama dari stream biner dan menghitung ukuran dataset
+    dengan cara murah. Mengembalikan (df_preview, jumlah_baris, jumlah_kolom);
+    jumlah baris bernilai None jika tidak dapat dihitung tanpa membaca ulang stream.
+    """
+    can_rewind = count_rows and hasattr(stream, "seekable") and stream.seekable()
+
+    if ext == "csv":
+        df = pd.read_csv(stream, nrows=limit)
+        n_rows = None
+        if can_rewind:
+            stream.seek(0)
+            n_rows = _count_csv_rows(stream)
+        return df, n_rows, df.shape[1]
+
+    if ext == "json":
+        items = []
+        for item in _iter_json_records(stream):
+            items.append(item)
+            if len(items) >= limit:
+                break
+        df = _json_records_to_frame(items)
+        n_rows = None
+        if can_rewind:
+            stream.seek(0)
+            n_rows = _count_json_array_items(stream) if len(df) else 0
+        return df, n_rows, df.shape[1]
+
+    if ext == "xlsx":
+        return _xlsx_preview(stream, limit)
+
+    if ext == "parquet":
+        # Jumlah baris & kolom dari footer Parquet, cuplikan dari row group pertama
+        import pyarrow.parquet as pq
+
+        if not (hasattr(stream, "seekable") and stream.seekable()):
+            stream = BytesIO(stream.read())
+        pf = pq.ParquetFile(stream)
+        batch = next(pf.iter_batches(batch_size=limit), None)
+        df = batch.to_pandas() if batch is not None else pf.schema_arrow.empty_table().to_pandas()
+        return df, pf.metadata.num_rows, pf.metadata.num_columns
+
+    raise ValueError(f"Preview untuk format {ext} belum tersedia.")
+
+
+def _remote_total_size(response):
+    """Ukuran total file remote dari header Content-Range / Content-Length (None jika tidak diketahui)."""
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    length = response.headers.get("Content-Length")
+    if response.status_code == 200 and length and not response.headers.get("Content-Encoding"):
+        return int(length)
+    return None
+
+
+def _fetch_remote_prefix(url, has_enough):
+    """
+    Mengambil awalan (prefix) byte file remote sampai `has_enough(prefix)` terpenuhi.
+    - Server mendukung Range → minta bytes=0-N, perbesar N (x4) sampai cukup.
+    - Server mengabaikan Range (200) → baca stream dan hentikan lebih awal.
+    Mengembalikan (prefix, ukuran_total_atau_None, sudah_sampai_akhir_file).
+    """
+    size = REMOTE_PREVIEW_INITIAL_BYTES
+    while True:
+        headers = {"Range": f"bytes=0-{size - 1}", "Accept-Encoding": "identity"}
+        with http_client.get(url, headers=headers, stream=True) as r:
+            if r.status_code == 416:  # file kosong
+                return b"", 0, True
+            if r.status_code == 206:
+                prefix = r.content
+                total = _remote_total_size(r)
+                at_eof = len(prefix) < size or (total is not None and len(prefix) >= total)
+                if at_eof or has_enough(prefix) or size >= REMOTE_PREVIEW_MAX_BYTES:
+                    return prefix, total, at_eof
+                size *= 4
+                logger.info(f"Prefix remote belum cukup, memperbesar Range menjadi {size // 1024} KB...")
+                continue
+            if r.status_code != 200:
+                raise ValueError(f"Gagal mengunduh file dari {url}")
+
+            logger.info("Server tidak mendukung Range, membaca stream sampai baris cukup.")
+            total = _remote_total_size(r)
+            buf = bytearray()
+            for chunk in r.iter_content(chunk_size=64 * 1024):
+                buf.extend(chunk)
+                if has_enough(buf) or len(buf) >= REMOTE_PREVIEW_MAX_BYTES:
+                    return bytes(buf), total, False
+            return bytes(buf), total, True
+
+
+def _json_prefix_items(prefix, limit):
+    """Ambil maksimal `limit` elemen JSON dari prefix yang mungkin terpotong di tengah."""
+    items = []
     try:
-        df = pd.read_json(StringIO(content.decode("utf-8")))
-        if df.shape[1] == 1 and isinstance(df.iloc[0, 0], (dict, list)):
-            df = json_normalize(df.iloc[:, 0])
+        for item in _iter_json_records(BytesIO(prefix)):
+            items.append(item)
+            if len(items) >= limit:
+                break
     except ValueError:
-        data = json.loads(content.decode("utf-8"))
-        if isinstance(data, list):
-            df = pd.DataFrame(data)
-        elif isinstance(data, dict):
-            df = json_normalize(data)
+        # Prefix berakhir di tengah elemen: elemen yang sudah lengkap tetap dipakai
+        pass
+    return items
+
+
+def _json_top_level(prefix):
+    """Karakter pembuka dokumen JSON ("[" untuk array) atau None jika prefix masih kosong."""
+    head = bytes(prefix[:1024]).lstrip().lstrip(b"\xef\xbb\xbf").lstrip()
+    return head[:1].decode("latin-1") if head else None
+
+
+def _read_remote_preview(url, ext, limit):
+    """
+    Preview CSV/JSON remote hanya dengan mengunduh awalan file.
+    Mengembalikan (df_preview, jumlah_baris_atau_None, jumlah_kolom).
+    """
+    if ext == "csv":
+        prefix, total, at_eof = _fetch_remote_prefix(url, lambda buf: buf.count(b"\n") > limit)
+        cut = prefix.rfind(b"\n")
+        if not at_eof and cut >= 0:
+            prefix = prefix[: cut + 1]  # buang baris terakhir yang terpotong
+        elif not at_eof:
+            logger.warning("Baris header melebihi batas prefix remote; kolom terakhir bisa terpotong.")
+        df = pd.read_csv(BytesIO(prefix), nrows=limit)
+        lines = prefix.count(b"\n")
+        if at_eof:
+            n_rows = _count_csv_rows(BytesIO(prefix))
         else:
-            raise ValueError("Format JSON tidak dapat dikenali.")
-    return df if limit is None else df.head(limit)
+            n_rows = None
+            if total and lines:
+                estimate = int(total / (len(prefix) / lines)) - 1
+                logger.info(f"Perkiraan jumlah baris dari ukuran file: ~{estimate}")
+    elif ext == "json":
+        prefix, total, at_eof = _fetch_remote_prefix(
+            url, lambda buf: _json_top_level(buf) not in ("[", None) or len(_json_prefix_items(bytes(buf), limit)) >= limit
+        )
+        if _json_top_level(prefix) not in ("[", None) and not at_eof:
+            # Objek tingkat atas tidak bisa di-parse dari awalan: unduh utuh seperti format lain
+            logger.info("JSON remote bukan array tingkat atas, file diunduh utuh untuk preview.")
+            response = http_client.get(url)
+            response.raise_for_status()
+            return read_preview_frame(BytesIO(response.content), ext, limit)
+        df = _json_records_to_frame(_json_prefix_items(prefix, limit))
+        n_rows = _count_json_array_items(BytesIO(prefix)) if at_eof and len(df) else None
+    else:
+        raise ValueError(f"Preview remote untuk format {ext} belum tersedia.")
+
+    size_info = f"{total / (1024 * 1024):.1f} MB" if total else "ukuran tidak diketahui"
+    logger.info(f"Preview remote: {len(prefix) / 1024:.1f} KB diunduh dari {size_info}.")
+    return df, n_rows, df.shape[1]
 
 
-def read_file_preview(source, filename=None, limit=5):
-    logger.info(f"Membaca preview file: {filename or source} (5 baris pertama)")
+def read_file_preview(source, filename=None, limit=5, count_rows=True):
     """
     Membaca preview dataset (5 baris pertama).
+    Untuk URL CSV/JSON hanya awalan file yang diunduh (HTTP Range, fallback stream).
+    Hanya `limit` baris pertama yang di-parse; jumlah baris diambil dari sumber murah
+    (hitung newline untuk CSV, metadata dimensi untuk XLSX, hitung elemen array untuk JSON).
+    count_rows=False melewati penghitungan baris untuk sumber file-like yang mahal dibaca ulang
+    (misalnya member ZIP berukuran besar).
     """
+    logger.info(f"Membaca preview file: {filename or source} ({limit} baris pertama)")
     ext = detect_file_type(filename or "")
     if not ext:
         return f"(Format file {filename} belum didukung untuk preview.)"
+    if ext not in SUPPORTED_EXT:
+        return f"(Preview untuk format {ext} belum tersedia.)"
 
     try:
-        if isinstance(source, str) and source.startswith("http"):
-            response = requests.get(source)
+        if isinstance(source, str) and source.startswith("http") and ext in ("csv", "json"):
+            df, n_rows, n_cols = _read_remote_preview(source, ext, limit)
+        elif isinstance(source, str) and source.startswith("http"):
+            # XLSX butuh central directory di akhir file, jadi tetap diunduh utuh
+            response = http_client.get(source)
             if response.status_code != 200:
                 return f"(Gagal mengunduh file dari {source})"
-            content = response.content
+            df, n_rows, n_cols = read_preview_frame(BytesIO(response.content), ext, limit)
         elif isinstance(source, str):
             with open(source, "rb") as f:
-                content = f.read()
+                df, n_rows, n_cols = read_preview_frame(f, ext, limit)
         else:
-            content = source.read()
+            df, n_rows, n_cols = read_preview_frame(source, ext, limit, count_rows)
 
-        if ext == "csv":
-            df = pd.read_csv(StringIO(content.decode("utf-8")), nrows=limit)
-            dfull = pd.read_csv(StringIO(content.decode("utf-8")))
-        elif ext == "json":
-            df = _read_json_to_df(content, limit)
-            dfull = _read_json_to_df(content, None)
-        elif ext == "xlsx":
-            df = pd.read_excel(BytesIO(content), nrows=limit)
-            dfull = pd.read_excel(BytesIO(content))
+        if n_rows is None:
+            logger.info(f"Dari file {filename or source}, ditemukan {n_cols} kolom (jumlah baris tidak diketahui).")
         else:
-            return f"(Preview untuk format {ext} belum tersedia.)"
-
-        logger.info(f"Dari file {filename or source}, ditemukan {dfull.shape[0]} baris dan {dfull.shape[1]} kolom.")
+            logger.info(f"Dari file {filename or source}, ditemukan {n_rows} baris dan {n_cols} kolom.")
         logger.info(f"Preview file {filename or source} berhasil dibaca.")
-        #save_confirmation(local_path)
         return df.to_string(index=False)
     except Exception as e:
         logger.error(f"Gagal membaca file {filename or source}: {e}")
         return f"(Gagal membaca file {filename or source}: {e})"
-    
-def read_full_file(source, filename=None):
+
+
+def _resolve_dataset_file(source):
+    """Jika `source` adalah folder, kembalikan file CSV/XLSX/JSON pertama di dalamnya."""
+    if isinstance(source, str) and os.path.isdir(source):
+        # 🔍 Cari file pertama dengan ekstensi didukung
+        for f in os.listdir(source):
+            if detect_file_type(f):
+                source = os.path.join(source, f)
+                logger.info(f"File dataset terdeteksi di folder: {source}")
+                break
+        else:
+            raise ValueError("Tidak ditemukan file CSV/XLSX/JSON di folder dataset.")
+    return source
+
+
+@contextmanager
+def _open_binary_stream(source):
     """
-    Membaca seluruh isi dataset (untuk analisis penuh).
-    Bisa menerima path folder (akan mencari file CSV/XLSX/JSON pertama di dalamnya).
+    Membuka sumber dataset sebagai stream biner tanpa membaca seluruh isinya.
+    - URL http(s) → body respons dibaca bertahap (requests stream=True).
+    - Path lokal → file handle biasa.
+    - Objek file-like → dipakai apa adanya (tidak ditutup).
     """
-    try:
-        if os.path.isdir(source):
-            # 🔍 Cari file pertama dengan ekstensi didukung
-            for f in os.listdir(source):
-                if detect_file_type(f):
-                    source = os.path.join(source, f)
-                    logger.info(f"File dataset terdeteksi di folder: {source}")
-                    break
-            else:
-                raise ValueError("Tidak ditemukan file CSV/XLSX/JSON di folder dataset.")
-
-        ext = detect_file_type(filename or source)
-        if not ext:
-            raise ValueError(f"Format file {filename or source} belum didukung untuk pembacaan penuh.")
-
-        # --- Baca file ---
-        if isinstance(source, str) and source.startswith("http"):
-            response = requests.get(source)
+    if isinstance(source, str) and source.startswith("http"):
+        with http_client.get(source, stream=True) as response:
             if response.status_code != 200:
                 raise ValueError(f"Gagal mengunduh file dari {source}")
-            content = response.content
+            response.raw.decode_content = True
+            yield response.raw
+    elif isinstance(source, str):
+        with open(source, "rb") as f:
+            yield f
+    else:
+        yield source
+
+
+def _json_records_to_frame(records):
+    """
+    Helper: ubah sekumpulan elemen array JSON menjadi DataFrame dengan objek bersarang diratakan
+    (json_normalize), sehingga preview, pembacaan per chunk, dan pembacaan penuh memberi kolom yang sama.
+    """
+    if not records or not all(isinstance(r, dict) for r in records):
+        return pd.DataFrame(records)
+    if all(len(r) == 1 for r in records) and len({next(iter(r)) for r in records}) == 1 \
+            and isinstance(next(iter(records[0].values())), dict):
+        # Pembungkus satu kunci ({"record": {...}}): ratakan isinya saja
+        return json_normalize([next(iter(r.values())) for r in records])
+    return json_normalize(records)
+
+
+def _json_document_to_frame(data):
+    """Helper: ubah dokumen JSON (list/dict) yang sudah di-parse menjadi DataFrame."""
+    if isinstance(data, list):
+        return pd.DataFrame(data)
+    if isinstance(data, dict):
+        try:
+            return pd.DataFrame(data)
+        except ValueError:
+            return json_normalize(data)
+    raise ValueError("Format JSON tidak dapat dikenali.")
+
+
+def _iter_json_records(stream, block_size=1 << 20):
+    """
+    Membaca elemen array JSON tingkat atas satu per satu dari stream biner.
+    Jika dokumen bukan array, dokumen dibaca utuh lalu dipecah per baris.
+    """
+    decoder = json.JSONDecoder()
+    reader = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        # Bagian buffer yang sudah diproses dibuang hanya saat blok baru dibaca (bukan per elemen)
+        nonlocal buf, pos, eof
+        block = stream.read(block_size)
+        if not block:
+            text = reader.decode(b"", final=True)
+            eof = True
         else:
-            with open(source, "rb") as f:
-                content = f.read()
+            text = reader.decode(block)
+        buf = buf[pos:] + text
+        pos = 0
+
+    # Cari karakter pembuka dokumen
+    while not eof and not buf.lstrip():
+        fill()
+    buf = buf.lstrip().lstrip("\ufeff")
+    if not buf.startswith("["):
+        # Bukan array: baca utuh lalu ubah menjadi baris-baris tabel
+        while not eof:
+            fill()
+        yield from _json_document_to_frame(json.loads(buf)).to_dict("records")
+        return
 
-        # --- Parse sesuai format ---
+    pos = 1
+    while True:
+        # Lewati spasi dan pemisah antar elemen
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            fill()
+        if pos >= len(buf):
+            raise ValueError("Array JSON tidak ditutup dengan benar.")
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+        # Elemen dianggap lengkap hanya jika diikuti pemisah (angka bisa terpotong di ujung buffer)
+        if not eof and (end == len(buf) or buf[end] not in " \t\r\n,]"):
+            fill()
+            continue
+        yield item
+        pos = end
+
+
+def _frame_memory_mb(df) -> float:
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def iter_file_chunks(source, filename=None, chunksize=None):
+    """
+    Membaca dataset secara bertahap dan menghasilkan DataFrame per potongan (chunk).
+    Data di-parse langsung dari file handle / respons HTTP, tanpa menyalin seluruh
+    isi file ke memori terlebih dahulu.
+    - CSV  : pd.read_csv(chunksize=...)
+    - JSON : elemen array tingkat atas dibaca satu per satu
+    - XLSX : openpyxl mode read_only (URL diunduh dulu ke memori karena XLSX butuh akses acak)
+    - Parquet : per row group batch (URL diunduh dulu ke memori, footer ada di akhir file)
+    """
+    source = _resolve_dataset_file(source)
+    ext = detect_file_type(filename or source)
+    if not ext:
+        raise ValueError(f"Format file {filename or source} belum didukung untuk pembacaan penuh.")
+    chunksize = chunksize or config.READ_CHUNK_ROWS
+
+    if ext == "parquet" and isinstance(source, str) and os.path.exists(source):
+        from utils.dataset_store import derived_info, iter_derived_chunks
+
+        derived = derived_info(source)
+        if derived:
+            # Kolom turunan: potongan dataset dasar + kolom milik file ini
+            yield from iter_derived_chunks(source, derived, lambda base, size: iter_file_chunks(base, chunksize=size),
+                                           chunksize)
+            return
+
+    with _open_binary_stream(source) as stream:
         if ext == "csv":
-            df = pd.read_csv(StringIO(content.decode("utf-8")))
+            with pd.read_csv(stream, chunksize=chunksize) as reader:
+                for chunk in reader:
+                    yield chunk
+
         elif ext == "json":
-            import json
-            try:
-                df = pd.read_json(StringIO(content.decode("utf-8")))
-            except ValueError:
-                data = json.loads(content.decode("utf-8"))
-                df = pd.json_normalize(data)
+            batch = []
+            for item in _iter_json_records(stream):
+                batch.append(item)
+                if len(batch) >= chunksize:
+                    yield _json_records_to_frame(batch)
+                    batch = []
+            if batch:
+                yield _json_records_to_frame(batch)
+
         elif ext == "xlsx":
-            df = pd.read_excel(BytesIO(content))
+            from openpyxl import load_workbook
+
+            if not (hasattr(stream, "seekable") and stream.seekable()):
+                stream = BytesIO(stream.read())
+            wb = load_workbook(stream, read_only=True, data_only=True)
+            try:
+                rows = wb.active.iter_rows(values_only=True)
+                header = next(rows, None)
+                if header is None:
+                    return
+                columns = [c if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+                batch = []
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= chunksize:
+                        yield pd.DataFrame(batch, columns=columns)
+                        batch = []
+                if batch:
+                    yield pd.DataFrame(batch, columns=columns)
+            finally:
+                wb.close()
+
+        elif ext == "parquet":
+            import pyarrow.parquet as pq
+
+            if not (hasattr(stream, "seekable") and stream.seekable()):
+                stream = BytesIO(stream.read())
+            for batch in pq.ParquetFile(stream).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
         else:
             raise ValueError(f"Format {ext} belum didukung untuk pembacaan penuh.")
 
+
+def read_full_file(source, filename=None, chunksize=None, iterator=False, memory_budget_mb=None):
+    """
+    Membaca seluruh isi dataset (untuk analisis penuh).
+    Bisa menerima path folder (akan mencari file CSV/XLSX/JSON pertama di dalamnya).
+
+    Data dibaca bertahap lewat `iter_file_chunks`:
+    - iterator=True  → mengembalikan iterator DataFrame per chunk (memori tetap datar).
+    - iterator=False → chunk digabung menjadi satu DataFrame; pembacaan dihentikan
+      dengan MemoryError jika total memori melebihi `memory_budget_mb`
+      (default config.READ_MEMORY_BUDGET_MB).
+    """
+    if iterator:
+        return iter_file_chunks(source, filename, chunksize)
+
+    budget_mb = config.READ_MEMORY_BUDGET_MB if memory_budget_mb is None else memory_budget_mb
+    try:
+        chunks = []
+        total_mb = 0.0
+        peak_mb = 0.0
+        for chunk in iter_file_chunks(source, filename, chunksize):
+            chunk_mb = _frame_memory_mb(chunk)
+            total_mb += chunk_mb
+            peak_mb = max(peak_mb, total_mb)
+            if total_mb > budget_mb:
+                raise MemoryError(
+                    f"Dataset melebihi batas memori {budget_mb} MB "
+                    f"(sudah {total_mb:.1f} MB). Gunakan iterator=True untuk membaca per chunk."
+                )
+            chunks.append(chunk)
+
+        if not chunks:
+            df = pd.DataFrame()
+        elif len(chunks) == 1:
+            df = chunks[0]
+        else:
+            df = pd.concat(chunks, ignore_index=True)
+            # Saat penggabungan, chunk dan hasil akhir sempat berada di memori bersamaan
+            peak_mb = total_mb + _frame_memory_mb(df)
+
         logger.info(f"Dataset berhasil dibaca: {df.shape[0]} baris, {df.shape[1]} kolom.")
+        logger.info(f"Puncak memori pembacaan: {peak_mb:.1f} MB (batas {budget_mb} MB).")
         return df
 
     except Exception as e:
         logger.error(f"Gagal membaca dataset penuh: {e}")
         raise
+
+
+def _parse_local_file(path, ext):
+    """Parsing penuh file lokal sesuai formatnya."""
+    if ext == "csv":
+        return pd.read_csv(path)
+    if ext == "xlsx":
+        return pd.read_excel(path)
+    if ext == "json":
+        return pd.read_json(path)
+    if ext == "parquet":
+        return pd.read_parquet(path)
+    raise ValueError(f"Format file {ext} belum didukung untuk pembacaan penuh.")
+
+
+def infer_compact_dtypes(sample: pd.DataFrame, max_category_ratio=None) -> dict:
+    """
+    Menyusun rencana dtype ringkas dari sampel baris:
+    - kolom teks dengan rasio nilai unik <= max_category_ratio → "category"
+    - kolom integer/float → kandidat downcast ("integer"/"float"); tipe akhir
+      ditentukan dari rentang nilai kolom penuh saat diterapkan
+    """
+    ratio = config.COMPACT_MAX_CATEGORY_RATIO if max_category_ratio is None else max_category_ratio
+    plan = {}
+    n = max(len(sample), 1)
+    for col in sample.columns:
+        series = sample[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            plan[col] = "integer"
+        elif pd.api.types.is_float_dtype(series):
+            plan[col] = "float"
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if series.nunique(dropna=True) / n <= ratio:
+                plan[col] = "category"
+    return plan
+
+
+def optimize_dtypes(df: pd.DataFrame, sample_rows=None, max_category_ratio=None) -> pd.DataFrame:
+    """
+    Mode compact: terapkan dtype ringkas (downcast numerik + category) pada DataFrame.
+    Rencana dtype disusun dari `sample_rows` baris pertama, lalu diterapkan ke seluruh kolom.
+    Memori sebelum/sesudah dicatat ke log.
+    """
+    sample_rows = sample_rows or config.COMPACT_SAMPLE_ROWS
+    before = df.memory_usage(deep=True).sum()
+    plan = infer_compact_dtypes(df.head(sample_rows), max_category_ratio)
+
+    out = df.copy(deep=False)
+    for col, kind in plan.items():
+        if kind == "category":
+            out[col] = out[col].astype("category")
+        elif kind == "integer":
+            out[col] = pd.to_numeric(out[col], downcast="integer")
+        elif kind == "float":
+            values = out[col]
+            downcast = pd.to_numeric(values, downcast="float")
+            # Hanya turunkan ke float32 jika nilainya tidak berubah berarti
+            if downcast.dtype != values.dtype and np.allclose(
+                downcast.to_numpy(dtype="float64"), values.to_numpy(dtype="float64"), rtol=1e-6, equal_nan=True
+            ):
+                out[col] = downcast
+
+    after = out.memory_usage(deep=True).sum()
+    logger.info(
+        f"Mode compact: memori {before / (1024 * 1024):.2f} MB → {after / (1024 * 1024):.2f} MB "
+        f"({before / max(after, 1):.1f}x lebih kecil)"
+    )
+    return out
+
+
+def read_local_dataset(path, columns=None, numeric_only=False):
+    """
+    Membaca dataset lokal untuk analisis lewat cache kolumnar (Parquet) di <folder>/.cache/.
+    - columns      : hanya memuat kolom tertentu (proyeksi kolom)
+    - numeric_only : hanya memuat kolom numerik; daftar kolom diambil dari metadata cache
+                     (atau katalog lokal) sehingga kolom teks tidak ikut dibaca
+    """
+    ext = detect_file_type(path)
+    if not ext:
+        raise ValueError(f"Format file {path} tidak dikenali.")
+
+    derived = None
+    if ext == "parquet":
+        from utils.dataset_store import derived_info
+
+        derived = derived_info(path)
+
+    if derived:
+        # Kolom turunan (mis. hasil clustering): rakit dari dataset dasar + kolom milik file ini
+        from utils.dataset_store import read_derived
+
+        df = read_derived(path, derived, lambda base, cols: load_dataset(base, columns=cols), columns)
+    elif ext == "parquet":
+        # Sudah kolumnar: tidak perlu sidecar cache, kolom numerik dibaca dari skema file
+        if numeric_only and columns is None:
+            import pyarrow.parquet as pq
+            import pyarrow.types as pat
+
+            schema = pq.read_schema(path)
+            columns = [f.name for f in schema if pat.is_integer(f.type) or pat.is_floating(f.type)]
+        df = pd.read_parquet(path, columns=list(columns) if columns is not None else None)
+    else:
+        if numeric_only and columns is None:
+            schema = get_cached_schema(path)
+            if not schema:
+                # Belum ada cache kolumnar: daftar kolom dari katalog lokal (tanpa memuat data)
+                from utils.local_catalog import get_catalog_schema
+
+                schema = get_catalog_schema(path)
+            if schema:
+                columns = schema["numeric_columns"]
+
+        df = load_columnar(path, lambda: _parse_local_file(path, ext), columns)
+    if numeric_only:
+        df = df.select_dtypes(include=["number"])
+    return df
+
+
+# Cache LRU DataFrame hasil parsing: key → (mtime_ns, ukuran_file, ukuran_frame_bytes, df)
+_frame_cache = OrderedDict()
+_frame_cache_bytes = 0
+_frame_cache_stats = {"hit": 0, "miss": 0, "eviction": 0, "invalidated": 0}
+
+
+def _frame_cache_put(key, stamp, df):
+    global _frame_cache_bytes
+    budget = config.FRAME_CACHE_MAX_MB * 1024 * 1024
+    nbytes = int(df.memory_usage(deep=True).sum())
+    if nbytes > budget:
+        logger.info(f"Dataset ({nbytes / (1024 * 1024):.1f} MB) melebihi batas cache memori, tidak disimpan.")
+        return
+    if key in _frame_cache:
+        _frame_cache_bytes -= _frame_cache.pop(key)[2]
+    while _frame_cache and _frame_cache_bytes + nbytes > budget:
+        _, evicted = _frame_cache.popitem(last=False)
+        _frame_cache_bytes -= evicted[2]
+        _frame_cache_stats["eviction"] += 1
+    _frame_cache[key] = (stamp[0], stamp[1], nbytes, df)
+    _frame_cache_bytes += nbytes
+
+
+def _frame_cache_get(key, stamp):
+    global _frame_cache_bytes
+    entry = _frame_cache.get(key)
+    if entry is None:
+        return None
+    if (entry[0], entry[1]) != stamp:
+        # File berubah sejak di-cache
+        _frame_cache_bytes -= _frame_cache.pop(key)[2]
+        _frame_cache_stats["invalidated"] += 1
+        return None
+    _frame_cache.move_to_end(key)
+    return entry[3]
+
+
+def load_dataset(path, columns=None, numeric_only=False, compact=None):
+    """
+    Loader dataset lokal bersama untuk semua analyzer.
+    DataFrame hasil parsing disimpan di cache LRU dalam memori (dibatasi config.FRAME_CACHE_MAX_MB,
+    diinvalidasi oleh mtime file), sehingga beberapa analisis pada dataset yang sama
+    dalam satu sesi cukup mem-parsing file satu kali.
+    Yang dikembalikan adalah salinan dangkal: menambah/mengganti kolom aman,
+    tetapi jangan mengubah nilai secara in-place.
+    compact=True (default config.LOAD_COMPACT) menerapkan `optimize_dtypes` sekali
+    sebelum frame masuk cache.
+    """
+    compact = config.LOAD_COMPACT if compact is None else compact
+    path = _resolve_dataset_file(path)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    abspath = os.path.abspath(path)
+    key = (abspath, tuple(columns) if columns is not None else None, numeric_only, compact)
+
+    df = _frame_cache_get(key, stamp)
+    if df is None and key[1:3] != (None, False):
+        # Proyeksi bisa diambil dari frame lengkap yang sudah ada di cache
+        full = _frame_cache_get((abspath, None, False, compact), stamp)
+        if full is not None:
+            df = full[list(columns)] if columns is not None else full
+            if numeric_only:
+                df = df.select_dtypes(include=["number"])
+
+    if df is not None:
+        _frame_cache_stats["hit"] += 1
+        logger.info(f"Dataset diambil dari cache memori: {os.path.basename(path)}")
+    else:
+        _frame_cache_stats["miss"] += 1
+        df = read_local_dataset(path, columns=columns, numeric_only=numeric_only)
+        if compact:
+            df = optimize_dtypes(df)
+        _frame_cache_put(key, stamp, df)
+
+    return df.copy(deep=False)
+
+
+def get_frame_cache_stats() -> dict:
+    """Statistik cache DataFrame dalam memori."""
+    return {
+        **_frame_cache_stats,
+        "entries": len(_frame_cache),
+        "size_mb": round(_frame_cache_bytes / (1024 * 1024), 2),
+        "budget_mb": config.FRAME_CACHE_MAX_MB,
+    }
+
+
+def clear_frame_cache():
+    """Kosongkan cache DataFrame dalam memori."""
+    global _frame_cache_bytes
+    _frame_cache.clear()
+    _frame_cache_bytes = 0
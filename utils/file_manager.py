@@ -3,24 +3,26 @@ import os
 import zipfile
 import tempfile
 import shutil
-import subprocess
 import requests
 import logging
-import zipfile
 import sys
-import os
-import shutil
 import stat
+import config
 from utils.debug_utils import logger
-from utils.file_handler import read_file_preview, detect_file_type
+from utils.file_handler import read_file_preview, read_full_file, detect_file_type
+from utils.remote_zip import open_remote_zip, remote_zip_transfer_stats
+from utils.download_cache import fetch
+from utils.kaggle_client import download_dataset, download_and_unzip, resolve_download_url, print_progress
+from utils.local_catalog import sync_catalog, list_catalog
+from utils.dataset_store import store_file, adopt_tree, gc_blobs
 from requests.utils import urlparse
 
-DATA_DIR = os.path.join("data", "local_datasets")
-SUPPORTED_EXT = ["csv", "json", "xlsx"]
+DATA_DIR = config.LOCAL_DATA_DIR
+SUPPORTED_EXT = ["csv", "json", "xlsx", "parquet"]
 
+# Member ZIP di atas batas ini tidak dihitung jumlah barisnya saat preview
+ZIP_COUNT_ROWS_MAX_BYTES = 64 * 1024 * 1024
 
-CACHE_DIR = os.path.join(".cache", "preview")
-os.makedirs(CACHE_DIR, exist_ok=True)
 
 
 logger = logging.getLogger(__name__)
@@ -30,7 +32,7 @@ def ensure_data_dir():
     os.makedirs(DATA_DIR, exist_ok=True)
     return DATA_DIR
 
-def _sanitize_name(name: str) -> str:
+def sanitize_name(name: str) -> str:
     """Ubah nama dataset menjadi aman untuk nama folder."""
     return name.replace("/", "_").replace("\\", "_").replace(":", "_")
 
@@ -47,9 +49,9 @@ def download_and_extract_zip(url_or_dataset: str, output_dir: str = None):
 
     # Tentukan nama folder dataset
     if url_or_dataset.startswith("http"):
-        dataset_name = _sanitize_name(os.path.splitext(os.path.basename(urlparse(url_or_dataset).path))[0])
+        dataset_name = sanitize_name(os.path.splitext(os.path.basename(urlparse(url_or_dataset).path))[0])
     else:
-        dataset_name = _sanitize_name(url_or_dataset.split("/")[-1])
+        dataset_name = sanitize_name(url_or_dataset.split("/")[-1])
 
     dataset_folder = os.path.join(DATA_DIR, dataset_name)
     os.makedirs(dataset_folder, exist_ok=True)
@@ -60,12 +62,7 @@ def download_and_extract_zip(url_or_dataset: str, output_dir: str = None):
     # Unduh dari URL
     if url_or_dataset.startswith("http"):
         file_name = os.path.basename(urlparse(url_or_dataset).path)
-        file_path = os.path.join(dataset_folder, file_name)
-        with requests.get(url_or_dataset, stream=True) as r:
-            r.raise_for_status()
-            with open(file_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+        file_path = fetch(url_or_dataset, dataset_folder, filename=file_name).path
 
         # Jika file adalah ZIP → ekstrak
         if zipfile.is_zipfile(file_path):
@@ -79,14 +76,14 @@ def download_and_extract_zip(url_or_dataset: str, output_dir: str = None):
     # Unduh dari Kaggle
     else:
         try:
-            subprocess.run(
-                ["kaggle", "datasets", "download", "-d", url_or_dataset, "-p", dataset_folder, "--unzip"],
-                check=True
-            )
-        except subprocess.CalledProcessError as e:
+            download_and_unzip(url_or_dataset, dataset_folder, progress=print_progress)
+        except Exception as e:
             logger.error(f"Gagal mengunduh dataset dari Kaggle: {e}")
             return None, []
 
+    # Isi yang sudah pernah disimpan (di folder lain) cukup ditautkan ke blob yang sama
+    adopt_tree(dataset_folder)
+
     # Daftar semua file hasil unduhan
     files = [
         f for f in os.listdir(dataset_folder)
@@ -99,13 +96,13 @@ def download_and_extract_zip(url_or_dataset: str, output_dir: str = None):
 
 def download_and_preview_zip(source: str, metadata_text: str = None):
     """
-    Unduh dataset ZIP dari URL atau Kaggle, ekstrak sementara, 
-    tampilkan preview salah satu file, dan kembalikan hasil preview sebagai string.
+    Unduh dataset ZIP dari URL atau Kaggle, tampilkan daftar isi ZIP,
+    preview salah satu file langsung dari arsip, dan kembalikan hasil preview sebagai string.
 
     - Jika `source` diawali dengan 'http' → dianggap URL langsung ke ZIP.
     - Jika tidak → dianggap ID dataset Kaggle (misal: 'zynicide/wine-reviews').
-    - File diekstrak ke folder sementara (tempfile.TemporaryDirectory).
-    - Tidak menyimpan dataset ke /data/local_datasets.
+    - ZIP disimpan di folder sementara (tempfile.TemporaryDirectory) dan tidak diekstrak.
+    - Dataset hanya disimpan ke /data/local_datasets jika user mengonfirmasi.
     """
 
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -113,76 +110,64 @@ def download_and_preview_zip(source: str, metadata_text: str = None):
 
         # === Unduh file ===
         if source.startswith("http"):
+            # Coba baca ZIP remote lewat Range tanpa unduhan penuh
+            folder_name = sanitize_name(os.path.splitext(os.path.basename(urlparse(source).path))[0]) or None
+            preview_text = handle_remote_zip_preview(source, metadata_text, folder_name)
+            if preview_text is not None:
+                return preview_text
+
             #logger.info(f"Mengunduh dataset dari URL: {source}")
             print(f"🌐 Mengunduh ZIP dari URL...\n{source}")
-            with requests.get(source, stream=True) as r:
-                r.raise_for_status()
-                with open(zip_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
+            zip_path = fetch(source, tmpdir, filename="dataset.zip").path
             #logger.info(f"ZIP URL disimpan sementara di: {zip_path}")
 
         else:
             #logger.info(f"Mengunduh dataset Kaggle: {source}")
             print(f"📦 Mengunduh dataset Kaggle...\n{source}")
-            subprocess.run(
-                ["kaggle", "datasets", "download", "-d", source, "-p", tmpdir],
-                check=True
-            )
-            # Cari ZIP hasil unduhan Kaggle
-            zips = [f for f in os.listdir(tmpdir) if f.endswith(".zip")]
-            if not zips:
-                print("❌ Tidak ada file ZIP ditemukan setelah unduh Kaggle.")
+            folder_name = sanitize_name(source.strip("/").split("/")[-1])
+
+            # Signed URL storage mendukung Range → preview langsung dari ZIP remote
+            signed_url = resolve_download_url(source)
+            if signed_url:
+                preview_text = handle_remote_zip_preview(signed_url, metadata_text, folder_name)
+                if preview_text is not None:
+                    return preview_text
+
+            try:
+                zip_path = download_dataset(source, progress=print_progress).path
+            except Exception as e:
+                logger.error(f"Gagal mengunduh dataset dari Kaggle: {e}")
+                print("❌ Gagal mengunduh dataset dari Kaggle.")
                 return "(gagal unduh)"
-            zip_path = os.path.join(tmpdir, zips[0])
-            folder_name = os.path.splitext(os.path.basename(zip_path))[0]
             #logger.info(f"ZIP Kaggle disimpan sementara di: {zip_path}")
 
-        # === Ekstrak ZIP ke folder sementara ===
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(tmpdir)
-        #logger.info(f"ZIP diekstrak sementara di: {tmpdir}")
-
-        # === Daftar file hasil ekstraksi ===
-        #extracted_files = [
-        #    f for f in os.listdir(tmpdir)
-        #    if not os.path.isdir(os.path.join(tmpdir, f)) and not f.endswith(".zip")
-        #]
-        
-        extracted_files = []
-        for root, _, files in os.walk(tmpdir):
-            for f in files:
-                extracted_files.append(os.path.join(root, f))
-
-        if not extracted_files:
+        # === Daftar file dari central directory ZIP (tanpa ekstraksi) ===
+        members = list_zip_members(zip_path)
+        if not members:
             print("(ZIP kosong, tidak ada file data.)")
             return "(ZIP kosong)"
 
         print("\n=== File dalam ZIP ===")
-        #for i, name in enumerate(extracted_files, 1):
-        #    print(f"{i}. {name}")
-        for i, path in enumerate(extracted_files, 1):
-            rel_path = os.path.relpath(path, tmpdir)
-            print(f"{i}. {rel_path}")
-        
+        for i, name in enumerate(members, 1):
+            print(f"{i}. {name}")
+
         # === Pilih file untuk preview ===
         try:
             choice = int(input("\nPilih file untuk preview [1-n]: "))
-            if choice < 1 or choice > len(extracted_files):
+            if choice < 1 or choice > len(members):
                 print("Nomor tidak valid.")
                 return "(dibatalkan)"
         except ValueError:
             print("Input tidak valid.")
             return "(dibatalkan)"
 
-        # === Preview file ===
-        file_path = os.path.join(tmpdir, extracted_files[choice - 1])
-        #logger.info(f"Preview file sementara: {file_path}")
-        preview_text = read_file_preview(file_path, extracted_files[choice - 1]) 
+        # === Preview langsung dari member ZIP ===
+        selected = members[choice - 1]
+        preview_text = preview_zip_member(zip_path, selected)
 
         print("\n--- Cuplikan 5 baris pertama ---")
         print(preview_text)
-        save_confirmation(file_path,folder_name)
+        save_confirmation(zip_path, folder_name, members=[selected])
 
         # === Simpan metadata sementara (jika ada) ===
         if metadata_text:
@@ -195,86 +180,6 @@ def download_and_preview_zip(source: str, metadata_text: str = None):
         # Folder tmp akan otomatis dihapus saat keluar blok `with`
         return preview_text
 
-def _download_and_extract_zip(dataset: str):
-    """
-    Mengunduh dataset Kaggle (ZIP) dan mengekstraknya ke data/local_datasets/
-    """
-    ensure_data_dir()
-    target_dir = os.path.join(DATA_DIR, dataset.replace("/", "_"))
-    os.makedirs(target_dir, exist_ok=True)
-
-    print(f"\n📦 Mengunduh dan mengekstrak dataset '{dataset}' ...")
-    try:
-        subprocess.run(["kaggle", "datasets", "download", "-d", dataset, "-p", target_dir, "--unzip"], check=True)
-        logger.info(f"Dataset {dataset} berhasil diunduh dan diekstrak ke {target_dir}")
-        print(f"✅ Dataset berhasil diekstrak ke: {target_dir}")
-        return target_dir
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Gagal mengunduh dataset {dataset}: {e}")
-        print(f"❌ Gagal mengunduh dataset {dataset}: {e}")
-        return None
-    
-def ___download_and_preview_zip(dataset, metadata_text):
-    """Unduh dataset ZIP, ekstrak, preview salah satu file, dan return hasil string."""
-    import tempfile, zipfile, os, subprocess
-    from utils.file_handler import read_file_preview
-    from utils.debug_utils import logger
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        subprocess.run(["kaggle", "datasets", "download", "-d", dataset, "-p", tmpdir, "--unzip"], check=True)
-
-        extracted_files = [f for f in os.listdir(tmpdir) if not os.path.isdir(os.path.join(tmpdir, f))]
-        if not extracted_files:
-            print("(ZIP kosong, tidak ada file data.)")
-            return "(ZIP kosong)"
-
-        print("\nFile yang tersedia di ZIP:")
-        for i, name in enumerate(extracted_files, 1):
-            print(f"{i}. {name}")
-
-        try:
-            choice = int(input("\nPilih file untuk preview [1-n]: "))
-            if choice < 1 or choice > len(extracted_files):
-                print("Nomor tidak valid.")
-                return "(dibatalkan)"
-        except ValueError:
-            print("Input tidak valid.")
-            return "(dibatalkan)"
-
-        file_path = os.path.join(tmpdir, extracted_files[choice - 1])
-        logger.info(f"Preview file lokal: {file_path}")
-        preview_text = read_file_preview(file_path, extracted_files[choice - 1])
-
-        print("\n--- Cuplikan 5 baris pertama ---")
-        print(preview_text)
-        return preview_text
-
-def __download_and_extract_zip(url_or_dataset: str, output_dir: str = None):
-    """
-    Unduh file ZIP dari Kaggle atau URL, lalu ekstrak ke direktori sementara atau `output_dir`.
-    """
-    tmpdir = tempfile.mkdtemp() if output_dir is None else output_dir
-
-    if url_or_dataset.startswith("http"):
-        import requests
-        zip_path = os.path.join(tmpdir, "dataset.zip")
-        logger.info(f"Mengunduh dataset dari URL: {url_or_dataset}")
-        with requests.get(url_or_dataset, stream=True) as r:
-            r.raise_for_status()
-            with open(zip_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
-    else:
-        logger.info(f"Mengunduh dataset Kaggle: {url_or_dataset}")
-        subprocess.run(["kaggle", "datasets", "download", "-d", url_or_dataset, "-p", tmpdir, "--unzip"], check=True)
-        return tmpdir
-
-    with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(tmpdir)
-
-    return tmpdir
-
-
 def preview_extracted_file(directory: str):
     """Preview salah satu file CSV/JSON/Excel di folder hasil ekstraksi."""
     for root, _, files in os.walk(directory):
@@ -284,23 +189,31 @@ def preview_extracted_file(directory: str):
                 return read_file_preview(file_path)
     return "Tidak ditemukan file yang dapat dipreview."
 
+def _describe_entry(entry: dict) -> str:
+    """Ringkasan satu entri katalog: ukuran, baris × kolom, penanda hasil analisis."""
+    parts = [f"{entry['size'] / (1024 * 1024):.1f} MB"]
+    if entry["columns"] is not None:
+        rows = f"{entry['rows']:,}" if entry["rows"] is not None else "?"
+        parts.append(f"{rows} baris × {len(entry['columns'])} kolom")
+    if entry["error"]:
+        parts.append("gagal dibaca")
+    if entry["is_output"]:
+        parts.append("hasil analisis")
+    return ", ".join(parts)
+
+
 def list_local_datasets(show_files=True):
     """
     Menampilkan daftar file dataset lokal yang tersedia.
-    - Mencari file dengan ekstensi didukung (csv, xlsx, json)
-    - Menampilkan path relatif gaya aplikasi (/data/local_datasets/...)
+    - Daftar diambil dari katalog lokal (SQLite) yang disinkronkan secara inkremental:
+      hanya file baru/berubah (mtime/ukuran) yang dibaca ulang
+    - Menampilkan path relatif gaya aplikasi (/data/local_datasets/...) beserta ukuran & skema
     Parameter `show_files` disertakan untuk kompatibilitas lama (diabaikan).
     """
     base_dir = ensure_data_dir()
-    datasets = []
-
-    # Rekursif mencari semua file dataset yang valid
-    for root, _, files in os.walk(base_dir):
-        for f in files:
-            ext = f.lower().split(".")[-1]
-            if ext in SUPPORTED_EXT:
-                rel_path = os.path.join(root, f).replace("\\", "/")
-                datasets.append(f"/{rel_path}")
+    sync_catalog(base_dir)
+    entries = list_catalog(base_dir)
+    datasets = [f"/{e['path']}" for e in entries]
 
     if not datasets:
         print("📂 Belum ada file dataset lokal yang ditemukan.")
@@ -309,8 +222,8 @@ def list_local_datasets(show_files=True):
 
     
     print(f"\n===  {len(datasets)} file tersedia di dataset lokal ===")
-    for i, d in enumerate(datasets, 1):
-        print(f"{i}. {d}")
+    for i, (d, e) in enumerate(zip(datasets, entries), 1):
+        print(f"{i}. {d} ({_describe_entry(e)})")
    
     #logger.info(f"Menampilkan {len(datasets)} file dataset lokal.")
     return datasets
@@ -343,8 +256,8 @@ def preview_file(file_path: str):
 
     # --- Jika ZIP: ekstrak lalu preview file di dalamnya
     if file_type == "zip":
-        logger.info("ZIP file terdeteksi, mengekstrak isi...")
-        extracted_dir, files = extract_zip_and_list(file_path)
+        logger.info("ZIP file terdeteksi, membaca daftar isi...")
+        files = list_zip_members(file_path)
 
         print("\n=== DAFTAR FILE DALAM ZIP ===")
         for i, f in enumerate(files, 1):
@@ -357,16 +270,15 @@ def preview_file(file_path: str):
             print("❌ Pilihan tidak valid.")
             return None
 
-        selected_path = os.path.join(extracted_dir, selected_file)
-        logger.info(f"File dipilih untuk preview: {selected_path}")
+        logger.info(f"File dipilih untuk preview: {selected_file}")
 
-        preview_text = read_file_preview(selected_path, selected_file)
+        preview_text = preview_zip_member(file_path, selected_file)
         print("\n=== PREVIEW DATASET ===")
         print(f"File: {selected_file}")
         print("\n--- Cuplikan Data ---")
         print(preview_text)
         if sys.stdin.isatty():  # hanya kalau user bisa input
-            save_confirmation(file_path)
+            save_confirmation(file_path, members=[selected_file])
         else:
             print("💡 Mode non-interaktif — dataset tidak disimpan otomatis.")
         return preview_text
@@ -389,42 +301,68 @@ def preview_file(file_path: str):
     else:
         print(f"❌ Format file '{file_type}' tidak didukung untuk preview otomatis.")
         return None
-def extract_zip_and_list(zip_path: str):
+def list_zip_members(zip_source):
     """
-    Mengekstrak file ZIP ke direktori sementara dan mengembalikan:
-      (path_folder_ekstraksi, daftar_file_di_dalamnya)
+    Daftar file di dalam ZIP, dibaca dari central directory tanpa mengekstrak apa pun.
+    `zip_source` boleh berupa path atau objek file-like yang bisa di-seek.
     """
-    if not os.path.exists(zip_path):
-        raise FileNotFoundError(f"ZIP file tidak ditemukan: {zip_path}")
+    if isinstance(zip_source, str) and not os.path.exists(zip_source):
+        raise FileNotFoundError(f"ZIP file tidak ditemukan: {zip_source}")
 
-    tmp_dir = tempfile.mkdtemp(prefix="extract_")
-    logger.info(f"📦 Mengekstrak ZIP ke folder sementara: {tmp_dir}")
+    with zipfile.ZipFile(zip_source, "r") as zip_ref:
+        members = [
+            info.filename for info in zip_ref.infolist()
+            if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+        ]
 
-    with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(tmp_dir)
-
-    # Ambil daftar file (non-folder)
-    extracted_files = []
-    for root, _, files in os.walk(tmp_dir):
-        for f in files:
-            rel_path = os.path.relpath(os.path.join(root, f), tmp_dir)
-            extracted_files.append(rel_path)
-
-    if not extracted_files:
+    if not members:
         logger.warning("ZIP kosong — tidak ada file di dalamnya.")
     else:
-        logger.info(f"🗂️ {len(extracted_files)} file ditemukan dalam ZIP.")
+        logger.info(f"🗂️ {len(members)} file ditemukan dalam ZIP.")
+    return members
+
+
+def preview_zip_member(zip_source, member: str, limit: int = 5, count_rows: bool = None):
+    """
+    Preview satu member ZIP dengan men-stream isinya langsung ke parser preview.
+    Secara default jumlah baris hanya dihitung untuk member kecil, karena menghitungnya
+    berarti mendekompresi ulang seluruh member.
+    """
+    with zipfile.ZipFile(zip_source, "r") as zip_ref:
+        info = zip_ref.getinfo(member)
+        logger.info(
+            f"Preview member ZIP: {member} "
+            f"({info.file_size / (1024 * 1024):.1f} MB, terkompresi {info.compress_size / (1024 * 1024):.1f} MB)"
+        )
+        with zip_ref.open(info) as fh:
+            if count_rows is None:
+                count_rows = info.file_size <= ZIP_COUNT_ROWS_MAX_BYTES
+            return read_file_preview(fh, member, limit, count_rows=count_rows)
+
+
+def read_zip_member(zip_source, member: str, **kwargs):
+    """Baca penuh satu member ZIP lewat `read_full_file` tanpa mengekstraknya ke disk."""
+    with zipfile.ZipFile(zip_source, "r") as zip_ref:
+        with zip_ref.open(member) as fh:
+            return read_full_file(fh, member, **kwargs)
+
+
+def extract_zip_members(zip_source, members, dest_dir: str):
+    """Ekstrak hanya member terpilih ke `dest_dir`. Mengembalikan daftar path hasil ekstraksi."""
+    os.makedirs(dest_dir, exist_ok=True)
+    with zipfile.ZipFile(zip_source, "r") as zip_ref:
+        return [zip_ref.extract(member, dest_dir) for member in members]
+
 
-    return tmp_dir, extracted_files
 def handle_zip_preview(local_path: str, metadata_text: str = None):
     """
     Menangani preview untuk file ZIP:
-    - Mengekstrak file.
-    - Menampilkan daftar isi.
+    - Membaca daftar isi dari central directory (tanpa ekstraksi).
     - Meminta user memilih salah satu file untuk preview.
+    - File terpilih di-stream langsung dari arsip.
     """
-    logger.info("ZIP file terdeteksi, mengekstrak isi...")
-    extracted_dir, files = extract_zip_and_list(local_path)
+    logger.info("ZIP file terdeteksi, membaca daftar isi...")
+    files = list_zip_members(local_path)
 
     if not files:
         print("❌ ZIP kosong atau tidak ada file yang bisa diproses.")
@@ -442,16 +380,15 @@ def handle_zip_preview(local_path: str, metadata_text: str = None):
         print("❌ Pilihan tidak valid.")
         return None
 
-    selected_path = os.path.join(extracted_dir, selected_file)
-    logger.info(f"File dipilih untuk preview: {selected_path}")
+    logger.info(f"File dipilih untuk preview: {selected_file}")
 
-    preview_text = read_file_preview(selected_path, selected_file)
+    preview_text = preview_zip_member(local_path, selected_file)
     print("\n=== PREVIEW DATASET ===")
     print(f"File: {selected_file}")
     print("\n--- Cuplikan Data ---")
     print(preview_text)
 
-    save_confirmation(local_path)
+    save_confirmation(local_path, members=[selected_file])
     
     # === Simpan metadata sementara (jika ada) ===
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -462,6 +399,58 @@ def handle_zip_preview(local_path: str, metadata_text: str = None):
                 f.write(preview_text)
             logger.info(f"Metadata sementara disimpan di: {meta_path}")
         return preview_text
+def handle_remote_zip_preview(url: str, metadata_text: str = None, folder_name: str = None):
+    """
+    Preview ZIP remote tanpa mengunduh seluruh arsip:
+    - Daftar isi dibaca dari EOCD + central directory lewat HTTP Range.
+    - Member terpilih diambil per range dan didekompresi sebagai stream.
+    Mengembalikan None jika server tidak mendukung Range (pemanggil memakai unduhan penuh).
+    """
+    remote = open_remote_zip(url)
+    if remote is None:
+        return None
+
+    with remote:
+        try:
+            files = list_zip_members(remote)
+        except zipfile.BadZipFile:
+            logger.warning("Central directory ZIP remote tidak valid, beralih ke unduhan penuh.")
+            return None
+        if not files:
+            print("❌ ZIP kosong atau tidak ada file yang bisa diproses.")
+            return "(ZIP kosong)"
+
+        print("\n=== DAFTAR FILE DALAM ZIP (remote) ===")
+        for i, f in enumerate(files, 1):
+            print(f"[{i}] {f}")
+
+        try:
+            idx = int(input("\nPilih file untuk preview [1-n]: ").strip() or "1")
+            if idx < 1:
+                raise IndexError
+            selected_file = files[idx - 1]
+        except (ValueError, IndexError):
+            print("❌ Pilihan tidak valid.")
+            return "(dibatalkan)"
+
+        # Menghitung baris berarti mengunduh seluruh member, jadi dilewati untuk ZIP remote
+        preview_text = preview_zip_member(remote, selected_file, count_rows=False)
+        print("\n=== PREVIEW DATASET ===")
+        print(f"File: {selected_file}")
+        print("\n--- Cuplikan Data ---")
+        print(preview_text)
+
+        stats = remote_zip_transfer_stats(remote)
+        logger.info(
+            f"ZIP remote: {stats['bytes_fetched'] / 1024:.1f} KB diunduh dari "
+            f"{stats['size'] / (1024 * 1024):.1f} MB ({stats['requests']} request)."
+        )
+
+        archive_name = os.path.basename(urlparse(url).path) or "dataset.zip"
+        save_confirmation(archive_name, folder_name, members=[selected_file], zip_source=remote)
+        return preview_text
+
+
 def handle_direct_preview(local_path: str, file_type: str):
     """
     Menangani preview untuk file langsung (CSV, XLSX, JSON, dsb).
@@ -473,7 +462,12 @@ def handle_direct_preview(local_path: str, file_type: str):
     print(preview_text)
     save_confirmation(local_path)
     return preview_text
-def save_confirmation(file_path: str, folder_name: str = None):
+def save_confirmation(file_path: str, folder_name: str = None, members=None, zip_source=None):
+    """
+    Konfirmasi penyimpanan dataset ke data/local_datasets.
+    Untuk ZIP, `members` membatasi file yang diekstrak (None → seluruh isi arsip).
+    `zip_source` dipakai jika arsip tidak berada di `file_path` (misalnya ZIP remote).
+    """
     print("\n Preview dataset berhasil ditampilkan.")
     
     #logger.info(f"Menampilkan konfirmasi penyimpanan untuk file: {file_path}")
@@ -493,16 +487,20 @@ def save_confirmation(file_path: str, folder_name: str = None):
         
         os.makedirs(dataset_dir, exist_ok=True)
 
-        if ext.lower() == ".zip":
-            # Ekstrak ZIP ke subfolder dataset
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                zip_ref.extractall(dataset_dir)
+        if ext.lower() == ".zip" or members:
+            # Ekstrak ZIP ke subfolder dataset (hanya member terpilih jika ada)
+            if members:
+                extract_zip_members(zip_source or file_path, members, dataset_dir)
+            else:
+                with zipfile.ZipFile(zip_source or file_path, 'r') as zip_ref:
+                    zip_ref.extractall(dataset_dir)
+            adopt_tree(dataset_dir)
             print(f" File ZIP diekstrak ke: {dataset_dir}")
         else:
-            # Copy file biasa
+            # Simpan lewat blob store: isi yang sama tidak disalin ulang (reflink copy-on-write)
             dest_path = os.path.join(dataset_dir, dataset_name)
-            shutil.copy(file_path, dest_path)
-            print(f" Dataset disalin ke: {dest_path}")
+            store_file(file_path, dest_path)
+            print(f" Dataset disimpan ke: {dest_path}")
 
         #logger.info(f"Dataset disimpan di folder lokal: {dataset_dir}")
     else:
@@ -527,7 +525,9 @@ def delete_local_dataset():
         print("📁 Folder dataset lokal belum ada.")
         return
 
-    folders = [f for f in os.listdir(base_path) if os.path.isdir(os.path.join(base_path, f))]
+    # Folder tersembunyi (.cache) bukan dataset
+    folders = [f for f in os.listdir(base_path)
+               if not f.startswith(".") and os.path.isdir(os.path.join(base_path, f))]
 
     if not folders:
         print("📭 Tidak ada folder dataset lokal untuk dihapus.")
@@ -553,6 +553,7 @@ def delete_local_dataset():
                 for folder in folders:
                     folder_path = os.path.join(base_path, folder)
                     shutil.rmtree(folder_path, onerror=handle_remove_readonly)
+                gc_blobs()
                 print("✅ Semua folder dataset lokal berhasil dihapus.")
             else:
                 print("❎ Penghapusan dibatalkan.")
@@ -564,6 +565,7 @@ def delete_local_dataset():
 
         if konfirmasi == "y":
             shutil.rmtree(folder_to_delete, onerror=handle_remove_readonly)
+            gc_blobs()
             print(f"✅ Folder '{folders[idx - 1]}' berhasil dihapus.")
         else:
             print("❎ Penghapusan dibatalkan.")
@@ -0,0 +1,134 @@
+# utils/http_client.py
+import time
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+from utils.debug_utils import logger
+
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+_rate_lock = threading.Lock()
+_next_slot = {}  # host -> waktu paling awal request berikutnya boleh dikirim
+
+_stats_lock = threading.Lock()
+_stats = {}  # host -> {"requests", "errors", "retries", "latency_s", "max_latency_s"}
+
+
+def get_session() -> requests.Session:
+    """
+    Session HTTP bersama (keep-alive + connection pool) untuk semua sumber data.
+    Request GET/HEAD yang gagal karena koneksi atau status 429/5xx diulang dengan
+    exponential backoff, menghormati header Retry-After.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=config.HTTP_RETRIES,
+                backoff_factor=config.HTTP_BACKOFF_SECONDS,
+                status_forcelist=RETRY_STATUS,
+                allowed_methods=frozenset({"GET", "HEAD"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=config.HTTP_POOL_MAXSIZE,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _throttle(host: str):
+    """Batasi laju request per host sesuai HTTP_MAX_RPS_PER_HOST (0 = tanpa batas)."""
+    rps = config.HTTP_MAX_RPS_PER_HOST
+    if rps <= 0:
+        return
+    with _rate_lock:
+        now = time.monotonic()
+        slot = max(now, _next_slot.get(host, now))
+        _next_slot[host] = slot + 1.0 / rps
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _record(host: str, latency: float, error: bool, retries: int):
+    with _stats_lock:
+        s = _stats.setdefault(host, {"requests": 0, "errors": 0, "retries": 0, "latency_s": 0.0, "max_latency_s": 0.0})
+        s["requests"] += 1
+        s["errors"] += int(error)
+        s["retries"] += retries
+        s["latency_s"] += latency
+        s["max_latency_s"] = max(s["max_latency_s"], latency)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Kirim request lewat session bersama.
+    Timeout default (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT) dipakai jika tidak diberikan.
+    Latensi yang dicatat adalah waktu sampai header respons diterima (termasuk retry).
+    """
+    kwargs.setdefault("timeout", (config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT))
+    host = urlparse(url).netloc.lower()
+    _throttle(host)
+
+    t0 = time.perf_counter()
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except requests.RequestException:
+        _record(host, time.perf_counter() - t0, True, 0)
+        raise
+
+    retry_state = getattr(response.raw, "retries", None)
+    retries = len(retry_state.history) if retry_state is not None else 0
+    _record(host, time.perf_counter() - t0, response.status_code >= 400, retries)
+    return response
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def head(url: str, **kwargs) -> requests.Response:
+    kwargs.setdefault("allow_redirects", True)
+    return request("HEAD", url, **kwargs)
+
+
+def get_http_stats() -> dict:
+    """Statistik request per host sejak program dimulai (jumlah, error, retry, latensi)."""
+    with _stats_lock:
+        result = {}
+        for host, s in _stats.items():
+            result[host] = {**s, "avg_latency_s": s["latency_s"] / s["requests"] if s["requests"] else 0.0}
+        return result
+
+
+def reset_http_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def log_http_stats():
+    """Tulis ringkasan statistik request per host ke log."""
+    stats = get_http_stats()
+    if not stats:
+        return
+    for host, s in sorted(stats.items(), key=lambda kv: kv[1]["latency_s"], reverse=True):
+        logger.info(
+            f"HTTP {host}: {s['requests']} request, {s['errors']} error, {s['retries']} retry, "
+            f"total {s['latency_s']:.2f} s (rata-rata {s['avg_latency_s'] * 1000:.0f} ms, "
+            f"maks {s['max_latency_s'] * 1000:.0f} ms)"
+        )
@@ -0,0 +1,412 @@
+# utils/ingest_pipeline.py
+import io
+import os
+import time
+import zlib
+import shutil
+import struct
+import hashlib
+
+import pandas as pd
+
+import config
+from utils.debug_utils import logger
+from utils import http_client
+from utils.file_handler import detect_file_type
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:  # pyarrow opsional: tanpa pyarrow pipeline kolumnar tidak tersedia
+    pa = pq = None
+    PARQUET_AVAILABLE = False
+
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_LOCAL_SIG = 0x04034B50
+_DESCRIPTOR_SIG = b"PK\x07\x08"
+_READ_BLOCK = 1024 * 1024
+# Batas output dekompresi per langkah (melindungi memori dari rasio kompresi ekstrem)
+_MAX_INFLATE = 4 * 1024 * 1024
+
+
+class _ByteSource(io.RawIOBase):
+    """Pembaca stream non-seekable dengan pushback; menghitung byte & SHA-256 yang lewat."""
+
+    def __init__(self, raw):
+        super().__init__()
+        self.raw = raw
+        self.buffer = b""
+        self.bytes_read = 0
+        self.sha256 = hashlib.sha256()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def read(self, n: int = -1) -> bytes:
+        if n is None or n < 0:
+            return b"".join(iter(lambda: self.read(_READ_BLOCK), b""))
+        if self.buffer:
+            data, self.buffer = self.buffer[:n], self.buffer[n:]
+            return data
+        data = self.raw.read(n)
+        self.bytes_read += len(data)
+        self.sha256.update(data)
+        return data
+
+    def read_exact(self, n: int) -> bytes:
+        parts, missing = [], n
+        while missing:
+            data = self.read(missing)
+            if not data:
+                break
+            parts.append(data)
+            missing -= len(data)
+        return b"".join(parts)
+
+    def unread(self, data: bytes):
+        self.buffer = data + self.buffer
+
+    def drain(self):
+        """Baca sisa stream (mis. central directory) agar ukuran & hash mencakup seluruh file."""
+        self.buffer = b""
+        while self.read(_READ_BLOCK):
+            pass
+
+
+class _ZipMemberStream(io.RawIOBase):
+    """Isi satu member ZIP yang didekompresi langsung dari stream (stored/deflate)."""
+
+    def __init__(self, source: _ByteSource, method: int, compressed_size):
+        super().__init__()
+        self.source = source
+        self.method = method
+        self.remaining = compressed_size  # None jika ukuran baru diketahui dari data descriptor
+        self.inflater = zlib.decompressobj(-15) if method == 8 else None
+        self.pending = b""
+        self.finished = False
+        self.crc = 0
+        self.scan = b""
+        self.emitted = 0
+
+    def readable(self):
+        return True
+
+    def _fill_stored_unknown(self):
+        """
+        Member stored dengan data descriptor: ukuran baru diketahui di akhir, jadi cari tanda
+        descriptor yang CRC dan ukurannya cocok dengan data yang sudah lewat.
+        """
+        data = self.source.read(_READ_BLOCK)
+        if not data:
+            raise EOFError("Stream ZIP terpotong.")
+        scan = self.scan + data
+        start = 0
+        while True:
+            idx = scan.find(_DESCRIPTOR_SIG, start)
+            if idx < 0 or len(scan) < idx + 12:
+                break
+            crc, size = struct.unpack("<II", scan[idx + 4:idx + 12])
+            if size == (self.emitted + idx) & 0xFFFFFFFF and crc == zlib.crc32(scan[:idx], self.crc):
+                self.source.unread(scan[idx:])
+                self.scan = b""
+                self.finished = True
+                return scan[:idx]
+            start = idx + 1
+        # Simpan ekor yang mungkin berisi awal descriptor untuk putaran berikutnya
+        keep = max(len(scan) - 15, 0) if idx < 0 else idx
+        self.scan = scan[keep:]
+        return scan[:keep]
+
+    def _fill(self):
+        if self.method == 0 and self.remaining is None:
+            out = self._fill_stored_unknown()
+            self.emitted += len(out)
+        elif self.method == 0:
+            data = self.source.read(min(_READ_BLOCK, self.remaining))
+            if not data and self.remaining:
+                raise EOFError("Stream ZIP terpotong.")
+            self.remaining -= len(data)
+            out = data
+            self.finished = self.remaining == 0
+        else:
+            data = self.inflater.unconsumed_tail
+            if not data:
+                want = _READ_BLOCK if self.remaining is None else min(_READ_BLOCK, self.remaining)
+                data = self.source.read(want)
+                if not data:
+                    raise EOFError("Stream ZIP terpotong.")
+                if self.remaining is not None:
+                    self.remaining -= len(data)
+            out = self.inflater.decompress(data, _MAX_INFLATE)
+            if self.inflater.eof:
+                unused = self.inflater.unused_data
+                if unused:
+                    self.source.unread(unused)
+                    if self.remaining is not None:
+                        self.remaining += len(unused)
+                self.finished = True
+        self.crc = zlib.crc32(out, self.crc)
+        self.pending = out
+
+    def readinto(self, buffer):
+        while not self.pending and not self.finished:
+            self._fill()
+        n = min(len(buffer), len(self.pending))
+        buffer[:n] = self.pending[:n]
+        self.pending = self.pending[n:]
+        return n
+
+    def drain(self):
+        while not self.finished:
+            self._fill()
+        self.pending = b""
+
+
+def iter_zip_stream(source: _ByteSource):
+    """
+    Iterasi member ZIP dari stream non-seekable lewat local file header (tanpa central
+    directory), menghasilkan (nama, stream_isi). Member yang tidak dibaca habis dilewati
+    otomatis saat iterasi berlanjut. CRC setiap member diverifikasi.
+    """
+    while True:
+        header = source.read_exact(_LOCAL_HEADER.size)
+        if len(header) < _LOCAL_HEADER.size or struct.unpack("<I", header[:4])[0] != _LOCAL_SIG:
+            source.unread(header)
+            return  # central directory / akhir arsip
+        (_, _, flags, method, _, _, crc, csize, usize, name_len, extra_len) = _LOCAL_HEADER.unpack(header)
+        raw_name = source.read_exact(name_len)
+        extra = source.read_exact(extra_len)
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+
+        zip64 = False
+        pos = 0
+        while pos + 4 <= len(extra):
+            tag, size = struct.unpack("<HH", extra[pos:pos + 4])
+            if tag == 0x0001 and size >= 16:
+                usize, csize = struct.unpack("<QQ", extra[pos + 4:pos + 20])
+                zip64 = True
+            pos += 4 + size
+
+        if flags & 0x1:
+            raise ValueError(f"Member ZIP terenkripsi tidak didukung: {name}")
+        if method not in (0, 8):
+            raise ValueError(f"Metode kompresi ZIP {method} tidak didukung untuk streaming: {name}")
+        has_descriptor = bool(flags & 0x8)
+
+        member = _ZipMemberStream(source, method, None if (has_descriptor and csize == 0) else csize)
+        yield name, member
+        member.drain()
+
+        if has_descriptor:
+            first = source.read_exact(4)
+            if first != _DESCRIPTOR_SIG:
+                source.unread(first)
+            crc = struct.unpack("<I", source.read_exact(4))[0]
+            source.read_exact(16 if zip64 else 8)
+        if member.crc != crc:
+            raise ValueError(f"CRC member ZIP tidak cocok: {name}")
+
+
+# Jenis kolom Parquet dan tipe pandas yang dipakai untuk menulisnya (integer tetap int64, nullable)
+_KIND_DTYPES = {"null": "str", "bool": "boolean", "int": "Int64", "float": "float64", "str": "str"}
+
+
+def _column_kind(series: pd.Series) -> str:
+    if series.isna().all():
+        return "null"
+    if pd.api.types.is_bool_dtype(series):
+        return "bool"
+    if pd.api.types.is_integer_dtype(series):
+        return "int"
+    if pd.api.types.is_float_dtype(series):
+        return "float"
+    return "str"
+
+
+def _widen(current: str, seen: str) -> str:
+    """Jenis terkecil yang memuat keduanya: kolom kosong ikut jenis lain, int+float → float, selain itu teks."""
+    if current == seen or seen == "null":
+        return current
+    if current == "null":
+        return seen
+    if {current, seen} == {"int", "float"}:
+        return "float"
+    return "str"
+
+
+def _conform(chunk: pd.DataFrame, kinds: dict) -> pd.DataFrame:
+    for col, kind in kinds.items():
+        chunk[col] = chunk[col].astype(_KIND_DTYPES[kind])
+    return chunk
+
+
+def _rewrite_row_groups(src_path: str, dest_path: str, schema):
+    """Tulis ulang row group yang sudah ada dengan skema yang dilebarkan. Mengembalikan writer baru."""
+    writer = pq.ParquetWriter(dest_path, schema)
+    parquet = pq.ParquetFile(src_path)
+    for i in range(parquet.num_row_groups):
+        writer.write_table(parquet.read_row_group(i).cast(schema))
+    parquet.close()
+    os.remove(src_path)
+    return writer
+
+
+def csv_stream_to_parquet(stream, dest_path: str, chunksize: int = None) -> dict:
+    """
+    Parsing CSV bertahap dari stream dan tulis setiap chunk sebagai row group Parquet.
+    Memori dibatasi oleh ukuran chunk; file ditulis ke .tmp lalu di-rename (atomik).
+    Skema awal diambil dari chunk pertama. Jika chunk berikutnya tidak muat (mis. teks di kolom
+    angka, desimal di kolom integer), kolom dilebarkan dan row group yang sudah ditulis diulang
+    dengan skema baru, sehingga tidak ada nilai yang hilang. Kolom integer disimpan sebagai int64.
+    """
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("pyarrow belum terpasang, pipeline Parquet tidak tersedia.")
+    chunksize = chunksize or config.READ_CHUNK_ROWS
+    tmp_paths = [dest_path + ".tmp", dest_path + ".tmp2"]
+    out = 0
+    writer, kinds, rows, groups = None, None, 0, 0
+    try:
+        # numpy_nullable: integer dengan nilai kosong tetap Int64 (tidak dibulatkan lewat float64)
+        with pd.read_csv(stream, chunksize=chunksize, low_memory=False, dtype_backend="numpy_nullable") as reader:
+            for chunk in reader:
+                seen = {col: _column_kind(chunk[col]) for col in chunk.columns}
+                kinds = seen if kinds is None else {col: _widen(kinds[col], seen[col]) for col in kinds}
+                table = pa.Table.from_pandas(_conform(chunk, kinds), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_paths[out], table.schema)
+                elif not table.schema.equals(writer.schema):
+                    widened = [f.name for f, g in zip(table.schema, writer.schema) if f.type != g.type]
+                    logger.warning(f"Skema dilebarkan pada baris ke-{rows:,} ({', '.join(widened)}); "
+                                   f"{groups} row group ditulis ulang.")
+                    writer.close()
+                    out = 1 - out
+                    writer = _rewrite_row_groups(tmp_paths[1 - out], tmp_paths[out], table.schema)
+                writer.write_table(table)
+                rows += len(chunk)
+                groups += 1
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        for path in tmp_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    if writer is None:
+        raise ValueError("CSV kosong, tidak ada data untuk ditulis.")
+    writer.close()
+    os.replace(tmp_paths[out], dest_path)
+    return {"rows": rows, "row_groups": groups, "columns": list(kinds)}
+
+
+def _safe_member_path(name: str):
+    """
+    Nama member ZIP sebagai path relatif yang aman di bawah folder tujuan, atau None jika
+    namanya absolut atau memuat ".." (zip-slip: nama berasal dari stream yang tidak tepercaya).
+    """
+    parts = name.replace("\\", "/").split("/")
+    if name.startswith(("/", "\\")) or ":" in parts[0] or ".." in parts:
+        return None
+    parts = [p for p in parts if p not in ("", ".")]
+    return "/".join(parts) or None
+
+
+def _copy_stream(stream, dest_path: str):
+    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+    tmp_path = dest_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        shutil.copyfileobj(stream, f, _READ_BLOCK)
+    os.replace(tmp_path, dest_path)
+
+
+def _ingest_entry(name: str, stream, dest_dir: str, chunksize: int, t0: float, result: dict):
+    """Satu file: CSV → Parquet, format lain disalin apa adanya."""
+    if detect_file_type(name) == "csv" and PARQUET_AVAILABLE:
+        dest = os.path.join(dest_dir, os.path.splitext(name)[0] + ".parquet")
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        stats = csv_stream_to_parquet(io.BufferedReader(stream, _READ_BLOCK) if isinstance(stream, io.RawIOBase) else stream,
+                                      dest, chunksize)
+        result["rows"] += stats["rows"]
+        logger.info(f"Parquet siap: {dest} ({stats['rows']} baris, {stats['row_groups']} row group)")
+    else:
+        dest = os.path.join(dest_dir, name)
+        _copy_stream(stream, dest)
+    result["files"].append(os.path.relpath(dest, dest_dir).replace("\\", "/"))
+    if result["first_ready_s"] is None:
+        result["first_ready_s"] = round(time.time() - t0, 3)
+
+
+def ingest_to_parquet(source: str, dest_dir: str, members=None, filename: str = None, headers: dict = None,
+                      chunksize: int = None, **kwargs) -> dict:
+    """
+    Pipeline ingest yang tahapannya berjalan tumpang tindih:
+    byte jaringan → dekompresi member ZIP → parser CSV bertahap → row group Parquet.
+    Tidak ada ZIP sementara di disk; memori dibatasi ukuran chunk (READ_CHUNK_ROWS).
+
+    - source  : URL http(s) atau path lokal (ZIP atau file tunggal)
+    - members : hanya member ZIP ini yang diproses (None → semua file data)
+    - headers : dikirim apa adanya, mis. If-None-Match untuk melewati sumber yang tidak berubah
+    Mengembalikan ringkasan: status ("ingested"/"not_modified"), bytes, sha256, etag,
+    last_modified, files, rows, seconds, first_ready_s, network_done_s.
+    """
+    t0 = time.time()
+    result = {"status": "ingested", "bytes": 0, "sha256": None, "etag": None, "last_modified": None,
+              "files": [], "rows": 0, "seconds": 0.0, "first_ready_s": None, "network_done_s": None}
+    os.makedirs(dest_dir, exist_ok=True)
+
+    if source.startswith("http"):
+        response = http_client.get(source, headers=headers or {}, stream=True, allow_redirects=True, **kwargs)
+        if response.status_code == 304:
+            response.close()
+            result.update(status="not_modified", seconds=round(time.time() - t0, 3))
+            return result
+        response.raise_for_status()
+        response.raw.decode_content = True
+        result["etag"] = response.headers.get("ETag")
+        result["last_modified"] = response.headers.get("Last-Modified")
+        filename = filename or os.path.basename(response.url.split("?")[0]) or "dataset"
+        raw, closer = response.raw, response
+    else:
+        filename = filename or os.path.basename(source)
+        raw = open(source, "rb")
+        closer = raw
+
+    with closer:
+        src = _ByteSource(raw)
+        magic = src.read_exact(4)
+        src.unread(magic)
+
+        if magic == b"PK\x03\x04" and detect_file_type(filename) not in ("xlsx", "xls"):
+            wanted = set(members) if members else None
+            for name, member in iter_zip_stream(src):
+                if name.endswith("/") or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+                    continue
+                if wanted is not None and name not in wanted:
+                    continue
+                if wanted is None and not detect_file_type(name):
+                    continue
+                safe_name = _safe_member_path(name)
+                if safe_name is None:
+                    logger.warning(f"Member ZIP dilewati, path keluar dari folder tujuan: {name}")
+                    continue
+                _ingest_entry(safe_name, member, dest_dir, chunksize, t0, result)
+        else:
+            _ingest_entry(filename, src, dest_dir, chunksize, t0, result)
+
+        src.drain()
+        result["network_done_s"] = round(time.time() - t0, 3)
+        result["bytes"] = src.bytes_read
+        result["sha256"] = src.sha256.hexdigest()
+
+    result["seconds"] = round(time.time() - t0, 3)
+    logger.info(
+        f"Ingest {filename}: {result['bytes'] / (1024 * 1024):.1f} MB, {len(result['files'])} file, "
+        f"{result['rows']} baris dalam {result['seconds']:.1f} s (file pertama siap {result['first_ready_s']} s)"
+    )
+    return result
@@ -0,0 +1,232 @@
+# utils/kaggle_catalog.py
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import config
+from utils.debug_utils import logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    ref         TEXT PRIMARY KEY,
+    title       TEXT,
+    subtitle    TEXT,
+    owner       TEXT,
+    tags        TEXT,
+    files       TEXT,
+    total_bytes INTEGER,
+    listing     TEXT,
+    listed_at   REAL,
+    detail      TEXT,
+    detail_at   REAL
+);
+CREATE TABLE IF NOT EXISTS queries (
+    query      TEXT PRIMARY KEY,
+    refs       TEXT,
+    exhausted  INTEGER,
+    fetched_at REAL
+);
+"""
+
+_init_lock = threading.Lock()
+_initialized = set()
+_fts_available = None
+
+_refresh_lock = threading.Lock()
+_refreshing = set()
+
+
+def _connect() -> sqlite3.Connection:
+    """Koneksi baru per pemanggilan (aman dipakai dari thread refresh di background)."""
+    global _fts_available
+    path = config.KAGGLE_CATALOG_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    with _init_lock:
+        if path not in _initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS datasets_fts "
+                    "USING fts5(ref, title, subtitle, owner, tags, files)"
+                )
+                _fts_available = True
+            except sqlite3.OperationalError:
+                # SQLite tanpa FTS5 → pencarian memakai LIKE
+                logger.warning("SQLite tanpa FTS5, katalog Kaggle memakai pencarian LIKE.")
+                _fts_available = False
+            conn.commit()
+            _initialized.add(path)
+    return conn
+
+
+@contextmanager
+def _db():
+    conn = _connect()
+    try:
+        with conn:  # commit / rollback
+            yield conn
+    finally:
+        conn.close()
+
+
+def _ttl_seconds() -> float:
+    return config.KAGGLE_CATALOG_TTL_HOURS * 3600
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _tag_names(tags) -> list:
+    return [t.get("name", "") if isinstance(t, dict) else str(t) for t in (tags or [])]
+
+
+def _index_row(conn, ref: str):
+    """Perbarui baris FTS untuk satu dataset dari tabel utama."""
+    if not _fts_available:
+        return
+    row = conn.execute("SELECT * FROM datasets WHERE ref = ?", (ref,)).fetchone()
+    conn.execute("DELETE FROM datasets_fts WHERE ref = ?", (ref,))
+    files = " ".join(f.get("name", "") for f in json.loads(row["files"] or "[]"))
+    conn.execute(
+        "INSERT INTO datasets_fts (ref, title, subtitle, owner, tags, files) VALUES (?, ?, ?, ?, ?, ?)",
+        (ref, row["title"] or "", row["subtitle"] or "", row["owner"] or "", row["tags"] or "", files),
+    )
+
+
+def record_search(query: str, datasets: list, limit: int):
+    """Simpan hasil pencarian API (urutan asli) dan metadata tiap dataset ke katalog."""
+    now = time.time()
+    with _db() as conn:
+        for ds in datasets:
+            ref = ds.get("ref")
+            if not ref:
+                continue
+            conn.execute(
+                """
+                INSERT INTO datasets (ref, title, subtitle, owner, tags, total_bytes, listing, listed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(ref) DO UPDATE SET
+                    title = excluded.title, subtitle = excluded.subtitle, owner = excluded.owner,
+                    tags = excluded.tags, total_bytes = excluded.total_bytes,
+                    listing = excluded.listing, listed_at = excluded.listed_at
+                """,
+                (ref, ds.get("title"), ds.get("subtitle"), ds.get("ownerName") or ds.get("creatorName"),
+                 " ".join(_tag_names(ds.get("tags"))), ds.get("totalBytes"), json.dumps(ds), now),
+            )
+            _index_row(conn, ref)
+        conn.execute(
+            "INSERT OR REPLACE INTO queries (query, refs, exhausted, fetched_at) VALUES (?, ?, ?, ?)",
+            (_normalize_query(query), json.dumps([d.get("ref") for d in datasets if d.get("ref")]),
+             int(len(datasets) < limit), now),
+        )
+
+
+def record_dataset(ref: str, data: dict):
+    """Simpan respons `datasets/view` (judul, owner, tag, daftar file & ukuran) ke katalog."""
+    now = time.time()
+    files = [
+        {"name": f.get("name"), "totalBytes": f.get("totalBytes"), "totalBytesReadable": f.get("totalBytesReadable")}
+        for f in data.get("files", [])
+    ]
+    with _db() as conn:
+        conn.execute(
+            """
+            INSERT INTO datasets (ref, title, subtitle, owner, tags, files, total_bytes, detail, detail_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(ref) DO UPDATE SET
+                title = excluded.title, subtitle = excluded.subtitle, owner = excluded.owner,
+                tags = excluded.tags, files = excluded.files,
+                total_bytes = COALESCE(excluded.total_bytes, datasets.total_bytes),
+                detail = excluded.detail, detail_at = excluded.detail_at
+            """,
+            (ref, data.get("title"), data.get("subtitle"), (data.get("ownerUser") or {}).get("username"),
+             " ".join(_tag_names(data.get("tags"))), json.dumps(files),
+             data.get("totalBytes"), json.dumps(data), now),
+        )
+        _index_row(conn, ref)
+
+
+def _listing(row) -> dict:
+    if row["listing"]:
+        return json.loads(row["listing"])
+    return {"ref": row["ref"], "title": row["title"], "subtitle": row["subtitle"], "ownerName": row["owner"]}
+
+
+def cached_search(query: str, limit: int):
+    """
+    Hasil pencarian yang pernah diambil untuk query yang sama.
+    Mengembalikan (datasets, masih_segar), atau (None, False) jika belum ada / kurang dari `limit`.
+    """
+    with _db() as conn:
+        row = conn.execute("SELECT * FROM queries WHERE query = ?", (_normalize_query(query),)).fetchone()
+        if not row:
+            return None, False
+        refs = json.loads(row["refs"])
+        if len(refs) < limit and not row["exhausted"]:
+            return None, False
+        refs = refs[:limit]
+        rows = {r["ref"]: r for r in conn.execute(
+            f"SELECT * FROM datasets WHERE ref IN ({','.join('?' * len(refs))})", refs)}
+    datasets = [_listing(rows[ref]) for ref in refs if ref in rows]
+    return datasets, time.time() - row["fetched_at"] < _ttl_seconds()
+
+
+def search_catalog(query: str, limit: int) -> list:
+    """Cari dataset di katalog lokal (FTS5, fallback LIKE) untuk query yang belum pernah diambil."""
+    words = re.findall(r"\w+", query.lower())
+    if not words:
+        return []
+    with _db() as conn:
+        if _fts_available:
+            match = " ".join(f'"{w}"*' for w in words)
+            rows = conn.execute(
+                "SELECT d.* FROM datasets_fts f JOIN datasets d ON d.ref = f.ref "
+                "WHERE datasets_fts MATCH ? ORDER BY bm25(datasets_fts) LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        else:
+            clause = " AND ".join(
+                "(lower(title) LIKE ? OR lower(subtitle) LIKE ? OR lower(tags) LIKE ? OR lower(ref) LIKE ?)"
+                for _ in words
+            )
+            params = [p for w in words for p in [f"%{w}%"] * 4]
+            rows = conn.execute(f"SELECT * FROM datasets WHERE {clause} LIMIT ?", (*params, limit)).fetchall()
+    return [_listing(r) for r in rows]
+
+
+def get_dataset(ref: str):
+    """Respons `datasets/view` yang tersimpan. Mengembalikan (data, masih_segar), atau (None, False)."""
+    with _db() as conn:
+        row = conn.execute("SELECT detail, detail_at FROM datasets WHERE ref = ?", (ref,)).fetchone()
+    if not row or not row["detail"]:
+        return None, False
+    return json.loads(row["detail"]), time.time() - row["detail_at"] < _ttl_seconds()
+
+
+def refresh_in_background(key: str, refresh):
+    """Jalankan `refresh()` di thread daemon; satu refresh per key dalam satu waktu."""
+    with _refresh_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            refresh()
+            logger.info(f"Katalog Kaggle diperbarui di background: {key}")
+        except Exception as e:
+            logger.warning(f"Refresh katalog Kaggle gagal untuk {key}: {e}")
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
@@ -0,0 +1,120 @@
+# utils/kaggle_client.py
+import os
+import sys
+import shutil
+import zipfile
+from urllib.parse import quote
+
+import config
+from utils.debug_utils import logger
+from utils import http_client
+from utils.download_cache import fetch, normalize_source_key, clone_file
+
+
+KAGGLE_API = "https://www.kaggle.com/api/v1"
+
+
+def kaggle_auth():
+    """Kredensial Basic Auth Kaggle dari config (atau environment yang diisi setup_kaggle_api)."""
+    username = config.KAGGLE_USERNAME or os.getenv("KAGGLE_USERNAME")
+    key = config.KAGGLE_KEY or os.getenv("KAGGLE_KEY")
+    if not username or not key:
+        raise PermissionError("Kredensial Kaggle tidak ditemukan (KAGGLE_USERNAME / KAGGLE_KEY).")
+    return username, key
+
+
+def download_url(dataset: str, file_name: str = None) -> str:
+    """Endpoint unduhan dataset utuh (ZIP) atau satu file di dalam dataset."""
+    url = f"{KAGGLE_API}/datasets/download/{dataset.strip('/')}"
+    if file_name:
+        url += "/" + quote(file_name)
+    return url
+
+
+def resolve_download_url(dataset: str, file_name: str = None):
+    """
+    Minta endpoint unduhan tanpa mengikuti redirect dan kembalikan signed URL storage
+    (tidak butuh kredensial, mendukung Range). None jika Kaggle tidak me-redirect.
+    """
+    try:
+        with http_client.get(download_url(dataset, file_name), auth=kaggle_auth(), stream=True, allow_redirects=False) as r:
+            if r.is_redirect and r.headers.get("Location"):
+                return r.headers["Location"]
+            logger.info(f"Endpoint unduhan Kaggle tidak me-redirect (status {r.status_code}).")
+    except Exception as e:
+        logger.warning(f"Gagal meminta URL unduhan Kaggle untuk {dataset}: {e}")
+    return None
+
+
+def print_progress(done: int, total):
+    """Progress hook sederhana untuk terminal."""
+    if total:
+        sys.stdout.write(f"\r⬇️  {done / (1024 * 1024):.1f} / {total / (1024 * 1024):.1f} MB ({done * 100 // total}%)")
+    else:
+        sys.stdout.write(f"\r⬇️  {done / (1024 * 1024):.1f} MB")
+    if total and done >= total:
+        sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+def download_dataset(dataset: str, dest_dir: str = None, filename: str = None, progress=None):
+    """
+    Unduh ZIP dataset Kaggle in-process lewat cache unduhan (koneksi pool, revalidasi,
+    unduhan paralel/lanjutan). Tanpa `dest_dir` path yang dikembalikan adalah blob cache
+    (baca saja, jangan dihapus). Mengembalikan CachedFile.
+    """
+    slug = dataset.strip("/").split("/")[-1]
+    logger.info(f"Mengunduh dataset Kaggle: {dataset}")
+    return fetch(
+        download_url(dataset),
+        dest_dir,
+        key=normalize_source_key(dataset, kind="kaggle"),
+        filename=filename or f"{slug}.zip",
+        auth=kaggle_auth(),
+        progress=progress,
+    )
+
+
+def download_dataset_file(dataset: str, file_name: str, dest_dir: str, progress=None) -> str:
+    """
+    Unduh satu file dari dataset Kaggle ke `dest_dir`.
+    Kaggle mengirim file besar dalam bentuk ZIP; jika begitu, file yang diminta diekstrak.
+    Mengembalikan path file hasil unduhan.
+    """
+    logger.info(f"Mengunduh file Kaggle: {dataset}/{file_name}")
+    cached = fetch(
+        download_url(dataset, file_name),
+        None,
+        key=normalize_source_key(f"{dataset}/{file_name}", kind="kaggle"),
+        filename=os.path.basename(file_name),
+        auth=kaggle_auth(),
+        progress=progress,
+    )
+    os.makedirs(dest_dir, exist_ok=True)
+    target = os.path.join(dest_dir, os.path.basename(file_name))
+
+    # .xlsx juga kontainer ZIP: hanya bongkar pembungkus yang benar-benar memuat file yang diminta
+    if not file_name.lower().endswith((".zip", ".xlsx", ".xls")) and zipfile.is_zipfile(cached.path):
+        with zipfile.ZipFile(cached.path) as zf:
+            member = next((n for n in zf.namelist()
+                           if not n.endswith("/") and os.path.basename(n) == os.path.basename(file_name)), None)
+            if member is not None:
+                with zf.open(member) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                return target
+
+    # Salinan independen (bukan hardlink) agar edit file dataset tidak mengubah blob cache
+    clone_file(cached.path, target + ".tmp")
+    os.replace(target + ".tmp", target)
+    return target
+
+
+def download_and_unzip(dataset: str, dest_dir: str, progress=None) -> list:
+    """Unduh ZIP dataset (lewat cache) lalu ekstrak ke `dest_dir`, setara `kaggle datasets download --unzip`."""
+    cached = download_dataset(dataset, progress=progress)
+    os.makedirs(dest_dir, exist_ok=True)
+    with zipfile.ZipFile(cached.path) as zf:
+        zf.extractall(dest_dir)
+        names = zf.namelist()
+    logger.info(f"Dataset {dataset} diekstrak ke: {dest_dir} ({len(names)} entri)")
+    return names
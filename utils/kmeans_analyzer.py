@@ -1,12 +1,105 @@
 # utils/kmeans_analyzer.py
 import os
+import time
+import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import pairwise_distances_argmin_min
+import config
 from utils.debug_utils import logger
-from utils.file_handler import detect_file_type
+from utils.file_handler import detect_file_type, load_dataset, iter_file_chunks
 from utils.file_handler import read_file_preview  # gunakan fungsi pembaca umum
 from utils.file_manager import list_local_datasets
+from utils.dataset_store import write_derived, write_derived_chunks
+from utils.local_catalog import get_file_info
+from utils.kmeans_sweep import sweep_k, print_sweep
+from utils.coreset import StreamingCoreset, reduce_coreset
+from utils.model_store import (save_model, load_model, list_models, model_name_for, feature_matrix,
+                               nearest_centroid)
+from utils.feature_projection import identifier_columns, fit_projection, plot_coordinates, describe_projection
 from utils.chart_utils import plot_kmeans_clusters,plot_linear_regression,plot_apriori_support,plot_distribution
+def _kmeans_mode(local_path):
+    """
+    Mode clustering: "full" (KMeans di memori), "minibatch" (streaming dari disk) atau
+    "coreset" (ringkasan berbobot satu pass). Mode auto memilih berdasarkan jumlah baris / ukuran
+    di katalog lokal.
+    """
+    mode = config.KMEANS_MODE
+    if mode != "auto":
+        return mode
+    info = get_file_info(local_path)
+    if not info:
+        return "full"
+    if info["rows"] is not None and info["rows"] >= config.KMEANS_CORESET_MIN_ROWS:
+        return "coreset"
+    if info["rows"] is not None and info["rows"] >= config.KMEANS_STREAMING_MIN_ROWS:
+        return "minibatch"
+    if info["size"] >= config.READ_MEMORY_BUDGET_MB * 1024 * 1024 / 4:
+        return "minibatch"
+    return "full"
+
+
+def _ask_n_clusters(features):
+    """Minta jumlah cluster ke pengguna; "auto" memilih k lewat sweep paralel pada `features`."""
+    answer = input("\nMasukkan jumlah cluster (default=3, 'auto' untuk pilih otomatis): ").strip().lower()
+    if answer == "auto":
+        summary = sweep_k(np.asarray(features, dtype="float64"))
+        print_sweep(summary)
+        return summary["recommended_k"]
+    try:
+        return int(answer or 3)
+    except ValueError:
+        return 3
+
+
+def _prepare_features(sample, local_path=None):
+    """
+    Tentukan preprocessing fitur dari `sample` (dataset penuh atau potongan pertama):
+    kolom numerik tanpa kolom mirip pengenal, median untuk imputasi, dan proyeksi dimensi opsional.
+    Jika `local_path` diberikan (mode streaming/coreset), PCA dipasang atas seluruh file per potongan.
+    Mengembalikan spec {"columns", "fill", "projection"} (format model tersimpan) atau None.
+    """
+    columns = [str(c) for c in sample.select_dtypes(include=["number"]).columns]
+    if config.KMEANS_DROP_ID_COLUMNS:
+        ids = identifier_columns(sample, columns)
+        if ids:
+            print("\nKolom mirip pengenal diabaikan: " + ", ".join(f"{c} ({why})" for c, why in ids.items()))
+            columns = [c for c in columns if c not in ids]
+    if not columns:
+        return None
+
+    fill = sample[columns].median()
+    if sample[columns].isnull().any().any():
+        logger.warning("Dataset mengandung nilai kosong. Mengisi dengan median.")
+    spec = {"columns": columns, "fill": {c: (None if pd.isna(v) else float(v)) for c, v in fill.items()},
+            "projection": None}
+    print("\nKolom numerik yang digunakan:")
+    print(", ".join(columns))
+
+    blocks = None
+    if local_path is not None:
+        blocks = (feature_matrix(chunk, spec) for chunk in iter_file_chunks(local_path, chunksize=config.READ_CHUNK_ROWS))
+    spec["projection"] = fit_projection(feature_matrix(sample, spec), blocks=blocks)
+    if spec["projection"]:
+        print(f"Reduksi dimensi: {describe_projection(spec['projection'])}; clustering di ruang hasil proyeksi.")
+    return spec
+
+
+def _plot_clusters(Z, labels, spec, title):
+    """Scatter 2-D: dua komponen teratas jika fitur diproyeksikan, selain itu dua kolom fitur pertama."""
+    if spec["projection"]:
+        names = ["PC1", "PC2"]
+        xy = plot_coordinates(Z, spec["projection"])
+    elif Z.shape[1] >= 2:
+        names = spec["columns"][:2]
+        xy = Z[:, :2]
+    else:
+        return
+    plot_df = pd.DataFrame(xy, columns=names)
+    plot_df["Cluster"] = np.asarray(labels)
+    plot_kmeans_clusters(plot_df, x_col=names[0], y_col=names[1], title=title)
+
+
 def analyze_kmeans(dataset_path):
 
     selected_path = dataset_path
@@ -25,16 +118,15 @@ def analyze_kmeans(dataset_path):
         print(f" Format file {local_path} tidak dikenali.")
         return
 
+    mode = _kmeans_mode(local_path)
+    if mode == "minibatch":
+        return analyze_kmeans_streaming(local_path)
+    if mode == "coreset":
+        return analyze_kmeans_coreset(local_path)
+
     try:
-        # Gunakan pembacaan penuh berdasarkan ekstensi
-        if ext == "csv":
-            df = pd.read_csv(local_path)
-        elif ext == "xlsx":
-            df = pd.read_excel(local_path)
-        elif ext == "json":
-            df = pd.read_json(local_path)
-        else:
-            raise ValueError(f"Format file {ext} belum didukung untuk pembacaan penuh.")
+        # Gunakan loader bersama (cache memori + cache kolumnar)
+        df = load_dataset(local_path)
 
         logger.info(f"Dataset {local_path} berhasil dibaca ({df.shape[0]} baris, {df.shape[1]} kolom).")
 
@@ -42,40 +134,336 @@ def analyze_kmeans(dataset_path):
         print("Menampilkan 5 baris pertama:")
         print(df.head())
 
-        # Pilih kolom numerik untuk clustering
-        numeric_df = df.select_dtypes(include=['number'])
-        # Tangani missing value
-        if numeric_df.isnull().any().any():
-            logger.warning("Dataset mengandung nilai kosong. Mengisi dengan median.")
-            numeric_df = numeric_df.fillna(numeric_df.median())
-
-        if numeric_df.empty:
+        # Pilih kolom numerik untuk clustering (median & proyeksi disimpan bersama model untuk assign berikutnya)
+        spec = _prepare_features(df)
+        if spec is None:
             print(" Tidak ada kolom numerik untuk analisis K-Means.")
             return
+        X = feature_matrix(df, spec)
 
-        print("\nKolom numerik yang digunakan:")
-        print(", ".join(numeric_df.columns))
-
-        # Input jumlah cluster
-        try:
-            n_clusters = int(input("\nMasukkan jumlah cluster (default=3): ") or 3)
-        except ValueError:
-            n_clusters = 3
+        # Input jumlah cluster ("auto" → sweep k paralel)
+        n_clusters = _ask_n_clusters(X)
 
         # Jalankan K-Means
         model = KMeans(n_clusters=n_clusters, random_state=42)
-        df["Cluster"] = model.fit_predict(numeric_df)
-        plot_kmeans_clusters(df, x_col=numeric_df.columns[0], y_col=numeric_df.columns[1], title="Hasil K-Means Clustering")
+        df["Cluster"] = model.fit_predict(X)
+        _plot_clusters(X, df["Cluster"].to_numpy(), spec, title="Hasil K-Means Clustering")
 
         print(f"\nAnalisis K-Means selesai. Total cluster: {n_clusters}")
-        print(df[["Cluster"] + list(numeric_df.columns)].head())
+        print(df[["Cluster"] + spec["columns"]].head())
 
-        output_path = local_path.replace(".csv", "_clustered.csv")
-        df.to_csv(output_path, index=False)
+        # Simpan hanya kolom Cluster yang merujuk dataset asli (bukan salinan dataset lengkap)
+        output_path = write_derived(local_path, df[["Cluster"]], "_clustered")
         print(f"\n Hasil disimpan ke: {output_path}")
         logger.info(f"Hasil K-Means disimpan ke {output_path}")
 
+        stored = save_model(model_name_for(local_path), model.cluster_centers_, spec["columns"], spec["fill"],
+                            local_path, len(X), model.inertia_, "kmeans", projection=spec["projection"])
+        print(f" Model disimpan: {stored['name']}@{stored['version']} (pakai menu 10 untuk melabeli data baru)")
+
     except Exception as e:
         logger.error(f"Gagal melakukan analisis K-Means: {e}")
         print(f" Terjadi kesalahan saat analisis: {e}")
 
+
+def _partial_fit(model, X, batch_size):
+    for start in range(0, len(X), batch_size):
+        model.partial_fit(X[start:start + batch_size])
+    return len(X)
+
+
+def analyze_kmeans_streaming(local_path, n_clusters=None):
+    """
+    K-Means out-of-core: data dibaca per potongan dari disk sehingga memori tetap datar.
+    - Pusat awal: KMeans (k-means++) pada potongan pertama
+    - Pass 1  : MiniBatchKMeans.partial_fit per mini-batch (KMEANS_STREAM_EPOCHS kali)
+    - Pass 2  : label tiap potongan lalu langsung ditulis sebagai kolom turunan `_clustered`
+    """
+    chunksize = config.READ_CHUNK_ROWS
+    batch_size = config.KMEANS_BATCH_SIZE
+    info = get_file_info(local_path)
+    if info and info["rows"] is not None:
+        print(f"\nMode streaming MiniBatch K-Means: ±{info['rows']:,} baris, dibaca per {chunksize:,} baris.")
+    else:
+        print(f"\nMode streaming MiniBatch K-Means: dibaca per {chunksize:,} baris.")
+
+    try:
+        chunks = iter_file_chunks(local_path, chunksize=chunksize)
+        first = next(chunks, None)
+        if first is None or first.empty:
+            print(" Dataset kosong.")
+            return
+
+        print("Menampilkan 5 baris pertama:")
+        print(first.head())
+
+        # Kolom & nilai pengisi dari potongan pertama agar konsisten antar potongan; PCA dipasang atas seluruh file
+        spec = _prepare_features(first, local_path)
+        if spec is None:
+            print(" Tidak ada kolom numerik untuk analisis K-Means.")
+            return
+
+        X = feature_matrix(first, spec)
+        if n_clusters is None:
+            # Sweep k otomatis memakai potongan pertama sebagai sampel
+            n_clusters = _ask_n_clusters(X)
+        if len(X) < n_clusters:
+            print(f" Jumlah baris ({len(X)}) lebih sedikit dari jumlah cluster.")
+            return
+        init = KMeans(n_clusters=n_clusters, random_state=42, n_init="auto").fit(X).cluster_centers_
+        model = MiniBatchKMeans(n_clusters=n_clusters, init=init, n_init=1, batch_size=batch_size, random_state=42)
+
+        # Pass 1: update pusat cluster secara bertahap (potongan pertama sudah dibaca)
+        n_rows = _partial_fit(model, X, batch_size)
+        for chunk in chunks:
+            n_rows += _partial_fit(model, feature_matrix(chunk, spec), batch_size)
+        for epoch in range(1, config.KMEANS_STREAM_EPOCHS):
+            for chunk in iter_file_chunks(local_path, chunksize=chunksize):
+                _partial_fit(model, feature_matrix(chunk, spec), batch_size)
+            logger.info(f"MiniBatch K-Means epoch {epoch + 1} selesai.")
+        logger.info(f"MiniBatch K-Means: {n_rows:,} baris diproses untuk fitting.")
+        del X, first
+
+        # Pass 2: label per potongan, ditulis langsung tanpa menampung seluruh dataset
+        counts = np.zeros(n_clusters, dtype=np.int64)
+        inertia = 0.0
+        sample = []
+        sample_points = []
+        sample_rows = 0
+
+        def labelled():
+            nonlocal inertia, sample_rows
+            for chunk in iter_file_chunks(local_path, chunksize=chunksize):
+                Z = feature_matrix(chunk, spec)
+                labels, dist = pairwise_distances_argmin_min(Z, model.cluster_centers_)
+                chunk["Cluster"] = labels.astype("int32")
+                counts[:] += np.bincount(labels, minlength=n_clusters)
+                inertia += float((dist ** 2).sum())
+                if sample_rows < config.KMEANS_PLOT_SAMPLE_ROWS:
+                    part = chunk.head(config.KMEANS_PLOT_SAMPLE_ROWS - sample_rows)
+                    sample.append(part)
+                    sample_points.append(Z[:len(part)])
+                    sample_rows += len(part)
+                yield chunk
+
+        output_path = write_derived_chunks(local_path, labelled(), ["Cluster"], "_clustered")
+
+        sample_df = pd.concat(sample, ignore_index=True)
+        _plot_clusters(np.vstack(sample_points), sample_df["Cluster"].to_numpy(), spec,
+                       title="Hasil MiniBatch K-Means Clustering (sampel)")
+
+        print(f"\nAnalisis MiniBatch K-Means selesai. Total cluster: {n_clusters}")
+        print(f"Jumlah baris: {int(counts.sum()):,} | inertia: {inertia:,.2f}")
+        for cluster, count in enumerate(counts):
+            print(f"  Cluster {cluster}: {int(count):,} baris")
+        print(sample_df[["Cluster"] + spec["columns"]].head())
+        print(f"\n Hasil disimpan ke: {output_path}")
+        logger.info(f"Hasil MiniBatch K-Means disimpan ke {output_path} (inertia {inertia:.2f})")
+
+        stored = save_model(model_name_for(local_path), model.cluster_centers_, spec["columns"], spec["fill"],
+                            local_path, int(counts.sum()), inertia, "minibatch", projection=spec["projection"])
+        print(f" Model disimpan: {stored['name']}@{stored['version']} (pakai menu 10 untuk melabeli data baru)")
+
+    except Exception as e:
+        logger.error(f"Gagal melakukan analisis MiniBatch K-Means: {e}")
+        print(f" Terjadi kesalahan saat analisis: {e}")
+
+
+def _assign_pass(local_path, model, suffix="_assigned"):
+    """Satu pass linear: label setiap potongan ke centroid terdekat dan tulis kolom turunan `suffix`."""
+    centroids = np.asarray(model["centroids"], dtype="float64")
+    stats = {"counts": np.zeros(len(centroids), dtype=np.int64), "sq_dist": 0.0}
+
+    def labelled():
+        for chunk in iter_file_chunks(local_path, chunksize=config.READ_CHUNK_ROWS):
+            labels, sq_dist = nearest_centroid(feature_matrix(chunk, model), centroids)
+            chunk["Cluster"] = labels
+            stats["counts"] += np.bincount(labels, minlength=len(centroids))
+            stats["sq_dist"] += float(sq_dist.sum())
+            yield chunk
+
+    output_path = write_derived_chunks(local_path, labelled(), ["Cluster"], suffix)
+    n_rows = int(stats["counts"].sum())
+    return output_path, stats["counts"], stats["sq_dist"], n_rows
+
+
+def _warm_start_refit(local_path, model):
+    """Refit MiniBatch yang dimulai dari centroid lama (tanpa inisialisasi ulang) pada data baru."""
+    refit = MiniBatchKMeans(n_clusters=model["n_clusters"], init=np.asarray(model["centroids"]), n_init=1,
+                            batch_size=config.KMEANS_BATCH_SIZE, random_state=42)
+    for chunk in iter_file_chunks(local_path, chunksize=config.READ_CHUNK_ROWS):
+        _partial_fit(refit, feature_matrix(chunk, model), config.KMEANS_BATCH_SIZE)
+    return refit.cluster_centers_
+
+
+def assign_kmeans(dataset_path, model_name=None):
+    """
+    Labeli baris dataset (baru / bertambah) dengan model K-Means tersimpan tanpa refit:
+    satu scan linear per potongan dengan pencarian centroid terdekat tervektorisasi.
+    Jika rata-rata jarak ke centroid naik melewati KMEANS_DRIFT_RATIO × nilai saat training,
+    refit warm-start dari centroid lama bisa dijalankan lalu disimpan sebagai versi baru.
+    """
+    local_path = dataset_path.lstrip("/")
+    if not os.path.exists(local_path):
+        print("Dataset tidak ditemukan secara lokal.")
+        return
+
+    models = list_models()
+    if not models:
+        print(" Belum ada model K-Means tersimpan. Jalankan analisis K-Means (menu 6) terlebih dahulu.")
+        return
+    if model_name is None:
+        print("\n=== Model K-Means tersimpan ===")
+        for i, m in enumerate(models, 1):
+            projection = f", {describe_projection(m['projection'])}" if m.get("projection") else ""
+            print(f"{i}. {m['name']}@{m['version']} (k={m['n_clusters']}, kolom: {', '.join(m['columns'])}{projection})")
+        try:
+            model = models[int(input("Pilih model [1-n]: ")) - 1]
+        except (ValueError, IndexError):
+            print("Nomor tidak valid.")
+            return
+    else:
+        model = load_model(model_name)
+
+    info = get_file_info(local_path)
+    if info and info["columns"] is not None:
+        missing = [c for c in model["columns"] if c not in info["columns"]]
+        if missing:
+            print(f" Kolom model tidak ada di dataset: {', '.join(missing)}")
+            return
+
+    try:
+        t0 = time.time()
+        output_path, counts, sq_dist, n_rows = _assign_pass(local_path, model)
+        mean_sq = sq_dist / max(n_rows, 1)
+        print(f"\n {n_rows:,} baris dilabeli dengan {model['name']}@{model['version']} "
+              f"dalam {time.time() - t0:.2f} s (tanpa refit).")
+        for cluster, count in enumerate(counts):
+            print(f"  Cluster {cluster}: {int(count):,} baris")
+
+        ratio = mean_sq / model["mean_sq_dist"] if model["mean_sq_dist"] else 1.0
+        print(f" Rata-rata kuadrat jarak ke centroid: {mean_sq:,.4f} ({ratio:.2f}× saat training)")
+        if ratio > config.KMEANS_DRIFT_RATIO:
+            logger.warning(f"Drift terdeteksi pada {local_path}: jarak rata-rata {ratio:.2f}× nilai training.")
+            answer = input(" ⚠️ Drift terdeteksi. Refit warm-start dari centroid lama? (y/n): ").strip().lower()
+            if answer == "y":
+                t1 = time.time()
+                centroids = _warm_start_refit(local_path, model)
+                shift = np.linalg.norm(centroids - np.asarray(model["centroids"]), axis=1)
+                refit_model = dict(model, centroids=centroids.tolist())
+                output_path, counts, sq_dist, n_rows = _assign_pass(local_path, refit_model)
+                model = save_model(model["name"], centroids, model["columns"], model["fill"], local_path, n_rows,
+                                   sq_dist, "minibatch-warm-start", parent=model["version"],
+                                   projection=model.get("projection"))
+                print(f" Refit selesai dalam {time.time() - t1:.2f} s, pergeseran centroid maks {shift.max():.4f}. "
+                      f"Versi baru: {model['name']}@{model['version']}")
+
+        print(f"\n Label disimpan ke: {output_path}")
+        logger.info(f"Assign K-Means {model['name']}@{model['version']} → {output_path}")
+    except Exception as e:
+        logger.error(f"Gagal melabeli dataset dengan model K-Means: {e}")
+        print(f" Terjadi kesalahan saat assign: {e}")
+
+
+def _coreset_fit(points, weights, n_clusters):
+    # Ringkasan kecil: beberapa inisialisasi murah dan mengurangi risiko optimum lokal
+    return KMeans(n_clusters=n_clusters, random_state=42, n_init=10).fit(points, sample_weight=weights)
+
+
+def _sample_cost(sample, centroids):
+    return float(nearest_centroid(sample, centroids)[1].sum())
+
+
+def analyze_kmeans_coreset(local_path, n_clusters=None):
+    """
+    K-Means berbasis coreset untuk tabel sangat besar (dua pass atas disk):
+    - Pass 1: ringkasan berbobot (lightweight coreset, merge & reduce) + reservoir sampel seragam
+    - Fit KMeans tertimbang pada ringkasan di memori
+    - Pass 2: label seluruh dataset ke centroid terdekat (kolom turunan `_clustered`)
+    Galat aproksimasi dilaporkan terhadap fit KMeans eksak pada sampel reservoir, untuk beberapa
+    ukuran coreset sekaligus, sebagai dasar memilih KMEANS_CORESET_SIZE.
+    """
+    chunksize = config.READ_CHUNK_ROWS
+    size = config.KMEANS_CORESET_SIZE
+    print(f"\nMode coreset K-Means: ringkasan {size:,} titik berbobot, dibaca per {chunksize:,} baris.")
+
+    try:
+        chunks = iter_file_chunks(local_path, chunksize=chunksize)
+        first = next(chunks, None)
+        if first is None or first.empty:
+            print(" Dataset kosong.")
+            return
+
+        print("Menampilkan 5 baris pertama:")
+        print(first.head())
+        spec = _prepare_features(first, local_path)
+        if spec is None:
+            print(" Tidak ada kolom numerik untuk analisis K-Means.")
+            return
+
+        X = feature_matrix(first, spec)
+        if n_clusters is None:
+            n_clusters = _ask_n_clusters(X)
+
+        # Pass 1: ringkasan berbobot
+        t0 = time.perf_counter()
+        coreset = StreamingCoreset(size, eval_sample=config.KMEANS_CORESET_EVAL_SAMPLE)
+        coreset.add(X)
+        del X, first
+        for chunk in chunks:
+            coreset.add(feature_matrix(chunk, spec))
+        points, weights = coreset.result()
+        summary_s = time.perf_counter() - t0
+        if len(points) < n_clusters:
+            print(f" Jumlah baris ({coreset.n_rows}) lebih sedikit dari jumlah cluster.")
+            return
+
+        t1 = time.perf_counter()
+        model = _coreset_fit(points, weights, n_clusters)
+        fit_s = time.perf_counter() - t1
+
+        # Galat aproksimasi: biaya centroid coreset vs fit eksak pada sampel seragam yang sama
+        sample = coreset.eval_rows()
+        if sample is not None and len(sample) >= n_clusters:
+            t2 = time.perf_counter()
+            exact = KMeans(n_clusters=n_clusters, random_state=42, n_init=10).fit(sample)
+            exact_s = time.perf_counter() - t2
+            exact_cost = _sample_cost(sample, exact.cluster_centers_)
+            print(f"\n=== Galat aproksimasi vs KMeans eksak pada {len(sample):,} sampel ({exact_s:.2f} s) ===")
+            print(f"{'ukuran coreset':>15} {'galat biaya':>12} {'fit (s)':>8}")
+            rng = np.random.default_rng(7)
+            for trial_size in sorted({max(n_clusters, size // 4), max(n_clusters, size // 2), len(points)}):
+                tp, tw = reduce_coreset(points, weights, trial_size, rng)
+                t3 = time.perf_counter()
+                centers = model.cluster_centers_ if trial_size == len(points) else \
+                    _coreset_fit(tp, tw, n_clusters).cluster_centers_
+                trial_s = fit_s if trial_size == len(points) else time.perf_counter() - t3
+                error = _sample_cost(sample, centers) / exact_cost - 1 if exact_cost else 0.0
+                print(f"{trial_size:>15,} {error * 100:>11.2f}% {trial_s:>8.2f}")
+
+        # Pass 2: label seluruh dataset
+        t4 = time.perf_counter()
+        fitted = dict(spec, centroids=model.cluster_centers_.tolist())
+        output_path, counts, inertia, n_rows = _assign_pass(local_path, fitted, suffix="_clustered")
+        label_s = time.perf_counter() - t4
+
+        if sample is not None:
+            plot_points = sample[:config.KMEANS_PLOT_SAMPLE_ROWS]
+            _plot_clusters(plot_points, nearest_centroid(plot_points, model.cluster_centers_)[0], spec,
+                           title="Hasil Coreset K-Means Clustering (sampel)")
+
+        print(f"\nAnalisis coreset K-Means selesai. Total cluster: {n_clusters}")
+        print(f"Jumlah baris: {n_rows:,} | inertia: {inertia:,.2f}")
+        for cluster, count in enumerate(counts):
+            print(f"  Cluster {cluster}: {int(count):,} baris")
+        print(f"Waktu: ringkasan {summary_s:.2f} s, fit {fit_s:.2f} s, pelabelan {label_s:.2f} s")
+        print(f"\n Hasil disimpan ke: {output_path}")
+        logger.info(f"Hasil coreset K-Means disimpan ke {output_path} (inertia {inertia:.2f})")
+
+        stored = save_model(model_name_for(local_path), model.cluster_centers_, spec["columns"], spec["fill"],
+                            local_path, n_rows, inertia, "coreset", projection=spec["projection"])
+        print(f" Model disimpan: {stored['name']}@{stored['version']} (pakai menu 10 untuk melabeli data baru)")
+
+    except Exception as e:
+        logger.error(f"Gagal melakukan analisis coreset K-Means: {e}")
+        print(f" Terjadi kesalahan saat analisis: {e}")
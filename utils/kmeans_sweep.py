@@ -0,0 +1,140 @@
+# utils/kmeans_sweep.py
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score
+
+import config
+from utils.debug_utils import logger
+
+try:
+    from threadpoolctl import threadpool_limits
+    THREADPOOLCTL_AVAILABLE = True
+except ImportError:  # threadpoolctl opsional: tanpa paket ini thread BLAS/OpenMP per worker tidak dibatasi
+    threadpool_limits = None
+    THREADPOOLCTL_AVAILABLE = False
+
+
+# State per proses worker: view ndarray ke shared memory (dibuat sekali oleh initializer)
+_worker = {}
+
+
+def _attach(shm_name, shape, dtype, sample_idx, threads):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker["shm"] = shm  # simpan referensi agar buffer tidak dilepas
+    _worker["X"] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _worker["sample_idx"] = sample_idx
+    if THREADPOOLCTL_AVAILABLE:
+        # Hindari oversubscription: total thread semua worker ≈ jumlah CPU
+        _worker["limits"] = threadpool_limits(limits=threads)
+
+
+def _fit_k(k: int, random_state: int) -> dict:
+    """Fit KMeans untuk satu k pada matriks bersama lalu hitung inertia & silhouette sampel."""
+    X = _worker["X"]
+    idx = _worker["sample_idx"]
+
+    t0 = time.perf_counter()
+    model = KMeans(n_clusters=k, random_state=random_state, n_init="auto").fit(X)
+    fit_s = time.perf_counter() - t0
+
+    t1 = time.perf_counter()
+    labels = model.labels_[idx]
+    silhouette = None
+    if 1 < len(np.unique(labels)) < len(idx):
+        silhouette = float(silhouette_score(X[idx], labels))
+    score_s = time.perf_counter() - t1
+
+    return {"k": k, "inertia": float(model.inertia_), "silhouette": silhouette, "n_iter": int(model.n_iter_),
+            "fit_s": fit_s, "silhouette_s": score_s, "total_s": fit_s + score_s}
+
+
+def _elbow_k(results: list):
+    """Titik siku kurva inertia: jarak terjauh dari garis k_min–k_max (setelah normalisasi)."""
+    if len(results) < 3:
+        return None
+    ks = np.array([r["k"] for r in results], dtype="float64")
+    inertia = np.array([r["inertia"] for r in results], dtype="float64")
+    x = (ks - ks[0]) / (ks[-1] - ks[0])
+    span = inertia[0] - inertia[-1]
+    if span <= 0:
+        return None
+    y = (inertia - inertia[-1]) / span
+    # Garis dari (0, 1) ke (1, 0): jarak ∝ |x + y - 1|
+    distance = np.abs(x + y - 1)
+    return int(ks[int(np.argmax(distance))])
+
+
+def sweep_k(X: np.ndarray, k_values=None, workers: int = None, sample_size: int = None,
+            random_state: int = 42) -> dict:
+    """
+    Fit KMeans untuk beberapa nilai k secara paralel (process pool).
+    Matriks fitur dibagikan lewat shared memory (bukan di-pickle ke tiap worker);
+    silhouette dihitung pada sampel berukuran tetap. Mengembalikan hasil per k,
+    k rekomendasi (silhouette tertinggi, fallback titik siku) dan rincian waktu.
+    """
+    X = np.ascontiguousarray(X, dtype="float64")
+    k_values = list(k_values or range(config.KMEANS_SWEEP_MIN_K, config.KMEANS_SWEEP_MAX_K + 1))
+    k_values = [k for k in k_values if 1 < k < len(X)]
+    if not k_values:
+        raise ValueError("Tidak ada nilai k yang valid untuk jumlah baris dataset.")
+    workers = max(1, min(workers or config.KMEANS_SWEEP_WORKERS, len(k_values)))
+    sample_size = sample_size or config.KMEANS_SILHOUETTE_SAMPLE
+    rng = np.random.default_rng(random_state)
+    sample_idx = np.sort(rng.choice(len(X), size=min(sample_size, len(X)), replace=False))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    t0 = time.perf_counter()
+    shm = shared_memory.SharedMemory(create=True, size=max(X.nbytes, 1))
+    try:
+        np.ndarray(X.shape, dtype=X.dtype, buffer=shm.buf)[:] = X
+        setup_s = time.perf_counter() - t0
+
+        results = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(shm.name, X.shape, X.dtype.str, sample_idx, threads)) as pool:
+            # k besar biasanya paling lama: kirim lebih dulu agar worker terisi merata
+            futures = {pool.submit(_fit_k, k, random_state): k for k in sorted(k_values, reverse=True)}
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                logger.info(f"k={result['k']}: inertia {result['inertia']:.2f}, "
+                            f"silhouette {result['silhouette']}, {result['total_s']:.2f} s")
+    finally:
+        shm.close()
+        shm.unlink()
+
+    results.sort(key=lambda r: r["k"])
+    elbow = _elbow_k(results)
+    scored = [r for r in results if r["silhouette"] is not None]
+    best = max(scored, key=lambda r: r["silhouette"])["k"] if scored else elbow
+    return {
+        "results": results,
+        "recommended_k": best or k_values[0],
+        "elbow_k": elbow,
+        "workers": workers,
+        "sample_size": int(len(sample_idx)),
+        "setup_s": setup_s,
+        "wall_s": time.perf_counter() - t0,
+    }
+
+
+def print_sweep(summary: dict):
+    """Tabel hasil sweep: inertia, silhouette dan rincian waktu per k."""
+    print(f"\n=== Pemilihan k otomatis ({summary['workers']} worker, silhouette dari "
+          f"{summary['sample_size']:,} sampel) ===")
+    print(f"{'k':>3} {'inertia':>16} {'silhouette':>11} {'iter':>5} {'fit (s)':>8} {'silh. (s)':>9}")
+    for r in summary["results"]:
+        silhouette = f"{r['silhouette']:.4f}" if r["silhouette"] is not None else "-"
+        marker = " ⭐" if r["k"] == summary["recommended_k"] else ""
+        print(f"{r['k']:>3} {r['inertia']:>16,.2f} {silhouette:>11} {r['n_iter']:>5} "
+              f"{r['fit_s']:>8.2f} {r['silhouette_s']:>9.2f}{marker}")
+    serial = sum(r["total_s"] for r in summary["results"])
+    print(f"Rekomendasi k = {summary['recommended_k']} (silhouette tertinggi)"
+          + (f", titik siku inertia di k = {summary['elbow_k']}" if summary["elbow_k"] else ""))
+    print(f"Waktu: {summary['wall_s']:.2f} s total (shared memory {summary['setup_s']:.2f} s), "
+          f"{serial:.2f} s jika dijalankan berurutan.")
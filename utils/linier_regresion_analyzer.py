@@ -3,7 +3,7 @@ import os
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from utils.debug_utils import logger
-from utils.file_handler import detect_file_type
+from utils.file_handler import detect_file_type, load_dataset
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score
 
@@ -22,16 +22,13 @@ def analyze_linear_regression(dataset_path):
 
     try:
         ext = detect_file_type(local_path)
-        if ext == "csv":
-            df = pd.read_csv(local_path)
-        elif ext == "xlsx":
-            df = pd.read_excel(local_path)
-        elif ext == "json":
-            df = pd.read_json(local_path)
-        else:
+        if ext not in ("csv", "xlsx", "json"):
             print(f" Format file {ext} belum didukung.")
             return
 
+        # Regresi hanya memakai kolom numerik → kolom teks tidak perlu dimuat
+        df = load_dataset(local_path, numeric_only=True)
+
         numeric_df = df.select_dtypes(include=["number"]).dropna()
         if numeric_df.empty:
             print(" Tidak ada kolom numerik yang bisa dianalisis.")
@@ -0,0 +1,272 @@
+# utils/local_catalog.py
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import config
+from utils.debug_utils import logger
+from utils.columnar_cache import file_sha256, get_cached_schema
+from utils.file_handler import detect_file_type, read_preview_frame
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path        TEXT PRIMARY KEY,
+    folder      TEXT,
+    size        INTEGER,
+    mtime_ns    INTEGER,
+    sha256      TEXT,
+    format      TEXT,
+    columns     TEXT,
+    dtypes      TEXT,
+    numeric     TEXT,
+    rows        INTEGER,
+    is_output   INTEGER,
+    error       TEXT,
+    scanned_at  REAL
+);
+CREATE INDEX IF NOT EXISTS files_folder ON files (folder);
+"""
+
+_init_lock = threading.Lock()
+_initialized = set()
+
+# Ekstensi yang dicatat di katalog (sama dengan yang dapat dianalisis)
+CATALOG_EXT = ("csv", "json", "xlsx", "parquet")
+OUTPUT_SUFFIXES = ("_clustered", "_assigned")
+
+
+def _connect() -> sqlite3.Connection:
+    path = config.LOCAL_CATALOG_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    with _init_lock:
+        if path not in _initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            conn.commit()
+            _initialized.add(path)
+    return conn
+
+
+@contextmanager
+def _db():
+    conn = _connect()
+    try:
+        with conn:  # commit / rollback
+            yield conn
+    finally:
+        conn.close()
+
+
+def _key(path: str) -> str:
+    return os.path.normpath(path).replace("\\", "/")
+
+
+def _sniff_format(path: str):
+    """Format sebenarnya dari isi file (magic bytes), ekstensi hanya sebagai petunjuk."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(8)
+    except OSError:
+        return None
+    if head.startswith(b"PAR1"):
+        return "parquet"
+    if head.startswith(b"PK\x03\x04"):
+        # XLSX juga berformat ZIP
+        return "xlsx" if path.lower().endswith((".xlsx", ".xls")) else "zip"
+    stripped = head.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if stripped.startswith((b"{", b"[")):
+        return "json"
+    return detect_file_type(path)
+
+
+def _is_output(path: str) -> bool:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem.endswith(OUTPUT_SUFFIXES)
+
+
+def _profile(conn, path: str, fmt: str) -> dict:
+    """
+    Skema & jumlah baris tanpa parsing penuh: metadata cache kolumnar jika valid,
+    selain itu sampel baris pertama + hitung baris murah (footer Parquet, newline CSV, dsb.).
+    """
+    schema = get_cached_schema(path) if fmt != "parquet" else None
+    if schema:
+        return schema
+    if fmt == "parquet":
+        # Kolom turunan (mis. hasil clustering): skema = kolom dataset dasar + kolom sendiri
+        from utils.dataset_store import derived_info
+
+        meta = derived_info(path)
+        base = _fresh_entry(conn, meta["base_path"]) if meta else None
+        if base and base["columns"] is not None:
+            import pyarrow.parquet as pq
+            import pyarrow.types as pat
+
+            own = pq.read_schema(path)
+            own_names = set(own.names)
+            return {
+                "columns": [c for c in base["columns"] if c not in own_names] + own.names,
+                "dtypes": {**{c: t for c, t in base["dtypes"].items() if c not in own_names},
+                           **{f.name: str(f.type) for f in own}},
+                "numeric_columns": [c for c in base["numeric_columns"] if c not in own_names]
+                + [f.name for f in own if pat.is_integer(f.type) or pat.is_floating(f.type)],
+                "rows": pq.ParquetFile(path).metadata.num_rows,
+            }
+
+    with open(path, "rb") as f:
+        df, n_rows, _ = read_preview_frame(f, fmt, config.LOCAL_CATALOG_SAMPLE_ROWS, count_rows=True)
+    return {
+        "columns": [str(c) for c in df.columns],
+        "dtypes": {str(c): str(t) for c, t in df.dtypes.items()},
+        # Dari sampel: superset kolom numerik sebenarnya (kolom yang ternyata teks akan tersaring saat dibaca)
+        "numeric_columns": [str(c) for c in df.select_dtypes(include=["number"]).columns],
+        "rows": n_rows,
+    }
+
+
+def _scan(base_dir: str):
+    """Telusuri folder dataset (lewati folder tersembunyi) → {path: os.stat_result}."""
+    found = {}
+    stack = [base_dir]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.name.lower().rsplit(".", 1)[-1] in CATALOG_EXT:
+                try:
+                    found[_key(entry.path)] = entry.stat()
+                except OSError:
+                    pass
+    return found
+
+
+def _update_entry(conn, path: str, st, old):
+    """Profil ulang satu file yang baru/berubah. Isi yang sama (hash sama) cukup diperbarui mtime-nya."""
+    sha = file_sha256(path)
+    if old and old["sha256"] == sha and not old["error"]:
+        conn.execute("UPDATE files SET size = ?, mtime_ns = ?, scanned_at = ? WHERE path = ?",
+                     (st.st_size, st.st_mtime_ns, time.time(), path))
+        return
+
+    fmt = _sniff_format(path)
+    profile, error = {}, None
+    try:
+        profile = _profile(conn, path, fmt)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        logger.warning(f"Gagal membaca skema {path}: {e}")
+
+    conn.execute(
+        "INSERT OR REPLACE INTO files (path, folder, size, mtime_ns, sha256, format, columns, dtypes, numeric, "
+        "rows, is_output, error, scanned_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (path, _key(os.path.dirname(path)), st.st_size, st.st_mtime_ns, sha, fmt,
+         json.dumps(profile.get("columns")), json.dumps(profile.get("dtypes")),
+         json.dumps(profile.get("numeric_columns")), profile.get("rows"),
+         int(_is_output(path)), error, time.time()),
+    )
+
+
+def sync_catalog(base_dir: str = None) -> dict:
+    """
+    Sinkronkan katalog dengan isi folder dataset lokal secara inkremental:
+    hanya file baru atau yang ukuran/mtime-nya berubah yang di-hash & diprofil ulang,
+    file yang sudah hilang dihapus dari katalog.
+    """
+    base_dir = base_dir or config.LOCAL_DATA_DIR
+    t0 = time.time()
+    found = _scan(base_dir)
+    prefix = _key(base_dir) + "/"
+    stats = {"files": len(found), "added": 0, "updated": 0, "removed": 0}
+
+    with _db() as conn:
+        known = {r["path"]: r for r in conn.execute(
+            "SELECT path, size, mtime_ns, sha256, error FROM files WHERE path LIKE ?", (prefix + "%",))}
+        for path in known.keys() - found.keys():
+            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            stats["removed"] += 1
+        # Hasil analisis diproses terakhir: skemanya bergantung pada entri dataset dasar
+        for path in sorted(found, key=_is_output):
+            st = found[path]
+            old = known.get(path)
+            if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                continue
+            current = conn.execute("SELECT size, mtime_ns FROM files WHERE path = ?", (path,)).fetchone()
+            if current and current["size"] == st.st_size and current["mtime_ns"] == st.st_mtime_ns:
+                continue  # sudah diperbarui sebagai dataset dasar dari file turunan
+            _update_entry(conn, path, st, old)
+            stats["updated" if old else "added"] += 1
+
+    if stats["added"] or stats["updated"] or stats["removed"]:
+        logger.info(f"Katalog lokal diperbarui: +{stats['added']} ~{stats['updated']} -{stats['removed']} "
+                    f"({stats['files']} file, {time.time() - t0:.2f} s)")
+    return stats
+
+
+def _entry(row) -> dict:
+    return {
+        "path": row["path"],
+        "folder": row["folder"],
+        "size": row["size"],
+        "mtime_ns": row["mtime_ns"],
+        "sha256": row["sha256"],
+        "format": row["format"],
+        "columns": json.loads(row["columns"] or "null"),
+        "dtypes": json.loads(row["dtypes"] or "null"),
+        "numeric_columns": json.loads(row["numeric"] or "null"),
+        "rows": row["rows"],
+        "is_output": bool(row["is_output"]),
+        "error": row["error"],
+    }
+
+
+def list_catalog(base_dir: str = None, include_outputs: bool = True) -> list:
+    """Daftar entri katalog (urut path) tanpa menyentuh file dataset."""
+    prefix = _key(base_dir or config.LOCAL_DATA_DIR) + "/"
+    query = "SELECT * FROM files WHERE path LIKE ?"
+    if not include_outputs:
+        query += " AND is_output = 0"
+    with _db() as conn:
+        return [_entry(r) for r in conn.execute(query + " ORDER BY path", (prefix + "%",))]
+
+
+def _fresh_entry(conn, path: str):
+    """Entri katalog `path` lewat koneksi yang sedang dipakai, diprofil ulang jika file berubah."""
+    path = _key(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    row = conn.execute("SELECT * FROM files WHERE path = ?", (path,)).fetchone()
+    if not row or row["size"] != st.st_size or row["mtime_ns"] != st.st_mtime_ns:
+        _update_entry(conn, path, st, row)
+        row = conn.execute("SELECT * FROM files WHERE path = ?", (path,)).fetchone()
+    return _entry(row)
+
+
+def get_file_info(path: str):
+    """
+    Entri katalog untuk satu file, diperbarui dulu jika file berubah sejak terakhir dicatat.
+    None jika file tidak ada.
+    """
+    with _db() as conn:
+        return _fresh_entry(conn, path)
+
+
+def get_catalog_schema(path: str):
+    """Skema dari katalog ({"columns", "dtypes", "numeric_columns", "rows"}) tanpa memuat data."""
+    info = get_file_info(path)
+    if not info or info["error"] or info["columns"] is None:
+        return None
+    return {k: info[k] for k in ("columns", "dtypes", "numeric_columns", "rows")}
@@ -11,5 +11,6 @@ def display_menu():
     print("7. Analisis dataset dengan Apriori (Association Rules)")
     print("8. Analisis dataset dengan Ensemble Methods")
     print("9. Hapus folder dataset lokal")
+    print("10. Labeli dataset dengan model K-Means tersimpan")
     print("Ketik 'q' untuk keluar.")
-    return input("Pilih opsi [1-9]: ").strip()
+    return input("Pilih opsi [1-10]: ").strip()
@@ -0,0 +1,141 @@
+# utils/model_store.py
+import os
+import re
+import json
+import time
+
+import numpy as np
+
+import config
+from utils.debug_utils import logger
+from utils.local_catalog import get_file_info
+from utils.feature_projection import project
+
+
+def _model_dir(name: str) -> str:
+    return os.path.join(config.MODEL_STORE_DIR, name)
+
+
+def model_name_for(dataset_path: str) -> str:
+    """Nama model default dari path dataset (folder + nama file tanpa ekstensi)."""
+    stem = os.path.splitext(os.path.basename(dataset_path))[0]
+    folder = os.path.basename(os.path.dirname(os.path.normpath(dataset_path)))
+    return re.sub(r"[^\w.-]+", "_", f"{folder}__{stem}" if folder else stem)
+
+
+def _create_version_file(directory: str):
+    """
+    Buat file versi baru secara eksklusif (mode "x"): versi = timestamp resolusi mikrodetik,
+    ditambah penghitung jika tetap bentrok. File versi yang sudah ada tidak pernah ditimpa.
+    """
+    now = time.time()
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1e6) % 1000000:06d}"
+    for n in range(1000):
+        version = stamp if n == 0 else f"{stamp}-{n}"
+        try:
+            return version, open(os.path.join(directory, f"{version}.json"), "x", encoding="utf-8")
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Tidak dapat membuat versi model baru di {directory}.")
+
+
+def save_model(name: str, centroids, columns, fill, source_path: str, n_rows: int, inertia: float,
+               algorithm: str, parent: str = None, projection: dict = None) -> dict:
+    """
+    Simpan model K-Means beserta state preprocessing (urutan kolom, nilai imputasi median,
+    proyeksi dimensi jika ada; centroid berada di ruang hasil proyeksi) sebagai versi baru
+    di <MODEL_STORE_DIR>/<name>/. Mengembalikan metadata model.
+    """
+    centroids = np.asarray(centroids, dtype="float64")
+    info = get_file_info(source_path)
+    model = {
+        "name": name,
+        "version": None,
+        "parent": parent,
+        "algorithm": algorithm,
+        "created_at": time.time(),
+        "source": os.path.normpath(source_path).replace("\\", "/"),
+        "source_sha256": info["sha256"] if info else None,
+        "columns": [str(c) for c in columns],
+        "fill": {str(c): (None if v is None or np.isnan(v) else float(v)) for c, v in dict(fill).items()},
+        "projection": projection,
+        "n_clusters": int(centroids.shape[0]),
+        "centroids": centroids.tolist(),
+        "n_rows": int(n_rows),
+        "inertia": float(inertia),
+        # Rata-rata kuadrat jarak ke centroid: acuan deteksi drift saat assign
+        "mean_sq_dist": float(inertia) / max(int(n_rows), 1),
+    }
+    directory = _model_dir(name)
+    os.makedirs(directory, exist_ok=True)
+    version, f = _create_version_file(directory)
+    model["version"] = version
+    with f:
+        json.dump(model, f, indent=2)
+    # Penunjuk versi terbaru diganti secara atomik (pembaca tidak pernah melihat file setengah jadi)
+    latest_path = os.path.join(directory, "latest")
+    tmp_path = f"{latest_path}.{version}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp_path, latest_path)
+    logger.info(f"Model K-Means disimpan: {name}@{version} (k={model['n_clusters']}, {len(model['columns'])} kolom)")
+    return model
+
+
+def load_model(name: str, version: str = None) -> dict:
+    """Muat model (versi terbaru jika `version` tidak diberikan)."""
+    directory = _model_dir(name)
+    if version is None:
+        with open(os.path.join(directory, "latest"), "r", encoding="utf-8") as f:
+            version = f.read().strip()
+    with open(os.path.join(directory, f"{version}.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_models() -> list:
+    """Daftar model tersimpan (versi terbaru masing-masing), urut dari yang paling baru."""
+    if not os.path.isdir(config.MODEL_STORE_DIR):
+        return []
+    models = []
+    for name in sorted(os.listdir(config.MODEL_STORE_DIR)):
+        try:
+            models.append(load_model(name))
+        except (OSError, ValueError):
+            continue
+    return sorted(models, key=lambda m: m["created_at"], reverse=True)
+
+
+def feature_matrix(chunk, model: dict) -> np.ndarray:
+    """
+    Terapkan preprocessing model ke satu potongan data: urutan kolom tetap + imputasi median tersimpan,
+    lalu proyeksi dimensi tersimpan (jika ada).
+    """
+    import pandas as pd
+
+    columns = model["columns"]
+    features = chunk.reindex(columns=columns).apply(pd.to_numeric, errors="coerce")
+    fill = {c: v for c, v in model["fill"].items() if v is not None}
+    X = features.fillna(fill).fillna(0.0).to_numpy(dtype="float64")
+    if model.get("projection"):
+        return project(X, model["projection"])
+    return X
+
+
+def nearest_centroid(X: np.ndarray, centroids: np.ndarray, block_rows: int = 65536):
+    """
+    Label centroid terdekat & kuadrat jaraknya, divektorisasi per blok:
+    ||x - c||² = ||x||² - 2·x·c + ||c||² (satu perkalian matriks per blok).
+    """
+    c_sq = np.einsum("ij,ij->i", centroids, centroids)
+    labels = np.empty(len(X), dtype=np.int32)
+    sq_dist = np.empty(len(X), dtype=np.float64)
+    for start in range(0, len(X), block_rows):
+        block = X[start:start + block_rows]
+        d = block @ centroids.T
+        d *= -2.0
+        d += c_sq
+        d += np.einsum("ij,ij->i", block, block)[:, None]
+        idx = np.argmin(d, axis=1)
+        labels[start:start + len(block)] = idx
+        sq_dist[start:start + len(block)] = np.maximum(d[np.arange(len(block)), idx], 0.0)
+    return labels, sq_dist
@@ -0,0 +1,111 @@
+# utils/remote_zip.py
+import io
+import requests
+from utils.debug_utils import logger
+from utils import http_client
+
+
+# Ukuran "ekor" file yang diambil di awal: cukup untuk EOCD + komentar ZIP
+# dan, pada arsip berukuran wajar, seluruh central directory.
+REMOTE_ZIP_TAIL_BYTES = 64 * 1024
+# Ukuran buffer baca saat men-stream data member yang terkompresi
+REMOTE_ZIP_BLOCK_BYTES = 1024 * 1024
+
+_EOCD_SIGNATURE = b"PK\x05\x06"
+
+
+class HttpRangeFile(io.RawIOBase):
+    """
+    File read-only yang bisa di-seek di atas URL HTTP, setiap pembacaan diterjemahkan
+    menjadi request `Range`. Ekor file disimpan di memori sehingga zipfile dapat membaca
+    EOCD dan central directory tanpa request tambahan.
+    """
+
+    def __init__(self, url: str, size: int, tail: bytes = b""):
+        super().__init__()
+        self.url = url
+        self.size = size
+        self.pos = 0
+        self._tail = tail
+        self._tail_start = size - len(tail)
+        self.bytes_fetched = len(tail)
+        self.requests = 1 if tail else 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.pos = offset
+        elif whence == io.SEEK_CUR:
+            self.pos += offset
+        elif whence == io.SEEK_END:
+            self.pos = self.size + offset
+        else:
+            raise ValueError(f"whence tidak valid: {whence}")
+        self.pos = max(self.pos, 0)
+        return self.pos
+
+    def readinto(self, buffer):
+        if self.pos >= self.size:
+            return 0
+        end = min(self.pos + len(buffer), self.size)
+
+        if self.pos >= self._tail_start:
+            data = self._tail[self.pos - self._tail_start:end - self._tail_start]
+        else:
+            headers = {"Range": f"bytes={self.pos}-{end - 1}", "Accept-Encoding": "identity"}
+            response = http_client.get(self.url, headers=headers)
+            if response.status_code != 206:
+                raise OSError(f"Server tidak mengembalikan partial content (status {response.status_code}).")
+            data = response.content
+            self.requests += 1
+            self.bytes_fetched += len(data)
+
+        n = len(data)
+        buffer[:n] = data
+        self.pos += n
+        return n
+
+
+def open_remote_zip(url: str):
+    """
+    Buka ZIP remote tanpa mengunduhnya: ambil ekor file lewat suffix Range,
+    pastikan ada tanda EOCD, lalu kembalikan file-like yang bisa dipakai zipfile.
+    Mengembalikan None jika server tidak mendukung Range atau URL bukan ZIP
+    (pemanggil kembali ke unduhan penuh).
+    """
+    headers = {"Range": f"bytes=-{REMOTE_ZIP_TAIL_BYTES}", "Accept-Encoding": "identity"}
+    try:
+        with http_client.get(url, headers=headers, stream=True, allow_redirects=True) as r:
+            content_range = r.headers.get("Content-Range", "")
+            if r.status_code != 206 or "/" not in content_range or content_range.endswith("/*"):
+                logger.info("Server tidak mendukung Range, ZIP akan diunduh penuh.")
+                return None
+            size = int(content_range.rsplit("/", 1)[1])
+            tail = r.content
+            final_url = r.url
+    except (requests.RequestException, ValueError) as e:
+        logger.warning(f"Gagal memeriksa ZIP remote: {e}")
+        return None
+
+    if _EOCD_SIGNATURE not in tail:
+        logger.info("Ekor file tidak memuat tanda ZIP, bukan arsip ZIP.")
+        return None
+
+    raw = HttpRangeFile(final_url, size, tail)
+    logger.info(f"ZIP remote dibuka ({size / (1024 * 1024):.1f} MB) dari {len(tail) / 1024:.1f} KB data.")
+    return io.BufferedReader(raw, buffer_size=REMOTE_ZIP_BLOCK_BYTES)
+
+
+def remote_zip_transfer_stats(fileobj) -> dict:
+    """Jumlah request dan byte yang sudah diunduh untuk ZIP remote."""
+    raw = fileobj.raw if isinstance(fileobj, io.BufferedReader) else fileobj
+    return {"requests": raw.requests, "bytes_fetched": raw.bytes_fetched, "size": raw.size}
+